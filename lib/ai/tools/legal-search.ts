@@ -1,7 +1,12 @@
 import { tool, generateText, type DataStreamWriter } from 'ai';
 import { z } from 'zod';
 import type { Session } from 'next-auth';
-import { getOrCreateCollection, LEGAL_COLLECTION } from '@/lib/rag/chroma';
+import {
+  getExistingCollection,
+  getOrCreateCollection,
+  LEGAL_COLLECTION,
+  LEGAL_DOC_COLLECTION,
+} from '@/lib/rag/chroma';
 import { embedQuery } from '@/lib/rag/embeddings';
 import { deepseek } from '@ai-sdk/deepseek';
 import { mistral } from '@ai-sdk/mistral';
@@ -12,6 +17,9 @@ import {
   type CitableSource,
 } from '@/lib/rag/citation-utils';
 import { deriveAuthorityTier } from '@/lib/rag/chunker';
+import { epochDay, parseEpochDay } from '@/lib/rag/metadata-schema';
+import { CENTROID_COVERAGE_KEY } from '@/lib/rag/doc-centroids';
+import { getParentText, mergeSpans, spanText } from '@/lib/rag/parent-store';
 import { generateUUID } from '@/lib/utils';
 import { saveDocument } from '@/lib/db/queries';
 
@@ -42,22 +50,83 @@ interface RetrievedDoc {
   origin: 'knowledge_base' | 'web_research';
   /** Authority tier: 1 = primary law, 2 = secondary authoritative, 3 = tertiary */
   authority_tier: 1 | 2 | 3;
+  /** Exact token count from the seeder (embedding-model tokenizer); absent for web results */
+  token_count?: number;
+  /** Characters covered by the first N tokens, keyed by N (seeder TOKEN_PREFIXES) */
+  prefix_chars?: Record<number, number>;
+  /** Parent document key and this chunk's character offsets in it (see lib/rag/parent-store.ts) */
+  doc_id?: string;
+  start?: number;
+  end?: number;
+  /** Index-time resolveSourceUrl() result (scripts/concept_links.py) */
+  source_url?: string;
+}
+
+// ---------------------------------------------------------------------------
+// Token budgets
+// ---------------------------------------------------------------------------
+
+/** Prefix budgets the seeder stores as prefix_chars_<N> (TOKEN_PREFIXES in seed_legal_concepts.py) */
+const TOKEN_PREFIXES = [64, 128, 256] as const;
+/** Fallback for chunks without stored counts (web results, older seeds) */
+const CHARS_PER_TOKEN = 4;
+/** Upper bound on source tokens handed to the drafting model */
+const CONTEXT_TOKEN_BUDGET = 12_000;
+
+function tokenCount(d: RetrievedDoc): number {
+  return d.token_count ?? Math.ceil(d.text.length / CHARS_PER_TOKEN);
+}
+
+/** The first ~`tokens` tokens of a document, cut at a stored token boundary when available. */
+function excerpt(d: RetrievedDoc, tokens: (typeof TOKEN_PREFIXES)[number]): string {
+  return d.text.slice(0, d.prefix_chars?.[tokens] ?? tokens * CHARS_PER_TOKEN);
+}
+
+/** Keep docs in rank order while they fit in `budget` tokens (the top doc is always kept). */
+function fitTokenBudget(docs: RetrievedDoc[], budget: number): RetrievedDoc[] {
+  const kept: RetrievedDoc[] = [];
+  let used = 0;
+  for (const d of docs) {
+    const cost = tokenCount(d);
+    if (kept.length > 0 && used + cost > budget) continue;
+    kept.push(d);
+    used += cost;
+  }
+  return kept;
 }
 
 // ---------------------------------------------------------------------------
 // Temporal Helpers
 // ---------------------------------------------------------------------------
 
+interface TemporalScope {
+  /** Epoch day the law is read as of: chunks whose [valid_from, valid_to) contains it */
+  asOfDay: number;
+  /** Recency cutoff: documents published before Jan 1 of this year are excluded */
+  cutoffYear: number;
+}
+
 /**
- * Filters documents by date, keeping those at or after `cutoffYear`.
- * Documents with no date are always kept (don't exclude primary law).
+ * Always exclude documents older than 5 years (hard cutoff = stale law), or
+ * 3 years with `recentOnly`, counted back from the as-of date. Undated
+ * documents store published_on = DATE_MAX, so primary law without a date is
+ * always kept.
  */
-function temporalFilter(docs: RetrievedDoc[], cutoffYear: number): RetrievedDoc[] {
-  return docs.filter((doc) => {
-    if (!doc.date) return true; // Keep undated primary law
-    const year = new Date(doc.date).getFullYear();
-    return Number.isNaN(year) || year >= cutoffYear;
-  });
+function temporalScope(asOf: string | undefined, recentOnly: boolean | undefined): TemporalScope {
+  const asOfDay = (asOf ? parseEpochDay(asOf, epochDay()) : null) ?? epochDay();
+  const year = new Date(asOfDay * 24 * 60 * 60 * 1000).getUTCFullYear();
+  return { asOfDay, cutoffYear: year - (recentOnly ? 3 : 5) };
+}
+
+/**
+ * Pre-retrieval temporal filters (metadata schema v3): the chunk version in
+ * force on the as-of day, published on or after the cutoff year.
+ */
+function temporalFilters({ asOfDay, cutoffYear }: TemporalScope) {
+  return {
+    validity: [{ valid_from: { $lte: asOfDay } }, { valid_to: { $gt: asOfDay } }] as Record<string, any>[],
+    recency: { published_on: { $gte: epochDay(new Date(Date.UTC(cutoffYear, 0, 1))) } },
+  };
 }
 
 // ---------------------------------------------------------------------------
@@ -121,23 +190,45 @@ async function expandQuery(query: string, industry: string | undefined): Promise
   return [query];
 }
 
+/** Documents kept by the centroid stage before searching chunks */
+const STAGE1_DOCS = 6;
+
+/**
+ * True when the centroid rows cover every chunk (see lib/rag/doc-centroids.ts).
+ * Chunks written without a centroid update would otherwise never reach
+ * stage 2, so anything less means searching chunks directly.
+ */
+async function centroidsCoverChunks(
+  collection: Awaited<ReturnType<typeof getOrCreateCollection>>,
+  docCollection: NonNullable<Awaited<ReturnType<typeof getExistingCollection>>>,
+): Promise<boolean> {
+  const covered = Number(docCollection.metadata?.[CENTROID_COVERAGE_KEY]);
+  if (!Number.isFinite(covered)) return false;
+  return (await collection.count()) <= covered;
+}
+
 /** 3 — Retrieval: search ChromaDB with pre-retrieval WHERE filtering */
 async function retrieveFromKB(
   queries: string[],
   industry: string | undefined,
   ds: DataStreamWriter,
+  temporal: TemporalScope,
 ): Promise<RetrievedDoc[]> {
   const collection = await getOrCreateCollection(LEGAL_COLLECTION);
+  // Document centroids, when seeded: stage 1 picks documents, stage 2 searches their chunks
+  const docCollection = await getExistingCollection(LEGAL_DOC_COLLECTION);
+  const twoStage = docCollection !== null && (await centroidsCoverChunks(collection, docCollection));
   const docs: RetrievedDoc[] = [];
   const seenTexts = new Set<string>();
-
-  // Build compound WHERE clause: exclude obsolete + tertiary docs pre-search.
-  // Note: ChromaDB $gt only supports numbers, so we filter deprecated_on via $eq
-  // (ingestion already skips docs with past ends_on dates, so $eq: "" catches all valid docs).
-  const filters: Record<string, any>[] = [
-    { deprecated_on: { $eq: '' } },
-    { authority_tier: { $in: ['1', '2'] } },
-  ];
+  // Document-level metadata by doc_id, for compact-mode chunks (see joinDocumentMetadata)
+  const docMetadata = new Map<string, Record<string, any>>();
+
+  // Build compound WHERE clause: exclude superseded, stale + tertiary docs pre-search.
+  // Metadata schema v3 stores tiers as ints and validity/publication dates as
+  // epoch days, so all of them are numeric range filters.
+  const { validity, recency } = temporalFilters(temporal);
+  // Not `$lte: 2`: chunks written before typed metadata derived unknown tiers store 0
+  const filters: Record<string, any>[] = [...validity, recency, { authority_tier: { $in: [1, 2] } }];
   if (industry) {
     filters.push({ industry: { $eq: industry } });
   }
@@ -146,17 +237,33 @@ async function retrieveFromKB(
   for (const q of queries) {
     const queryEmbedding = await embedQuery(q);
 
+    let scopedWhere: Record<string, any> = where;
+    if (docCollection && twoStage) {
+      const stage1 = await docCollection.query({
+        queryEmbeddings: [queryEmbedding],
+        nResults: STAGE1_DOCS,
+        where: where as any,
+        include: ['metadatas', 'distances'] as any,
+      });
+      const docIds = (stage1.ids?.[0] ?? []) as string[];
+      docIds.forEach((id, j) => docMetadata.set(id, (stage1.metadatas?.[0]?.[j] as Record<string, any>) ?? {}));
+      if (docIds.length > 0) {
+        scopedWhere = { $and: [...filters, { doc_id: { $in: docIds } }] };
+      }
+    }
+
     let results = await collection.query({
       queryEmbeddings: [queryEmbedding],
       nResults: 8,
-      where: where as any,
+      where: scopedWhere as any,
       include: ['documents', 'metadatas', 'distances'],
     });
 
-    // Fallback: if filtered query returns < 2 results, re-query without tier/temporal filters
+    // Fallback: if filtered query returns < 2 results, re-query without tier/recency
+    // filters. Validity stays: a superseded version is never the law as of the date.
     const resultCount = results.documents?.[0]?.filter(Boolean).length ?? 0;
     if (resultCount < 2) {
-      const fallbackWhere = industry ? { industry: { $eq: industry } } : undefined;
+      const fallbackWhere = { $and: industry ? [...validity, { industry: { $eq: industry } }] : validity };
       results = await collection.query({
         queryEmbeddings: [queryEmbedding],
         nResults: 8,
@@ -166,25 +273,32 @@ async function retrieveFromKB(
     }
 
     if (!results.documents?.[0]) continue;
+    const metas = await joinDocumentMetadata(results.metadatas?.[0] ?? [], docCollection, docMetadata);
 
     for (let i = 0; i < results.documents[0].length; i++) {
       const docText = results.documents[0][i] ?? '';
       if (seenTexts.has(docText)) continue;
       seenTexts.add(docText);
 
-      const meta = results.metadatas?.[0]?.[i] || {};
+      const meta = metas[i];
       const distance = results.distances?.[0]?.[i];
 
       // Read authority_tier from metadata first, fall back to deriveAuthorityTier for legacy docs
-      const storedTier = meta.authority_tier as string | undefined;
-      const authorityTier: 1 | 2 | 3 = storedTier
-        ? (parseInt(storedTier, 10) as 1 | 2 | 3)
+      const storedTier = Number(meta.authority_tier);
+      const authorityTier: 1 | 2 | 3 = storedTier >= 1 && storedTier <= 3
+        ? (storedTier as 1 | 2 | 3)
         : deriveAuthorityTier({
             source: (meta.source as string) || 'unknown',
             document_type: (meta.document_type as string) || 'unknown',
             url: (meta.url as string) || '',
           });
 
+      const prefixChars: Record<number, number> = {};
+      for (const n of TOKEN_PREFIXES) {
+        const v = Number(meta[`prefix_chars_${n}`]);
+        if (v > 0) prefixChars[n] = v;
+      }
+
       docs.push({
         text: docText,
         source: (meta.source as string) || 'unknown',
@@ -196,11 +310,88 @@ async function retrieveFromKB(
         relevance_score: distance != null ? (1 - distance).toFixed(3) : 'N/A',
         origin: 'knowledge_base' as const,
         authority_tier: authorityTier,
+        token_count: meta.token_count != null ? Number(meta.token_count) : undefined,
+        prefix_chars: Object.keys(prefixChars).length > 0 ? prefixChars : undefined,
+        doc_id: (meta.doc_id as string) || undefined,
+        start: meta.start != null ? Number(meta.start) : undefined,
+        end: meta.end != null ? Number(meta.end) : undefined,
+        source_url: typeof meta.source_url === 'string' ? meta.source_url : undefined,
       });
     }
   }
 
-  return docs;
+  return mergeAdjacentHits(docs);
+}
+
+/**
+ * Compact-metadata collections keep only filter fields and doc_id on chunks;
+ * the document fields (title, source, url, ...) live once in the document
+ * collection. Fill them in, fetching any doc_ids stage 1 didn't return.
+ * Full-mode chunks already carry a title and pass through unchanged.
+ */
+async function joinDocumentMetadata(
+  metas: Array<Record<string, any> | null>,
+  docCollection: Awaited<ReturnType<typeof getExistingCollection>>,
+  known: Map<string, Record<string, any>>,
+): Promise<Record<string, any>[]> {
+  const missing = [
+    ...new Set(
+      metas
+        .filter((m) => m && !m.title && m.doc_id && !known.has(m.doc_id as string))
+        .map((m) => m?.doc_id as string),
+    ),
+  ];
+  if (missing.length > 0 && docCollection) {
+    const got = await docCollection.get({ ids: missing, include: ['metadatas'] as any });
+    got.ids.forEach((id: string, j: number) => known.set(id, (got.metadatas?.[j] as Record<string, any>) ?? {}));
+  }
+  return metas.map((m) => {
+    const meta = m ?? {};
+    const doc = !meta.title && meta.doc_id ? known.get(meta.doc_id as string) : undefined;
+    return doc ? { ...doc, ...meta } : meta;
+  });
+}
+
+/** Hits this close (e.g. consecutive sections split by a blank line) count as adjacent */
+const PARENT_MERGE_GAP = 16;
+
+/**
+ * Fold hits that overlap or touch in the same parent document into one doc
+ * holding the exact merged span from the parent store, at the position of
+ * the best-ranked member. Removes the text duplicated by chunk overlap.
+ */
+function mergeAdjacentHits(docs: RetrievedDoc[]): RetrievedDoc[] {
+  const spanned = docs
+    .map((d, i) => ({ d, i }))
+    .filter(({ d }) =>
+      d.doc_id && d.start != null && d.start >= 0 && d.end != null && getParentText(d.doc_id) !== null,
+    );
+  if (spanned.length < 2) return docs;
+
+  const merged = mergeSpans(
+    spanned.map(({ d }) => ({ docId: d.doc_id as string, start: d.start as number, end: d.end as number })),
+    PARENT_MERGE_GAP,
+  );
+  const replaced = new Map<number, RetrievedDoc>();
+  const dropped = new Set<number>();
+  for (const span of merged) {
+    if (span.members.length < 2) continue;
+    const members = span.members.map((m) => spanned[m]);
+    const best = members.reduce((a, b) => (a.i < b.i ? a : b));
+    const first = members.reduce((a, b) => ((a.d.start as number) <= (b.d.start as number) ? a : b));
+    const text = spanText(span) ?? best.d.text;
+    replaced.set(best.i, {
+      ...best.d,
+      text,
+      start: span.start,
+      end: span.end,
+      token_count: undefined,
+      // The merged text begins where the earliest member does
+      prefix_chars: first.d.prefix_chars,
+    });
+    for (const m of members) if (m.i !== best.i) dropped.add(m.i);
+  }
+  return docs.flatMap((d, i) => (dropped.has(i) ? [] : [replaced.get(i) ?? d]));
 }
 
 /** 4 — CRAG (Corrective RAG): grade each document for relevance, flag if web search needed */
@@ -214,7 +405,7 @@ async function correctiveRAG(
 
   const model = getLLM();
 
-  const docSummaries = docs.map((d, i) => `[${i}] "${d.title}" — ${d.text.slice(0, 300)}...`).join('\n');
+  const docSummaries = docs.map((d, i) => `[${i}] "${d.title}" — ${excerpt(d, 64)}...`).join('\n');
 
   const { text } = await generateText({
     model,
@@ -319,7 +510,7 @@ async function rerankDocuments(
   const TIER_BOOST: Record<number, number> = { 1: 0.30, 2: 0.10, 3: 0.00 };
 
   const docList = docs
-    .map((d, i) => `[${i}] [Tier ${d.authority_tier}] "${d.title}" (${d.origin}) — ${d.text.slice(0, 200)}...`)
+    .map((d, i) => `[${i}] [Tier ${d.authority_tier}] "${d.title}" (${d.origin}) — ${excerpt(d, 64)}...`)
     .join('\n');
 
   const { text } = await generateText({
@@ -384,10 +575,19 @@ async function compressContext(
   try {
     const compressed: string[] = JSON.parse(text);
     if (Array.isArray(compressed)) {
-      return docs.map((d, i) => ({
-        ...d,
-        text: compressed[i] ?? d.text,
-      }));
+      return docs.map((d, i) => {
+        const text = compressed[i] ?? d.text;
+        if (text === d.text) return d;
+        // Stored counts describe the original chunk; scale rather than re-tokenize
+        return {
+          ...d,
+          text,
+          token_count: d.token_count != null
+            ? Math.ceil((d.token_count * text.length) / Math.max(d.text.length, 1))
+            : undefined,
+          prefix_chars: undefined,
+        };
+      });
     }
   } catch { /* fall through */ }
   return docs;
@@ -412,7 +612,7 @@ async function bouncerAgent(
   const model = getLLM();
 
   const docList = docs
-    .map((d, i) => `[${i}] [Tier ${d.authority_tier}] "${d.title}" — ${d.text.slice(0, 250)}`)
+    .map((d, i) => `[${i}] [Tier ${d.authority_tier}] "${d.title}" — ${excerpt(d, 64)}`)
     .join('\n\n');
 
   const { text } = await generateText({
@@ -729,7 +929,7 @@ async function selfRAGReflect(
 ): Promise<{ isGrounded: boolean; hallucinations: string[]; suggestions: string[] }> {
   const model = getLLM();
 
-  const sourceList = docs.map((d, i) => `[Source ${i + 1}] ${d.title}: ${d.text.slice(0, 300)}...`).join('\n');
+  const sourceList = docs.map((d, i) => `[Source ${i + 1}] ${d.title}: ${excerpt(d, 64)}...`).join('\n');
 
   const { text } = await generateText({
     model,
@@ -919,7 +1119,7 @@ async function structuralCritic(
   const model = getLLM();
 
   const sourceList = docs
-    .map((d, i) => `[Source ${i + 1}] ${d.title}: ${d.text.slice(0, 200)}`)
+    .map((d, i) => `[Source ${i + 1}] ${d.title}: ${excerpt(d, 64)}`)
     .join('\n');
 
   const { text } = await generateText({
@@ -1052,8 +1252,14 @@ export const legalSearch = ({
         .describe(
           'If true, deprioritise documents older than 3 years to ensure temporal relevance (e.g. for rapidly-changing regulations)',
         ),
+      asOf: z
+        .string()
+        .optional()
+        .describe(
+          'ISO date (YYYY-MM-DD) to answer as of, e.g. "what did the rule say in 2023"; defaults to today',
+        ),
     }),
-    execute: async ({ query, industry, recentOnly }) => {
+    execute: async ({ query, industry, recentOnly, asOf }) => {
       const ds = dataStream;
       const s = (phase: string, step: string) => status(ds, `${phase}::${step}`);
 
@@ -1078,13 +1284,16 @@ export const legalSearch = ({
       s('Query Analysis', `${expandedQueries.length} search queries generated`);
 
       // ── Phase 2: Retrieval ───────────────────────────────────────────
+      // Validity (as-of date) and recency cutoffs are applied by Chroma, pre-search
       let kbDocs: RetrievedDoc[] = [];
+      const temporal = temporalScope(asOf, recentOnly);
 
       if (route.useKnowledgeBase) {
         s('Retrieval', `Embedding ${expandedQueries.length} queries`);
         s('Retrieval', `Searching ${docCount.toLocaleString()} documents`);
+        s('Retrieval', `Law in force ${asOf ? `on ${asOf}` : 'today'}; published ${temporal.cutoffYear} or later`);
         try {
-          kbDocs = await retrieveFromKB(expandedQueries, industry, ds);
+          kbDocs = await retrieveFromKB(expandedQueries, industry, ds, temporal);
           s('Retrieval', `${kbDocs.length} unique documents retrieved`);
         } catch (error) {
           console.error('KB retrieval error:', error);
@@ -1094,21 +1303,6 @@ export const legalSearch = ({
         s('Retrieval', chromaAvailable ? 'Knowledge base empty' : 'Knowledge base unavailable');
       }
 
-      // ── Phase 2b: Temporal Filtering ─────────────────────────────────
-      // Always filter out documents older than 5 years (hard cutoff = stale law).
-      // If recentOnly=true, apply a tighter 3-year cutoff.
-      // Tier 1 (primary law) docs without a date are always kept.
-      const hardCutoffYear = new Date().getFullYear() - 5;
-      const softCutoffYear = new Date().getFullYear() - 3;
-      const cutoffYear = recentOnly ? softCutoffYear : hardCutoffYear;
-
-      const beforeFilter = kbDocs.length;
-      kbDocs = temporalFilter(kbDocs, cutoffYear);
-      const filteredByDate = beforeFilter - kbDocs.length;
-      if (filteredByDate > 0) {
-        s('Retrieval', `Temporal filter: ${filteredByDate} outdated document(s) excluded (cutoff: ${cutoffYear})`);
-      }
-
       // ── Phase 3: Evaluation (CRAG + Web) ─────────────────────────────
       s('Evaluation', 'Grading document relevance (CRAG)');
       const crag = await correctiveRAG(query, kbDocs);
@@ -1161,11 +1355,15 @@ export const legalSearch = ({
 
       // ── Phase 4.5: Bouncer Agent (stage-aware context pruning) ────────
       s('Refinement', 'Bouncer agent filtering (stage alignment)');
-      const pruned = await bouncerAgent(query, compressed);
-      const prunedCount = compressed.length - pruned.length;
+      const bounced = await bouncerAgent(query, compressed);
+      const prunedCount = compressed.length - bounced.length;
       if (prunedCount > 0) {
         s('Refinement', `Bouncer removed ${prunedCount} off-stage chunk(s)`);
       }
+      const pruned = fitTokenBudget(bounced, CONTEXT_TOKEN_BUDGET);
+      if (pruned.length < bounced.length) {
+        s('Refinement', `Dropped ${bounced.length - pruned.length} source(s) over the ${CONTEXT_TOKEN_BUDGET}-token context budget`);
+      }
 
       // ── Phase 5: Analysis ────────────────────────────────────────────
       s('Analysis', 'Generating legal analysis (Self-RAG + tiered context)');
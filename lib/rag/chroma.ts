@@ -45,4 +45,18 @@ export async function getOrCreateCollection(
   return chromaClient.getOrCreateCollection({ name, embeddingFunction: null });
 }
 
+/** The collection if it exists, else null (never creates it). */
+export async function getExistingCollection(
+  name: string,
+): Promise<Collection | null> {
+  const chromaClient = await getChromaClient();
+  try {
+    return await chromaClient.getCollection({ name, embeddingFunction: null });
+  } catch {
+    return null;
+  }
+}
+
 export const LEGAL_COLLECTION = 'legal-documents';
+/** One centroid per document (scripts/doc_centroids.py), for two-stage retrieval */
+export const LEGAL_DOC_COLLECTION = `${LEGAL_COLLECTION}-docs`;
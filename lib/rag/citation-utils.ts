@@ -13,6 +13,9 @@
  *    authoritative government/legal sources.  Acts as a backstop so every
  *    legal term in EVERY response gets a clickable citation — even when the
  *    text is generated without going through the RAG pipeline.
+ *
+ * Knowledge-base chunks carry a `source_url` resolved at index time
+ * (scripts/concept_links.py); resolveSourceUrl prefers the stored URL.
  */
 
 // ---------------------------------------------------------------------------
@@ -29,6 +32,8 @@ export interface CitableSource {
   date: string;
   relevance_score: string;
   origin: 'knowledge_base' | 'web_research';
+  /** Canonical URL resolved at index time ("" = none); absent for web results and older chunks */
+  source_url?: string;
 }
 
 // ---------------------------------------------------------------------------
@@ -40,6 +45,7 @@ export interface CitableSource {
  * Only accepts well-formed HTTP/HTTPS URLs; ignores empty strings and fallbacks.
  */
 export function resolveSourceUrl(doc: CitableSource): string | null {
+  if (doc.source_url !== undefined) return doc.source_url || null;
   const u = doc.url?.trim();
   if (u && (u.startsWith('http://') || u.startsWith('https://'))) {
     return u;
@@ -494,6 +500,31 @@ export const LEGAL_CONCEPT_URLS: Record<string, string> = {
   'SBA': 'https://www.sba.gov/',
 };
 
+/**
+ * Term patterns, longest phrase first so specific matches win; compiled once.
+ * Each carries the lowercased term: a paragraph that doesn't contain it as a
+ * substring can't match, so most regexes never run.
+ */
+let conceptPatterns: Array<[string, string, RegExp, string]> | undefined;
+
+function getConceptPatterns(): Array<[string, string, RegExp, string]> {
+  if (!conceptPatterns) {
+    conceptPatterns = Object.entries(LEGAL_CONCEPT_URLS)
+      .sort(([a], [b]) => b.length - a.length)
+      .map(([term, url]) => {
+        // Escape special regex characters in the term string
+        const esc = term.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+        // Match term:
+        //  - At a word boundary (\b) — prevents partial matches inside other words
+        //  - NOT preceded by [ (already inside a markdown link label)
+        //  - NOT followed by ] (already inside a markdown link label)
+        //  - NOT preceded by ](  (already the URL portion of a link)
+        return [term, url, new RegExp(`(?<!\\[)(?<!\\]\\()\\b(${esc})\\b(?!\\])`, 'i'), term.toLowerCase()];
+      });
+  }
+  return conceptPatterns;
+}
+
 /**
  * Scans generated text for known legal terms and wraps unlinked occurrences
  * in markdown hyperlinks pointing to authoritative sources.
@@ -506,8 +537,11 @@ export const LEGAL_CONCEPT_URLS: Record<string, string> = {
  * - Each unique term is linked once per paragraph to avoid visual clutter
  *   (matches the Wikipedia / Anthropic docs convention).
  *
- * @param text Raw markdown text to process.
- * @returns    Markdown text with legal terms converted to hyperlinks.
+ * Every term in LEGAL_CONCEPT_URLS is checked: generated text can mention
+ * terms its sources don't.
+ *
+ * @param text  Raw markdown text to process.
+ * @returns     Markdown text with legal terms converted to hyperlinks.
  */
 export function injectLegalConceptLinks(text: string): string {
   // Preserve code blocks so we never alter code samples
@@ -517,35 +551,22 @@ export function injectLegalConceptLinks(text: string): string {
     return `\x00CODE${codeBlocks.length - 1}\x00`;
   });
 
-  // Sort entries: longest phrase first so specific matches win over short ones
-  const entries = Object.entries(LEGAL_CONCEPT_URLS).sort(
-    ([a], [b]) => b.length - a.length,
-  );
-
   // Track which terms have already been linked so we link each term only once
   // per paragraph block (split on blank lines)
   const paragraphs = processed.split(/\n\n+/);
   const linkedParagraphs = paragraphs.map((para) => {
     const linked = new Set<string>();
+    let lower = para.toLowerCase();
 
-    for (const [term, url] of entries) {
+    for (const [, url, regex, needle] of getConceptPatterns()) {
       // Skip if already linked (term key already processed for this paragraph)
-      if (linked.has(term.toLowerCase())) continue;
-
-      // Escape special regex characters in the term string
-      const esc = term.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-
-      // Match term:
-      //  - At a word boundary (\b) — prevents partial matches inside other words
-      //  - NOT preceded by [ (already inside a markdown link label)
-      //  - NOT followed by ] (already inside a markdown link label)
-      //  - NOT preceded by ](  (already the URL portion of a link)
-      const regex = new RegExp(`(?<!\\[)(?<!\\]\\()\\b(${esc})\\b(?!\\])`, 'i');
+      if (linked.has(needle) || !lower.includes(needle)) continue;
 
       if (regex.test(para)) {
         // Replace only the FIRST occurrence in this paragraph (link-once convention)
         para = para.replace(regex, (match) => `[${match}](${url})`);
-        linked.add(term.toLowerCase());
+        lower = para.toLowerCase();
+        linked.add(needle);
       }
     }
 
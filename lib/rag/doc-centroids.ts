@@ -0,0 +1,122 @@
+/**
+ * Incremental updates of the document centroid collection (LEGAL_DOC_COLLECTION),
+ * the TypeScript counterpart of update_centroids in scripts/doc_centroids.py.
+ *
+ * Each row is the L2-normalized mean of one document's chunk vectors, with
+ * the document's metadata, its chunk count and the validity span of its
+ * chunks. The collection's `centroid_chunks` metadata counts the chunks its
+ * rows cover; legalSearch only scopes chunk search to stage-1 documents while
+ * that covers the whole chunk collection. Ingesters call
+ * updateDocumentCentroids with the doc_ids they wrote so their chunks stay
+ * reachable through stage 1. A no-op when the collection hasn't been built.
+ */
+
+import type { Collection } from 'chromadb';
+import { getExistingCollection, LEGAL_DOC_COLLECTION } from './chroma';
+import { DATE_MAX, DATE_MIN } from './metadata-schema';
+
+/** Companion-collection metadata key (COVERAGE_KEY in scripts/doc_centroids.py) */
+export const CENTROID_COVERAGE_KEY = 'centroid_chunks';
+
+/** Chunk-level fields that don't describe the document (CHUNK_FIELDS in seed_legal_concepts.py) */
+const CHUNK_FIELDS = new Set([
+  'chunk_index', 'heading_path', 'token_count', 'prefix_chars_64', 'prefix_chars_128', 'prefix_chars_256',
+  'start', 'end', 'prev_chunk_id', 'next_chunk_id', 'valid_from', 'valid_to',
+  // No longer written; scripts/concept_links.py backfill strips it from older chunks
+  'concept_spans',
+]);
+
+const BATCH_SIZE = 50;
+const PAGE_SIZE = 1000;
+
+interface Centroid {
+  sum: number[];
+  chunks: number;
+  meta: Record<string, any>;
+  validFrom: number;
+  validTo: number;
+}
+
+/**
+ * Recompute the centroid rows of `docIds` from their chunks (by `doc_id`);
+ * documents without chunks lose their row. Returns the rows written.
+ */
+export async function updateDocumentCentroids(
+  chunks: Collection,
+  docIds: Iterable<string>,
+  docCollectionName: string = LEGAL_DOC_COLLECTION,
+): Promise<number> {
+  const ids = [...new Set(docIds)].sort();
+  const target = ids.length > 0 ? await getExistingCollection(docCollectionName) : null;
+  if (!target) return 0;
+
+  const centroids = new Map<string, Centroid>();
+  let oldChunks = 0;
+  for (let i = 0; i < ids.length; i += BATCH_SIZE) {
+    const batch = ids.slice(i, i + BATCH_SIZE);
+    const old = await target.get({ ids: batch, include: ['metadatas'] as any });
+    for (const m of old.metadatas ?? []) oldChunks += Number(m?.chunks) || 0;
+
+    const got = await chunks.get({
+      where: { doc_id: { $in: batch } } as any,
+      include: ['embeddings', 'metadatas'] as any,
+    });
+    got.ids.forEach((_: string, j: number) => {
+      const meta = (got.metadatas?.[j] as Record<string, any>) ?? {};
+      const vec = got.embeddings?.[j] as number[] | undefined;
+      if (!vec) return;
+      const docId = meta.doc_id as string;
+      const validFrom = Number(meta.valid_from ?? DATE_MIN);
+      const validTo = Number(meta.valid_to ?? DATE_MAX);
+      const c = centroids.get(docId);
+      if (!c) {
+        const docMeta = Object.fromEntries(Object.entries(meta).filter(([k]) => !CHUNK_FIELDS.has(k)));
+        centroids.set(docId, { sum: [...vec], chunks: 1, meta: docMeta, validFrom, validTo });
+        return;
+      }
+      for (let d = 0; d < vec.length; d++) c.sum[d] += vec[d];
+      c.chunks += 1;
+      c.validFrom = Math.min(c.validFrom, validFrom);
+      c.validTo = Math.max(c.validTo, validTo);
+    });
+  }
+
+  const gone = ids.filter((id) => !centroids.has(id));
+  if (gone.length > 0) await target.delete({ ids: gone });
+  const rows = [...centroids.entries()];
+  for (let i = 0; i < rows.length; i += BATCH_SIZE) {
+    const batch = rows.slice(i, i + BATCH_SIZE);
+    await target.upsert({
+      ids: batch.map(([id]) => id),
+      embeddings: batch.map(([, c]) => {
+        const norm = Math.max(Math.hypot(...c.sum), 1e-12);
+        return c.sum.map((v) => v / norm);
+      }),
+      metadatas: batch.map(([id, c]) => ({
+        ...c.meta,
+        doc_id: id,
+        chunks: c.chunks,
+        valid_from: c.validFrom,
+        valid_to: c.validTo,
+      })),
+    });
+  }
+
+  const written = rows.reduce((n, [, c]) => n + c.chunks, 0);
+  const metadata = Object.fromEntries(
+    Object.entries(target.metadata ?? {}).filter(([k]) => !k.startsWith('hnsw:')),
+  );
+  let covered = Number(metadata[CENTROID_COVERAGE_KEY]);
+  if (Number.isFinite(covered)) {
+    covered += written - oldChunks;
+  } else {
+    covered = 0;
+    const total = await target.count();
+    for (let offset = 0; offset < total; offset += PAGE_SIZE) {
+      const page = await target.get({ limit: PAGE_SIZE, offset, include: ['metadatas'] as any });
+      for (const m of page.metadatas ?? []) covered += Number(m?.chunks) || 0;
+    }
+  }
+  await target.modify({ metadata: { ...metadata, [CENTROID_COVERAGE_KEY]: covered } });
+  return rows.length;
+}
@@ -1,8 +1,17 @@
 import OpenAI from 'openai';
+import { lookupQueryEmbedding } from './query-cache';
 
-const openai = new OpenAI({ apiKey: process.env.OPENAI_API_KEY });
+// EMBEDDING_GATEWAY_URL routes embeddings through the local gateway
+// (scripts/embedding_gateway.py: LRU cache, request coalescing, batching).
+const openai = new OpenAI({
+  apiKey: process.env.OPENAI_API_KEY,
+  baseURL: process.env.EMBEDDING_GATEWAY_URL || undefined,
+});
 
-const EMBEDDING_MODEL = 'text-embedding-3-small';
+// Must match the model (and dimensions) the collection was embedded with;
+// scripts/reembed.py records both in the collection metadata.
+const EMBEDDING_MODEL = process.env.EMBEDDING_MODEL || 'text-embedding-3-small';
+const EMBEDDING_DIMENSIONS = Number(process.env.EMBEDDING_DIMENSIONS) || undefined;
 const MAX_BATCH_SIZE = 2048;
 
 export async function embedTexts(texts: string[]): Promise<number[][]> {
@@ -13,6 +22,7 @@ export async function embedTexts(texts: string[]): Promise<number[][]> {
     const response = await openai.embeddings.create({
       model: EMBEDDING_MODEL,
       input: batch,
+      dimensions: EMBEDDING_DIMENSIONS,
     });
     for (const item of response.data) {
       allEmbeddings.push(item.embedding);
@@ -23,9 +33,14 @@ export async function embedTexts(texts: string[]): Promise<number[][]> {
 }
 
 export async function embedQuery(text: string): Promise<number[]> {
+  // Titles, headings and common questions are pre-embedded at seed time
+  const cached = lookupQueryEmbedding(text, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS);
+  if (cached) return cached;
+
   const response = await openai.embeddings.create({
     model: EMBEDDING_MODEL,
     input: text,
+    dimensions: EMBEDDING_DIMENSIONS,
   });
   return response.data[0].embedding;
 }
@@ -0,0 +1,94 @@
+/**
+ * Typed chunk metadata schema (v3), shared with scripts/metadata_schema.py.
+ *
+ * ChromaDB compares metadata by type, so numeric fields are stored as numbers
+ * and dates as epoch days. That lets legalSearch push range filters such as
+ * `{ valid_to: { $gt: today } }` and `{ authority_tier: { $in: [1, 2] } }`
+ * down to Chroma instead of matching strings.
+ *
+ * v3 gives every chunk a validity interval [valid_from, valid_to) and a
+ * numeric `published_on`. Superseded chunk versions stay in the collection
+ * with a closed interval, so "the law as of day D" is a range filter too.
+ */
+
+import { deriveAuthorityTier } from './chunker';
+
+export const METADATA_SCHEMA_VERSION = 3;
+
+/** `market_standard_from` when unknown: in force since the epoch. */
+export const DATE_MIN = 0;
+
+/** `deprecated_on` / `valid_to` while still in force; `published_on` when undated. */
+export const DATE_MAX = 999_999;
+
+const MS_PER_DAY = 24 * 60 * 60 * 1000;
+
+export type ChunkMetadata = Record<string, string | number>;
+
+/** Days since 1970-01-01 (UTC). */
+export function epochDay(date: Date = new Date()): number {
+  return Math.floor(date.getTime() / MS_PER_DAY);
+}
+
+/**
+ * Parses "YYYY", "YYYY-MM", "YYYY-MM-DD" or ISO datetimes into an epoch day.
+ * Blank values map to `missing`; unparseable values return null.
+ */
+export function parseEpochDay(value: string | number | undefined, missing: number): number | null {
+  if (value === undefined || value === '') return missing;
+  if (typeof value === 'number') return Math.trunc(value);
+  const match = value.trim().match(/^(\d{4})(?:-(\d{2}))?(?:-(\d{2}))?/);
+  if (!match) return null;
+  const [, y, m = '01', d = '01'] = match;
+  const ms = Date.UTC(Number(y), Number(m) - 1, Number(d));
+  return Number.isNaN(ms) ? null : Math.floor(ms / MS_PER_DAY);
+}
+
+function toInt(value: string | number | undefined): number {
+  const n = Math.trunc(Number(value));
+  return Number.isFinite(n) ? n : 0;
+}
+
+function toFloat(value: string | number | undefined): number {
+  const n = Number(value);
+  return Number.isFinite(n) ? n : 0;
+}
+
+/**
+ * Coerces schema fields of a chunk's metadata to their stored types.
+ * Idempotent; fields outside the schema are passed through unchanged.
+ */
+export function toTypedMetadata(meta: Record<string, string | number>): ChunkMetadata {
+  const out: ChunkMetadata = { ...meta };
+  if ('authority_tier' in out) {
+    // Never 0: an unknown tier would pass every `$lte` tier filter
+    const tier = toInt(out.authority_tier);
+    out.authority_tier = tier >= 1 && tier <= 3
+      ? tier
+      : deriveAuthorityTier({
+          source: String(out.source ?? ''),
+          document_type: String(out.document_type ?? ''),
+          url: String(out.url ?? ''),
+        });
+  }
+  if ('relevance_score' in out) out.relevance_score = toFloat(out.relevance_score);
+  if ('chunk_index' in out) out.chunk_index = toInt(out.chunk_index);
+  if ('cfr_title' in out) out.cfr_title = toInt(out.cfr_title);
+  if ('market_standard_from' in out) {
+    out.market_standard_from = parseEpochDay(out.market_standard_from, DATE_MIN) ?? DATE_MIN;
+  }
+  if ('deprecated_on' in out) {
+    // Unreadable deprecation dates are treated as already deprecated
+    out.deprecated_on = parseEpochDay(out.deprecated_on, DATE_MAX) ?? DATE_MIN;
+  }
+  // v3 validity interval; an explicit valid_to is only ever shortened by deprecated_on
+  out.valid_from = parseEpochDay(out.valid_from ?? out.market_standard_from, DATE_MIN) ?? DATE_MIN;
+  out.valid_to = Math.min(
+    parseEpochDay(out.valid_to, DATE_MAX) ?? DATE_MIN,
+    (out.deprecated_on as number | undefined) ?? DATE_MAX,
+  );
+  // Chunks without a `date` (the Python seeder) keep the published_on they
+  // carry; undated documents sort as newest so recency cutoffs keep them
+  out.published_on = parseEpochDay(out.date || out.published_on, DATE_MAX) ?? DATE_MAX;
+  return out;
+}
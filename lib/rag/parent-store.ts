@@ -0,0 +1,128 @@
+/**
+ * Parent-document store written at seed time by scripts/parent_store.py:
+ * each source document's full text once, zlib-compressed, keyed by doc_id.
+ *
+ * Chunks carry `doc_id` and `start`/`end` character offsets into their
+ * document, so overlapping or adjacent hits can be merged into one exact span
+ * (and padded with surrounding context) with a local lookup instead of more
+ * vector queries. Without the store (e.g. a deployment without the seed
+ * artifacts) every lookup returns null and callers keep the chunk text.
+ *
+ * Layout: <dir>/index.json ({ version, documents: { docId: [offset, length, chars, title] } })
+ * and <dir>/blobs.bin (one zlib stream per document at offset..offset+length).
+ * The seeders rewrite index.json atomically after appending blobs, so the
+ * store is reloaded (and decompressed texts dropped) whenever its mtime or
+ * size changes; a long-running server sees re-seeded documents.
+ */
+
+import { existsSync, readFileSync, statSync } from 'node:fs';
+import path from 'node:path';
+import { inflateSync } from 'node:zlib';
+
+const PARENT_DIR =
+  process.env.PARENT_STORE_DIR ||
+  path.join(process.env.RAG_ARTIFACT_DIR || path.join(process.cwd(), '.rag'), 'parents');
+
+/** Decompressed documents kept in memory */
+const TEXT_CACHE_SIZE = 64;
+
+interface ParentIndex {
+  documents: Record<string, [number, number, number, string]>;
+  blobs: Buffer;
+}
+
+let store: ParentIndex | null | undefined;
+/** index.json mtime + size the store was loaded from ('' when it was missing) */
+let loadedStamp: string | undefined;
+const texts = new Map<string, string>();
+
+function indexStamp(indexPath: string): string {
+  try {
+    const st = statSync(indexPath);
+    return `${st.mtimeMs}:${st.size}`;
+  } catch {
+    return '';
+  }
+}
+
+function loadStore(): ParentIndex | null {
+  const indexPath = path.join(PARENT_DIR, 'index.json');
+  const blobPath = path.join(PARENT_DIR, 'blobs.bin');
+  const stamp = indexStamp(indexPath);
+  if (store !== undefined && stamp === loadedStamp) return store;
+  loadedStamp = stamp;
+  store = null;
+  if (stamp && existsSync(blobPath)) {
+    try {
+      const index = JSON.parse(readFileSync(indexPath, 'utf8')) as { documents: ParentIndex['documents'] };
+      store = { documents: index.documents, blobs: readFileSync(blobPath) };
+    } catch (error) {
+      console.warn('[parent-store] failed to load:', error instanceof Error ? error.message : error);
+    }
+  }
+  // A rewritten index (new documents, compaction or a version bump) moves offsets: drop cached texts
+  texts.clear();
+  return store;
+}
+
+/** Full text of a document, or null when it isn't stored. */
+export function getParentText(docId: string): string | null {
+  const s = loadStore();
+  const cached = texts.get(docId);
+  if (cached !== undefined) return cached;
+  const entry = s?.documents[docId];
+  if (!s || !entry) return null;
+  const [offset, length] = entry;
+  const text = inflateSync(s.blobs.subarray(offset, offset + length)).toString('utf8');
+  if (texts.size >= TEXT_CACHE_SIZE) texts.delete(texts.keys().next().value as string);
+  texts.set(docId, text);
+  return text;
+}
+
+export interface ChunkSpan {
+  docId: string;
+  start: number;
+  end: number;
+}
+
+/**
+ * Merge spans of the same document that overlap or lie within `gap` chars of
+ * each other. Output order follows each merged span's best (earliest) input;
+ * `members` lists the input indices folded into it. Mirrors merge_spans in
+ * scripts/parent_store.py.
+ */
+export function mergeSpans(
+  spans: ChunkSpan[],
+  gap = 0,
+): Array<ChunkSpan & { members: number[] }> {
+  const byDoc = new Map<string, Array<ChunkSpan & { rank: number }>>();
+  spans.forEach((s, rank) => {
+    const list = byDoc.get(s.docId) ?? [];
+    list.push({ ...s, rank });
+    byDoc.set(s.docId, list);
+  });
+
+  const merged: Array<ChunkSpan & { members: number[] }> = [];
+  for (const list of byDoc.values()) {
+    list.sort((a, b) => a.start - b.start);
+    let cur = { docId: list[0].docId, start: list[0].start, end: list[0].end, members: [list[0].rank] };
+    for (const s of list.slice(1)) {
+      if (s.start <= cur.end + gap) {
+        cur.end = Math.max(cur.end, s.end);
+        cur.members.push(s.rank);
+      } else {
+        merged.push(cur);
+        cur = { docId: s.docId, start: s.start, end: s.end, members: [s.rank] };
+      }
+    }
+    merged.push(cur);
+  }
+  return merged.sort((a, b) => Math.min(...a.members) - Math.min(...b.members));
+}
+
+/** Exact text for a span, widened by `pad` characters each side; null if the document isn't stored. */
+export function spanText(span: ChunkSpan, pad = 0): string | null {
+  const text = getParentText(span.docId);
+  if (text === null) return null;
+  return text.slice(Math.max(0, span.start - pad), Math.min(text.length, span.end + pad));
+}
@@ -0,0 +1,98 @@
+/**
+ * Pre-embedded query table written at seed time by scripts/query_cache.py
+ * (document titles, section headings and common questions).
+ *
+ * embedQuery checks it before calling OpenAI, so the most frequent first
+ * searches skip the embedding round trip. The table is reloaded whenever the
+ * mtime or size of index.json or vectors.f32 changes, so a long-running server
+ * picks up a rebuild. If it doesn't exist (e.g. on a deployment without the
+ * seed artifacts), or was built with another embedding model, every lookup
+ * simply misses.
+ *
+ * Layout: <dir>/index.json ({ model, dimensions, keys }) and <dir>/vectors.f32
+ * (little-endian float32, row i belongs to keys[i]).
+ */
+
+import { readFileSync, statSync } from 'node:fs';
+import path from 'node:path';
+
+const QUERY_CACHE_DIR =
+  process.env.QUERY_CACHE_DIR ||
+  path.join(process.env.RAG_ARTIFACT_DIR || path.join(process.cwd(), '.rag'), 'query-cache');
+
+interface QueryTable {
+  model: string;
+  dimensions: number;
+  rows: Map<string, number>;
+  vectors: Float32Array;
+}
+
+let table: QueryTable | null | undefined;
+/** index.json + vectors.f32 mtime and size the table was loaded from ('' when missing) */
+let loadedStamp: string | undefined;
+
+/** Lowercase, collapse whitespace, drop trailing ?.! — mirrors normalize_query in scripts/query_cache.py. */
+export function normalizeQuery(text: string): string {
+  return text.toLowerCase().replace(/\s+/g, ' ').trim().replace(/[?.!]+$/, '').trim();
+}
+
+function fileStamp(file: string): string {
+  try {
+    const st = statSync(file);
+    return `${st.mtimeMs}:${st.size}`;
+  } catch {
+    return '';
+  }
+}
+
+function loadTable(model: string): QueryTable | null {
+  const indexPath = path.join(QUERY_CACHE_DIR, 'index.json');
+  const vectorsPath = path.join(QUERY_CACHE_DIR, 'vectors.f32');
+  const indexStamp = fileStamp(indexPath);
+  const vectorsStamp = fileStamp(vectorsPath);
+  const stamp = indexStamp && vectorsStamp ? `${indexStamp}|${vectorsStamp}` : '';
+  if (table !== undefined && stamp === loadedStamp) return table;
+  loadedStamp = stamp;
+  table = null;
+  if (!stamp) return table;
+  try {
+    const index = JSON.parse(readFileSync(indexPath, 'utf8')) as {
+      model: string;
+      dimensions: number;
+      keys: string[];
+    };
+    // EMBEDDING_MODEL changed since the seed: the vectors are from another space
+    if (index.model !== model) {
+      console.warn(`[query-cache] built with ${index.model}, not ${model}; ignoring`);
+      return table;
+    }
+    const buf = readFileSync(vectorsPath);
+    // Copy into an aligned buffer; Node's file Buffers may start at any offset
+    const vectors = new Float32Array(new Uint8Array(buf).buffer);
+    if (vectors.length !== index.keys.length * index.dimensions) {
+      console.warn(`[query-cache] ${vectorsPath} does not match index.json; ignoring`);
+      return table;
+    }
+    table = {
+      model: index.model,
+      dimensions: index.dimensions,
+      rows: new Map(index.keys.map((key, i) => [key, i])),
+      vectors,
+    };
+  } catch (error) {
+    console.warn('[query-cache] failed to load:', error instanceof Error ? error.message : error);
+  }
+  return table;
+}
+
+/**
+ * Pre-computed embedding for `text`, or null when it isn't in the table (or
+ * the table was built for another model or vector size).
+ */
+export function lookupQueryEmbedding(text: string, model: string, dimensions?: number): number[] | null {
+  const t = loadTable(model);
+  if (!t || t.model !== model || (dimensions && t.dimensions !== dimensions)) return null;
+  const row = t.rows.get(normalizeQuery(text));
+  if (row === undefined) return null;
+  return Array.from(t.vectors.subarray(row * t.dimensions, (row + 1) * t.dimensions));
+}
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Parallel Chroma writer: overlaps upserts with embedding and with each other.
+
+Seeding used to upsert one batch at a time on the thread that embeds, so the
+Chroma round trip sat on the critical path.  ChromaWriter hands each batch to
+a pool of `concurrency` threads, each with its own HttpClient (its own
+connection), and returns immediately; the caller embeds the next batch while
+earlier ones are in flight.
+
+Guarantees:
+  - upserts are idempotent by id, so a failed batch is simply resent (with
+    exponential backoff, up to `retries` times)
+  - ordering: a batch that shares ids with an earlier, still-running batch
+    waits for it, so a retry can never overwrite a newer write of the same id
+    (only ids with a write in flight are tracked)
+  - backpressure: at most 2 × concurrency batches are queued, so embeddings
+    don't pile up in memory when Chroma is the bottleneck
+  - close() waits for everything and raises the first batch that ran out of
+    retries
+
+stats() reports rows/s over the writer's lifetime and per-batch write latency
+percentiles (p50/p95/p99, including retries).
+
+Run (benchmark against the configured Chroma server, scratch collection):
+  python3 scripts/chroma_writer.py --rows 20000 --writers 1 4 8
+  python3 scripts/chroma_writer.py --rows 50000 --dim 1536 --batch-size 200 --json
+"""
+
+import argparse, json, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_WRITERS = 4
+DEFAULT_RETRIES = 4
+RETRY_BACKOFF = 0.5
+BENCH_COLLECTION = "elle-writer-bench"
+
+
+class WriteError(RuntimeError):
+    pass
+
+
+class ChromaWriter:
+    def __init__(self, collection: str, concurrency: int = DEFAULT_WRITERS, retries: int = DEFAULT_RETRIES,
+                 client_factory=None):
+        from seed_legal_concepts import new_chroma_client
+
+        self.collection = collection
+        self.concurrency = max(1, concurrency)
+        self.retries = retries
+        self.client_factory = client_factory or new_chroma_client
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="chroma-writer")
+        self._slots = threading.BoundedSemaphore(2 * self.concurrency)
+        self._lock = threading.Lock()
+        self._last_write = {}  # id → future of the latest batch writing it
+        self._futures = []
+        self.rows = self.batches = self.retried = 0
+        self.latencies = []
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close(raise_errors=exc[0] is None)
+
+    def _collection(self):
+        # One client (and connection pool) per writer thread
+        col = getattr(self._local, "col", None)
+        if col is None:
+            col = self._local.col = self.client_factory().get_collection(name=self.collection)
+        return col
+
+    def _write(self, deps: list, seq: int, kwargs: dict):
+        for dep in deps:
+            dep.exception()  # wait; a failed predecessor is reported by its own future
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                self._collection().upsert(**kwargs)
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    raise WriteError(f"batch {seq} ({len(kwargs['ids'])} rows) failed after "
+                                     f"{attempt + 1} attempts: {e}") from e
+                with self._lock:
+                    self.retried += 1
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+        with self._lock:
+            self.rows += len(kwargs["ids"])
+            self.batches += 1
+            self.latencies.append(time.perf_counter() - start)
+
+    def upsert(self, ids: list, embeddings, documents=None, metadatas=None):
+        """Queue a batch; blocks only while 2 × concurrency batches are already queued."""
+        self._slots.acquire()
+        kwargs = {"ids": list(ids), "embeddings": embeddings}
+        if documents is not None:
+            kwargs["documents"] = documents
+        if metadatas is not None:
+            kwargs["metadatas"] = metadatas
+        with self._lock:
+            deps = {id(f): f for f in (self._last_write.get(i) for i in kwargs["ids"]) if f and not f.done()}
+            future = self._pool.submit(self._write, list(deps.values()), len(self._futures), kwargs)
+            for i in kwargs["ids"]:
+                self._last_write[i] = future
+            self._futures.append(future)
+        future.add_done_callback(lambda f: self._done(f, kwargs["ids"]))
+        return future
+
+    def _done(self, future, ids: list):
+        self._slots.release()
+        # Forget ids this batch was the latest write of, so _last_write stays bounded by what is in flight
+        with self._lock:
+            for i in ids:
+                if self._last_write.get(i) is future:
+                    del self._last_write[i]
+
+    def close(self, raise_errors: bool = True):
+        self._pool.shutdown(wait=True)
+        if self.finished is None:
+            self.finished = time.perf_counter()
+        errors = [f.exception() for f in self._futures if f.exception() is not None]
+        self._last_write.clear()
+        if errors and raise_errors:
+            raise errors[0]
+        return self.stats()
+
+    def stats(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        lat = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            "writers": self.concurrency,
+            "rows": self.rows,
+            "batches": self.batches,
+            "retries": self.retried,
+            "failed_batches": sum(1 for f in self._futures if f.done() and f.exception() is not None),
+            "seconds": elapsed,
+            "rows_per_second": self.rows / elapsed if elapsed > 0 else 0.0,
+            "latency_ms_p50": float(np.percentile(lat, 50)),
+            "latency_ms_p95": float(np.percentile(lat, 95)),
+            "latency_ms_p99": float(np.percentile(lat, 99)),
+        }
+
+
+def format_stats(s: dict) -> str:
+    retries = f", {s['retries']} retries" if s["retries"] else ""
+    return (f"Chroma writes: {s['rows']} rows in {s['batches']} batches over {s['writers']} writer(s), "
+            f"{s['rows_per_second']:.0f} rows/s; batch latency p50 {s['latency_ms_p50']:.0f} ms, "
+            f"p95 {s['latency_ms_p95']:.0f} ms, p99 {s['latency_ms_p99']:.0f} ms{retries}")
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def bench(writers: int, vectors: np.ndarray, batch_size: int, client_factory=None) -> dict:
+    from seed_legal_concepts import new_chroma_client
+
+    client = (client_factory or new_chroma_client)()
+    try:
+        client.delete_collection(name=BENCH_COLLECTION)
+    except Exception:
+        pass
+    client.create_collection(name=BENCH_COLLECTION, metadata={"hnsw:space": "cosine"})
+    with ChromaWriter(BENCH_COLLECTION, writers, client_factory=client_factory) as w:
+        for i in range(0, len(vectors), batch_size):
+            ids = [f"bench-{j}" for j in range(i, min(i + batch_size, len(vectors)))]
+            w.upsert(ids, vectors[i : i + batch_size], documents=ids)
+    client.delete_collection(name=BENCH_COLLECTION)
+    return w.stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parallel Chroma upserts.")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.rows, args.dim), dtype=np.float32)
+    results = []
+    for n in args.writers:
+        if not args.json:
+            print(f"  writers={n} ...", flush=True)
+        results.append(bench(n, vectors, args.batch_size))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"\n{'writers':>8} {'rows/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'retries':>8}")
+    for r in results:
+        print(f"{r['writers']:>8} {r['rows_per_second']:>10.0f} {r['latency_ms_p50']:>8.1f} "
+              f"{r['latency_ms_p95']:>8.1f} {r['latency_ms_p99']:>8.1f} {r['retries']:>8}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
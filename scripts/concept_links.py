@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Index-time source URL resolution, and an offline port of the legal term matcher.
+
+legalSearch resolves each source's URL (resolveSourceUrl) and links legal
+terms in every answer (injectLegalConceptLinks), both in
+lib/rag/citation-utils.ts.  The URL only depends on the document, so
+chunk_text stores it on every chunk:
+
+  source_url      the document's canonical http(s) URL, "" when it has none
+
+Answers are generated text and can mention terms their sources don't, so
+they are always linked against the whole LEGAL_CONCEPT_URLS table at query
+time; nothing about terms is stored per chunk.  concept_spans() mirrors that
+matcher (first match of each term per paragraph, longest term first,
+non-overlapping and outside code, links and URLs) for `match` and `stats`.
+The term table is read from citation-utils.ts itself, so both sides always
+agree on it.
+
+`backfill` sets source_url on an existing collection in place with
+metadata-only updates (no re-embedding), and strips the per-chunk
+concept_spans field earlier seeds wrote.
+
+Run:
+  python3 scripts/concept_links.py match "HIPAA requires covered entities to protect PHI."
+  python3 scripts/concept_links.py backfill [--dry-run]
+  python3 scripts/concept_links.py stats
+"""
+import argparse, re, sys, time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+from seed_legal_concepts import COLLECTION_NAME, get_chroma
+
+CITATION_UTILS = Path(__file__).parent.parent / "lib" / "rag" / "citation-utils.ts"
+PAGE_SIZE = 500
+_ENTRY = re.compile(r"""^\s*(['"])(.+?)\1\s*:\s*'([^']+)',?\s*$""")
+# Never linked inside: code, existing markdown links, bare URLs
+_PROTECTED = re.compile(r"```[\s\S]*?```|`[^`]+`|\[[^\]\n]*\]\([^)\s]*\)|https?://\S+")
+_PARAGRAPH_BREAK = re.compile(r"\n\n+")
+
+
+@lru_cache(maxsize=1)
+def concept_urls(path: Path = CITATION_UTILS) -> dict:
+    """LEGAL_CONCEPT_URLS (term → URL) parsed from the TypeScript source, in declaration order."""
+    terms, inside = {}, False
+    for line in Path(path).read_text().splitlines():
+        if line.startswith("export const LEGAL_CONCEPT_URLS"):
+            inside = True
+        elif inside and line.startswith("};"):
+            break
+        elif inside and (m := _ENTRY.match(line)):
+            terms[m.group(2).replace("\\'", "'")] = m.group(3)
+    if not terms:
+        raise ValueError(f"no LEGAL_CONCEPT_URLS entries in {path}")
+    return terms
+
+
+@lru_cache(maxsize=1)
+def _patterns() -> list:
+    # Same order and regex as injectLegalConceptLinks: longest first (stable for
+    # ties), word-bounded, case-insensitive, not already inside a link label or URL
+    entries = sorted(concept_urls(), key=len, reverse=True)
+    return [(term, re.compile(rf"(?<!\[)(?<!\]\()\b({re.escape(term)})\b(?!\])", re.IGNORECASE | re.ASCII))
+            for term in entries]
+
+
+def concept_spans(text: str) -> list:
+    """[(start, end, term), ...] in text order; see the module docstring for the rules."""
+    protected = [m.span() for m in _PROTECTED.finditer(text)]
+    spans, pos = [], 0
+    for para in _PARAGRAPH_BREAK.split(text):
+        base = text.index(para, pos) if para else pos
+        pos = base + len(para)
+        taken = [(s - base, e - base) for s, e in protected if s < pos and e > base]
+        seen = set()
+        for term, pattern in _patterns():
+            if term.lower() in seen:
+                continue
+            for m in pattern.finditer(para):
+                s, e = m.span(1)
+                if not any(s < te and e > ts for ts, te in taken):
+                    spans.append((base + s, base + e, term))
+                    taken.append((s, e))
+                    seen.add(term.lower())
+                    break
+    return sorted(spans)
+
+
+def resolve_source_url(url) -> str:
+    """Port of resolveSourceUrl: the trimmed URL if it is http(s), else ""."""
+    u = (url or "").strip() if isinstance(url, str) else ""
+    return u if u.startswith(("http://", "https://")) else ""
+
+
+# ---------------------------------------------------------------------------
+# Existing collections
+# ---------------------------------------------------------------------------
+
+def backfill(col, page_size: int = PAGE_SIZE, dry_run: bool = False) -> dict:
+    """Set source_url where it is missing or stale and drop legacy concept_spans, via metadata-only updates."""
+    total = col.count()
+    scanned = changed = 0
+    start = time.perf_counter()
+    # source_url is a document field; compact chunks join it from <collection>-docs
+    compact = (col.metadata or {}).get("metadata_mode") == "compact"
+    for offset in range(0, total, page_size):
+        page = col.get(limit=page_size, offset=offset, include=["metadatas"])
+        ids, metas = [], []
+        for id_, meta in zip(page["ids"], page["metadatas"]):
+            meta = meta or {}
+            fields = {} if compact else {"source_url": resolve_source_url(meta.get("url"))}
+            if "concept_spans" in meta:
+                fields["concept_spans"] = None  # None removes the key
+            if any(meta.get(k, ...) != v for k, v in fields.items()):
+                ids.append(id_)
+                metas.append({**meta, **fields})
+        if ids and not dry_run:
+            col.update(ids=ids, metadatas=metas)
+        scanned += len(page["ids"])
+        changed += len(ids)
+        print(f"  {scanned}/{total} scanned, {changed} updated")
+    return {"scanned": scanned, "changed": changed, "seconds": time.perf_counter() - start}
+
+
+def stats(col, page_size: int = PAGE_SIZE) -> dict:
+    """Concept terms in the chunk text (matched here, not stored), and chunks backfill would still change."""
+    terms, chunks, linked, stale = Counter(), 0, 0, 0
+    compact = (col.metadata or {}).get("metadata_mode") == "compact"
+    for offset in range(0, col.count(), page_size):
+        page = col.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+        for text, meta in zip(page["documents"], page["metadatas"]):
+            meta = meta or {}
+            chunks += 1
+            spans = concept_spans(text or "")
+            linked += bool(spans)
+            terms.update(t for _, _, t in spans)
+            stale += "concept_spans" in meta or (not compact and "source_url" not in meta)
+    return {"chunks": chunks, "with_concepts": linked, "stale": stale, "terms": terms}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Source URLs on chunks, and the legal term matcher.")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+    m = sub.add_parser("match", help="print the concept spans found in a text")
+    m.add_argument("text")
+    b = sub.add_parser("backfill", help="set source_url (and drop concept_spans) in an existing collection")
+    b.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    b.add_argument("--dry-run", action="store_true")
+    sub.add_parser("stats", help="how many chunks mention concepts, and the most common terms")
+    args = parser.parse_args(argv)
+
+    if args.command == "match":
+        urls = concept_urls()
+        for start, end, term in concept_spans(args.text):
+            print(f"  {start:>5}-{end:<5} {args.text[start:end]!r:<32} {term} → {urls[term]}")
+        return
+
+    col = get_chroma().get_collection(name=args.collection)
+    if args.command == "backfill":
+        print(f"\n=== Backfilling source_url in '{args.collection}'{' (dry run)' if args.dry_run else ''} ===\n")
+        r = backfill(col, args.page_size, args.dry_run)
+        print(f"\n=== Done: {r['changed']}/{r['scanned']} chunks updated in {r['seconds']:.1f}s ===\n")
+        return
+
+    r = stats(col)
+    print(f"{r['with_concepts']}/{r['chunks']} chunks mention at least one concept")
+    if r["stale"]:
+        print(f"{r['stale']} chunks lack source_url or still carry concept_spans (run backfill)")
+    for term, n in r["terms"].most_common(15):
+        print(f"  {n:>5}  {term}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Shared pytest fixtures: a throwaway artifact directory (RAG_ARTIFACT_DIR is
+pointed at it before any script module is imported), a local Chroma client
+and deterministic offline embeddings, so seeding and sync code runs without
+OpenAI or a Chroma server.
+
+Run:
+  python3 -m pytest scripts
+"""
+
+import hashlib, os, shutil, sys, tempfile
+
+os.environ["RAG_ARTIFACT_DIR"] = tempfile.mkdtemp(prefix="rag-test-")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import numpy as np
+import pytest
+
+import seed_legal_concepts
+
+FAKE_DIMENSIONS = 64
+
+
+def fake_embed_texts(texts: list, model=None, dimensions=None) -> np.ndarray:
+    """Bag-of-words hashed into FAKE_DIMENSIONS buckets: texts sharing words land close together."""
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    out = np.zeros((len(texts), FAKE_DIMENSIONS), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in text.lower().split():
+            out[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % FAKE_DIMENSIONS] += 1
+        out[i, 0] += 1e-3  # never all-zero
+    return out
+
+
+@pytest.fixture(autouse=True)
+def artifact_dir():
+    """The shared RAG_ARTIFACT_DIR, emptied after every test."""
+    path = seed_legal_concepts.ARTIFACT_DIR
+    yield path
+    for child in path.iterdir():
+        shutil.rmtree(child) if child.is_dir() else child.unlink()
+
+
+@pytest.fixture
+def chroma(tmp_path, monkeypatch):
+    """A local persistent Chroma client returned by get_chroma() for the test."""
+    import chromadb
+
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(seed_legal_concepts, "_chroma", client)
+    return client
+
+
+@pytest.fixture
+def fake_embeddings(chroma, monkeypatch):
+    """Swap embed_texts (and the collections' OpenAI embedding function) in every loaded script module."""
+    real_embed, real_function = seed_legal_concepts.embed_texts, seed_legal_concepts.get_embedding_function
+    for module in list(sys.modules.values()):
+        if getattr(module, "embed_texts", None) is real_embed:
+            monkeypatch.setattr(module, "embed_texts", fake_embed_texts)
+        if getattr(module, "get_embedding_function", None) is real_function:
+            monkeypatch.setattr(module, "get_embedding_function", lambda *a, **kw: None)
+    return fake_embed_texts
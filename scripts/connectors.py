@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+Async connectors for regulatory sources (eCFR, Federal Register).
+
+Python counterpart of scripts/ingest-ecfr.ts and scripts/ingest-federal-register.ts.
+Instead of fetching one page at a time with a fixed sleep, every request goes
+through one pooled aiohttp session with a per-host rate limit (requests/second)
+and retries on 429/5xx.  Once a query's first page reports the total, the
+remaining pages are prefetched concurrently.  Documents stream into the same
+chunk_text → embed → upsert path the seeder uses.  Embedding and upserts run
+in a worker thread, so fetching carries on while a batch is being embedded.
+
+Responses are cached on disk with their ETag / Last-Modified validators
+(http_cache.py), and re-fetches are conditional.  Every document is
+fingerprinted from its source-stable fields (its `version`: identifiers,
+titles and effective dates, not query-dependent excerpts or fallback dates)
+and the chunking config, so one unchanged since the last run is skipped
+before chunking.  A changed document that re-chunks into fewer chunks has its
+old tail chunks deleted.  A nightly refresh therefore
+costs mostly 304s and no embedding calls.  The document centroids
+(doc_centroids.py) of every document written are updated at the end.
+
+Base URLs can be overridden, so the connectors can run against
+fake_regulatory_api.py, a local fake that serves the same JSON shapes with
+pagination and injected 429/5xx failures (see test_connectors.py).
+
+Run:
+  python3 scripts/connectors.py                                  # both sources
+  python3 scripts/connectors.py --sources ecfr --max-pages 2 --rate 1
+  python3 scripts/connectors.py --refresh                        # re-embed even unchanged documents
+  python3 scripts/fake_regulatory_api.py --port 8081 --fail-429 1 &
+  python3 scripts/connectors.py --dry-run --ecfr-url http://127.0.0.1:8081/api/search/v1/results \\
+      --fr-url http://127.0.0.1:8081/api/v1/documents.json
+"""
+
+import argparse, asyncio, hashlib, json, math, re, sys, time
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from doc_centroids import update_centroids
+from http_cache import HttpCache, document_fingerprint, request_key
+from lexical_index import DEFAULT_LEXICAL_PATH, LexicalIndex
+from metadata_schema import METADATA_SCHEMA_VERSION, typed_metadata
+from seed_legal_concepts import (
+    BATCH_SIZE, COLLECTION_NAME, add_chunking_args, chunk_text, embed_texts, get_chroma, get_embedding_function,
+    link_chunks,
+)
+
+ECFR_SEARCH_API = "https://www.ecfr.gov/api/search/v1/results"
+FR_API_BASE = "https://www.federalregister.gov/api/v1/documents.json"
+
+DEFAULT_RATE_LIMIT = 2.0  # requests/second per host
+CONNECTION_LIMIT = 16
+CONNECTIONS_PER_HOST = 4
+MAX_RETRIES = 4
+REQUEST_TIMEOUT = 30
+MIN_TEXT_LENGTH = 100
+
+# CFR titles mapped to industry verticals (mirrors scripts/ingest-ecfr.ts)
+CFR_MAPPINGS = [
+    {"title": 21, "industry": "healthcare", "description": "FDA - Food and Drugs",
+     "search_terms": ["drug regulation", "medical device", "FDA approval"]},
+    {"title": 42, "industry": "healthcare", "description": "Public Health",
+     "search_terms": ["public health", "Medicare", "Medicaid"]},
+    {"title": 45, "industry": "healthcare", "description": "HIPAA Privacy and Security",
+     "search_terms": ["HIPAA", "health information privacy", "protected health information"]},
+    {"title": 16, "industry": "ecommerce", "description": "FTC - Commercial Practices",
+     "search_terms": ["consumer protection", "advertising regulation", "FTC Act"]},
+    {"title": 15, "industry": "ecommerce", "description": "Commerce and Foreign Trade",
+     "search_terms": ["electronic commerce", "online consumer", "digital trade"]},
+    {"title": 47, "industry": "saas", "description": "Telecommunication (FCC)",
+     "search_terms": ["data protection", "telecommunications privacy", "cybersecurity"]},
+    {"title": 34, "industry": "edtech", "description": "Education",
+     "search_terms": ["FERPA", "student privacy", "education records"]},
+    {"title": 12, "industry": "real_estate", "description": "Banks and Banking",
+     "search_terms": ["RESPA", "mortgage disclosure", "real estate settlement"]},
+    {"title": 24, "industry": "real_estate", "description": "Housing and Urban Development",
+     "search_terms": ["fair housing", "HUD regulation", "housing discrimination"]},
+    {"title": 14, "industry": "travel", "description": "Aeronautics and Space (DOT)",
+     "search_terms": ["airline consumer protection", "aviation regulation", "passenger rights"]},
+    {"title": 46, "industry": "travel", "description": "Shipping",
+     "search_terms": ["cruise regulation", "maritime passenger", "shipping consumer"]},
+    {"title": 31, "industry": "esports", "description": "Money and Finance (FinCEN)",
+     "search_terms": ["gaming compliance", "anti-money laundering", "financial crimes"]},
+    {"title": 28, "industry": "general", "description": "Judicial Administration",
+     "search_terms": ["judicial procedure", "court rules", "legal process"]},
+    {"title": 29, "industry": "general", "description": "Labor",
+     "search_terms": ["employment law", "labor standards", "workplace regulation"]},
+]
+
+# Agency slugs mapped to industry verticals (mirrors scripts/ingest-federal-register.ts)
+AGENCY_MAPPINGS = [
+    {"slug": "food-and-drug-administration", "name": "FDA", "industry": "healthcare"},
+    {"slug": "health-and-human-services-department", "name": "HHS", "industry": "healthcare"},
+    {"slug": "centers-for-medicare-medicaid-services", "name": "CMS", "industry": "healthcare"},
+    {"slug": "federal-trade-commission", "name": "FTC", "industry": "ecommerce"},
+    {"slug": "consumer-product-safety-commission", "name": "CPSC", "industry": "ecommerce"},
+    {"slug": "federal-communications-commission", "name": "FCC", "industry": "saas"},
+    {"slug": "education-department", "name": "ED", "industry": "edtech"},
+    {"slug": "housing-and-urban-development-department", "name": "HUD", "industry": "real_estate"},
+    {"slug": "consumer-financial-protection-bureau", "name": "CFPB", "industry": "real_estate"},
+    {"slug": "transportation-department", "name": "DOT", "industry": "travel"},
+    {"slug": "federal-aviation-administration", "name": "FAA", "industry": "travel"},
+    {"slug": "transportation-security-administration", "name": "TSA", "industry": "travel"},
+    {"slug": "justice-department", "name": "DOJ", "industry": "esports"},
+    {"slug": "financial-crimes-enforcement-network", "name": "FinCEN", "industry": "esports"},
+    {"slug": "labor-department", "name": "DOL", "industry": "general"},
+    {"slug": "small-business-administration", "name": "SBA", "industry": "general"},
+]
+
+_TAG = re.compile(r"<[^>]*>")
+_ENTITY = re.compile(r"&[a-z]+;")
+
+
+def strip_html(text: str) -> str:
+    return _ENTITY.sub(" ", _TAG.sub("", text or "")).strip()
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across every task sharing it."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HttpClient:
+    """
+    Pooled aiohttp session with per-host rate limits and retry/backoff on 429,
+    5xx and connection errors.  With an HttpCache, requests are conditional and
+    304s are served from the cached body.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT, limit=CONNECTION_LIMIT, limit_per_host=CONNECTIONS_PER_HOST,
+                 retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT, cache: HttpCache = None):
+        self.cache = cache
+        self.rate = rate
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.retries = retries
+        self.timeout = timeout
+        self.session = None
+        self._limiters = {}
+        self.requests = self.retried = self.bytes = 0
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"Accept": "application/json"},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def limiter(self, url: str) -> RateLimiter:
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = RateLimiter(self.rate)
+        return self._limiters[host]
+
+    async def get_json(self, url: str, params=None):
+        key = request_key(url, params)
+        headers = self.cache.validators(key) if self.cache is not None else {}
+        for attempt in range(self.retries + 1):
+            await self.limiter(url).wait()
+            delay = min(2 ** attempt, 30)
+            try:
+                async with self.session.get(url, params=params, headers=headers) as resp:
+                    self.requests += 1
+                    if resp.status == 304 and self.cache is not None:
+                        return json.loads(self.cache.cached_body(key))
+                    if (resp.status == 429 or resp.status >= 500) and attempt < self.retries:
+                        retry_after = resp.headers.get("Retry-After", "")
+                        delay = float(retry_after) if retry_after.isdigit() else delay
+                    else:
+                        resp.raise_for_status()
+                        body = await resp.read()
+                        self.bytes += len(body)
+                        if self.cache is not None:
+                            self.cache.store(key, body, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                        return json.loads(body)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+            self.retried += 1
+            await asyncio.sleep(delay)
+
+
+# ---------------------------------------------------------------------------
+# Connectors
+# ---------------------------------------------------------------------------
+
+class Connector:
+    """
+    A source is a list of jobs (one paginated query each).  Subclasses implement
+    fetch_page, page_count (from the first page) and documents, which yields
+    {id, text, metadata} dicts ready for chunk_text.
+    """
+
+    name = "connector"
+
+    def __init__(self, base_url: str, max_pages: int):
+        self.base_url = base_url
+        self.max_pages = max_pages
+
+    def jobs(self) -> list:
+        raise NotImplementedError
+
+    def describe(self, job) -> str:
+        return str(job)
+
+    async def fetch_page(self, http: HttpClient, job, page: int) -> dict:
+        raise NotImplementedError
+
+    def page_count(self, first: dict) -> int:
+        raise NotImplementedError
+
+    def documents(self, job, data: dict):
+        raise NotImplementedError
+
+    async def pages(self, http: HttpClient, job):
+        """Yield (page, data) in order; pages after the first are fetched concurrently."""
+        first = await self.fetch_page(http, job, 1)
+        yield 1, first
+        last = min(self.max_pages, self.page_count(first))
+        tasks = [asyncio.ensure_future(self.fetch_page(http, job, p)) for p in range(2, last + 1)]
+        try:
+            for page, task in enumerate(tasks, start=2):
+                yield page, await task
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark retrieved so a failed prefetch isn't logged twice
+
+
+class ECFRConnector(Connector):
+    name = "ecfr"
+    per_page = 20
+
+    def __init__(self, base_url=ECFR_SEARCH_API, max_pages=5, mappings=CFR_MAPPINGS):
+        super().__init__(base_url, max_pages)
+        self.mappings = mappings
+
+    def jobs(self) -> list:
+        return [(m, term) for m in self.mappings for term in m["search_terms"]]
+
+    def describe(self, job) -> str:
+        mapping, term = job
+        return f"title {mapping['title']} '{term}'"
+
+    async def fetch_page(self, http, job, page):
+        mapping, term = job
+        # eCFR search has no cfr_title filter; the title goes into the query
+        params = {"query": f'"title {mapping["title"]}" {term}', "per_page": str(self.per_page), "page": str(page)}
+        return await http.get_json(self.base_url, params)
+
+    def page_count(self, first):
+        return math.ceil(first.get("meta", {}).get("total_count", 0) / self.per_page)
+
+    def documents(self, job, data):
+        mapping, _ = job
+        today = date.today().isoformat()
+        for result in data.get("results") or []:
+            ends_on = result.get("ends_on")
+            if ends_on and ends_on < today:
+                continue  # obsolete regulation
+            text = strip_html(result.get("full_text_excerpt", ""))
+            if len(text) < MIN_TEXT_LENGTH:
+                continue
+            headings = result.get("headings") or {}
+            hierarchy = result.get("hierarchy") or {}
+            section_title = " - ".join(filter(None, (headings.get("title"), headings.get("part"),
+                                                     headings.get("section"))))
+            key = hierarchy.get("section") or hierarchy.get("part") or _digest(text)
+            yield {
+                "id": f"ecfr-t{mapping['title']}-{key}",
+                "text": text,
+                # The excerpt depends on the search term that found the section; its
+                # headings and effective dates identify the revision
+                "version": [mapping["title"], mapping["industry"], headings, result.get("starts_on"), ends_on],
+                "metadata": typed_metadata({
+                    "source": "ecfr",
+                    "title": section_title or f"CFR Title {mapping['title']}",
+                    "jurisdiction": "US-Federal",
+                    "industry": mapping["industry"],
+                    "document_type": "regulation",
+                    "cfr_title": mapping["title"],
+                    "date": result.get("starts_on") or today,
+                    "url": f"https://www.ecfr.gov/current/title-{mapping['title']}",
+                    "authority_tier": 1,
+                    "market_standard_from": result.get("starts_on") or "",
+                    "deprecated_on": ends_on or "",
+                }),
+            }
+
+
+class FederalRegisterConnector(Connector):
+    name = "federal-register"
+    per_page = 100
+    fields = ("document_number", "title", "type", "abstract", "body_html_url", "html_url", "publication_date",
+              "agencies", "excerpts")
+
+    def __init__(self, base_url=FR_API_BASE, max_pages=10, agencies=AGENCY_MAPPINGS, since=None):
+        super().__init__(base_url, max_pages)
+        self.agencies = agencies
+        self.since = since or (date.today() - timedelta(days=730)).isoformat()
+
+    def jobs(self) -> list:
+        return list(self.agencies)
+
+    def describe(self, job) -> str:
+        return f"{job['name']} ({job['slug']})"
+
+    async def fetch_page(self, http, job, page):
+        params = [
+            ("conditions[agencies][]", job["slug"]),
+            ("conditions[publication_date][gte]", self.since),
+            ("per_page", str(self.per_page)),
+            ("page", str(page)),
+            ("order", "relevance"),
+            *(("fields[]", f) for f in self.fields),
+        ]
+        return await http.get_json(self.base_url, params)
+
+    def page_count(self, first):
+        if not first.get("next_page_url"):
+            return 1
+        return math.ceil(first.get("count", 0) / self.per_page)
+
+    def documents(self, job, data):
+        today = date.today().isoformat()
+        for doc in data.get("results") or []:
+            parts = [doc.get("title"), doc.get("abstract"), strip_html(doc.get("excerpts") or "")]
+            text = "\n\n".join(p for p in parts if p)
+            if len(text) < MIN_TEXT_LENGTH:
+                continue
+            doc_type = {"Rule": "regulation", "Proposed Rule": "proposed_regulation",
+                        "Notice": "notice"}.get(doc.get("type"), "guidance")
+            number = doc.get("document_number") or _digest(text)
+            yield {
+                "id": f"fr-{number}",
+                "text": text,
+                "version": [job["slug"], job["industry"], doc.get("type"), doc.get("title"), doc.get("abstract"),
+                            doc.get("publication_date"), doc.get("html_url")],
+                "metadata": typed_metadata({
+                    "source": "federal_register",
+                    "title": doc.get("title") or f"{job['name']} Document",
+                    "jurisdiction": "US-Federal",
+                    "industry": job["industry"],
+                    "document_type": doc_type,
+                    "cfr_title": 0,
+                    "date": doc.get("publication_date") or today,
+                    "url": doc.get("html_url") or "https://www.federalregister.gov",
+                    "agency": job["name"],
+                    "document_number": doc.get("document_number") or "",
+                    # Tier 1 for Rule/Proposed Rule, tier 2 for Notice/guidance
+                    "authority_tier": 1 if doc.get("type") in ("Rule", "Proposed Rule") else 2,
+                    "market_standard_from": doc.get("publication_date") or "",
+                    "deprecated_on": "",
+                }),
+            }
+
+
+CONNECTORS = {c.name: c for c in (ECFRConnector, FederalRegisterConnector)}
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+class ChunkSink:
+    """
+    Chunks documents and writes them in BATCH_SIZE batches.  Chunk ids are
+    "{doc id}-chunk-{n}", so re-ingesting a document overwrites its chunks.
+    col=None chunks and counts without embedding (dry run).
+
+    With an HttpCache, documents whose fingerprint matches the last ingest are
+    skipped, and a document's fingerprint and chunk id span are recorded once
+    its last chunk has been written.  Chunk ids of the previous ingest beyond
+    the new ones are then deleted (from the span, or by `doc_id` when none
+    was recorded).
+    """
+
+    def __init__(self, col, args, lexical=None, cache: HttpCache = None, refresh=False):
+        self.col = col
+        self.args = args
+        self.lexical = lexical
+        self.cache = cache
+        self.refresh = refresh
+        self.chunking = {"mode": args.chunking, "unit": args.chunk_unit, "chunk_size": args.chunk_size,
+                         "overlap": args.chunk_overlap, "token_counts": args.token_counts}
+        self.pending = []
+        self.seen = set()
+        self._unwritten = {}  # doc id → [chunks not yet written, fingerprint, chunk id span, stale chunk ids]
+        self.touched = set()  # doc ids fully written, for update_centroids
+        self.documents = self.duplicates = self.skipped = self.chunks = self.deleted = 0
+
+    async def add(self, doc: dict):
+        if doc["id"] in self.seen:
+            self.duplicates += 1
+            return
+        self.seen.add(doc["id"])
+        fingerprint = None
+        if self.cache is not None:
+            fingerprint = document_fingerprint(doc, self.chunking)
+            if not self.refresh and self.cache.unchanged(self.args.collection, doc["id"], fingerprint):
+                self.skipped += 1
+                return
+        self.documents += 1
+        chunks = chunk_text(doc["text"], {**doc["metadata"], "doc_id": doc["id"]}, chunk_size=self.args.chunk_size,
+                            overlap=self.args.chunk_overlap, mode=self.args.chunking, unit=self.args.chunk_unit,
+                            token_counts=self.args.token_counts)
+        ids = [f"{doc['id']}-chunk-{c['metadata']['chunk_index']}" for c in chunks]
+        span = max((c["metadata"]["chunk_index"] + 1 for c in chunks), default=0)
+        stale = await self._stale_chunks(doc["id"], ids) if self.col is not None else []
+        self._unwritten[doc["id"]] = [len(chunks), fingerprint, span, stale]
+        link_chunks(ids, chunks)
+        self.pending.extend((id_, c, doc["id"]) for id_, c in zip(ids, chunks))
+        if not chunks:
+            await self._written([])
+        while len(self.pending) >= BATCH_SIZE:
+            await self.flush(BATCH_SIZE)
+
+    async def _stale_chunks(self, doc_id: str, ids: list) -> list:
+        """Chunk ids of the document's previous ingest that this one won't overwrite."""
+        previous = self.cache.chunk_span(self.args.collection, doc_id) if self.cache is not None else None
+        if previous is not None:
+            old = {f"{doc_id}-chunk-{i}" for i in range(previous)}
+        else:
+            got = await asyncio.to_thread(self.col.get, where={"doc_id": doc_id}, include=[])
+            old = set(got["ids"])
+        return sorted(old - set(ids))
+
+    async def flush(self, n=None):
+        n = len(self.pending) if n is None else n
+        batch, self.pending = self.pending[:n], self.pending[n:]
+        if not batch:
+            return
+        ids = [id_ for id_, _, _ in batch]
+        texts = [c["text"] for _, c, _ in batch]
+        metas = [c["metadata"] for _, c, _ in batch]
+        if self.col is not None:
+            # Blocking client calls run in a worker thread so fetches keep flowing
+            embeddings = await asyncio.to_thread(embed_texts, texts)
+            await asyncio.to_thread(self.col.upsert, ids=ids, embeddings=embeddings, documents=texts,
+                                    metadatas=metas)
+            if self.lexical is not None:
+                self.lexical.upsert(ids, texts, metas)
+        self.chunks += len(batch)
+        await self._written(doc_id for _, _, doc_id in batch)
+
+    async def _written(self, doc_ids):
+        for doc_id in doc_ids:
+            self._unwritten[doc_id][0] -= 1
+        done = {d: entry for d, entry in self._unwritten.items() if entry[0] <= 0}
+        for doc_id in done:
+            del self._unwritten[doc_id]
+        if not done or self.col is None:
+            return
+        # Only once the new chunks are in, so the document is never missing from search
+        stale = [id_ for *_, ids in done.values() for id_ in ids]
+        if stale:
+            await asyncio.to_thread(self.col.delete, ids=stale)
+            if self.lexical is not None:
+                self.lexical.delete(stale)
+            self.deleted += len(stale)
+        self.touched.update(done)
+        if self.cache is not None:
+            self.cache.mark_ingested(self.args.collection, {d: (fp, span) for d, (_, fp, span, _) in done.items()})
+
+
+async def _produce(connector, http, job, queue, stats, slots):
+    async with slots:
+        docs = 0
+        try:
+            async for page, data in connector.pages(http, job):
+                for doc in connector.documents(job, data):
+                    await queue.put(doc)
+                    docs += 1
+                stats["pages"] += 1
+        except Exception as e:
+            stats["errors"] += 1
+            print(f"  [{connector.name}] {connector.describe(job)}: error: {e}")
+        print(f"  [{connector.name}] {connector.describe(job)}: {docs} documents")
+
+
+async def _consume(queue, sink):
+    while True:
+        doc = await queue.get()
+        if doc is None:
+            break
+        await sink.add(doc)
+    await sink.flush()
+
+
+async def ingest(connectors: list, sink: ChunkSink, http: HttpClient, concurrency=8) -> dict:
+    """Run every job of every connector (up to `concurrency` at once) into `sink`."""
+    queue = asyncio.Queue(maxsize=BATCH_SIZE * 4)
+    stats = {"pages": 0, "errors": 0}
+    slots = asyncio.Semaphore(concurrency)
+    consumer = asyncio.create_task(_consume(queue, sink))
+    await asyncio.gather(*(_produce(c, http, job, queue, stats, slots) for c in connectors for job in c.jobs()))
+    await queue.put(None)
+    await consumer
+    return stats
+
+
+async def run(args) -> dict:
+    connectors = []
+    for name in args.sources:
+        if name == "ecfr":
+            connectors.append(ECFRConnector(args.ecfr_url, args.max_pages or 5))
+        else:
+            connectors.append(FederalRegisterConnector(args.fr_url, args.max_pages or 10, since=args.since))
+
+    col = lexical = None
+    if not args.dry_run:
+        col = get_chroma().get_or_create_collection(
+            name=args.collection,
+            metadata={"hnsw:space": "cosine", "metadata_schema": METADATA_SCHEMA_VERSION},
+            embedding_function=get_embedding_function(),
+        )
+        if args.collection == COLLECTION_NAME and DEFAULT_LEXICAL_PATH.exists():
+            lexical = LexicalIndex()
+    cache = None if args.no_cache else HttpCache()
+    if cache is not None and col is not None:
+        forgotten = cache.bind(args.collection, str(col.id))
+        if forgotten:
+            print(f"  '{args.collection}' was recreated; {forgotten} document fingerprints dropped\n")
+    sink = ChunkSink(col, args, lexical, cache, refresh=args.refresh)
+
+    start = time.perf_counter()
+    async with HttpClient(rate=args.rate, limit_per_host=args.connections_per_host, cache=cache) as http:
+        stats = await ingest(connectors, sink, http, args.concurrency)
+    # Chunks carry full metadata, so centroid rows take their fields from the chunks
+    centroids = update_centroids(col, sink.touched, doc_metadata={}) if sink.touched else {"documents": 0}
+    if lexical is not None:
+        lexical.close()
+    if cache is not None:
+        cache.close()
+    return {
+        **stats,
+        "requests": http.requests,
+        "retries": http.retried,
+        "bytes": http.bytes,
+        "not_modified": cache.not_modified if cache else 0,
+        "bytes_saved": cache.bytes_saved if cache else 0,
+        "documents": sink.documents,
+        "skipped": sink.skipped,
+        "duplicates": sink.duplicates,
+        "chunks": sink.chunks,
+        "deleted": sink.deleted,
+        "centroids": centroids["documents"],
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest eCFR / Federal Register documents with async connectors.")
+    parser.add_argument("--sources", type=lambda v: v.split(","), default=list(CONNECTORS),
+                        help=f"comma-separated ({', '.join(CONNECTORS)})")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--ecfr-url", default=ECFR_SEARCH_API)
+    parser.add_argument("--fr-url", default=FR_API_BASE)
+    parser.add_argument("--since", help="Federal Register: earliest publication date (default: two years ago)")
+    parser.add_argument("--max-pages", type=int, help="per query (default: eCFR 5, Federal Register 10)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_LIMIT, help="requests/second per host")
+    parser.add_argument("--concurrency", type=int, default=8, help="queries paginated at once")
+    parser.add_argument("--connections-per-host", type=int, default=CONNECTIONS_PER_HOST)
+    parser.add_argument("--dry-run", action="store_true", help="fetch and chunk, but don't embed or upsert")
+    parser.add_argument("--no-cache", action="store_true", help="no conditional requests or document fingerprints")
+    parser.add_argument("--refresh", action="store_true", help="re-chunk and re-embed documents even if unchanged")
+    add_chunking_args(parser)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.sources) - set(CONNECTORS)
+    if unknown:
+        parser.error(f"unknown source(s) {', '.join(sorted(unknown))}; known: {', '.join(CONNECTORS)}")
+
+    print(f"\n=== Connector ingestion: {', '.join(args.sources)}{' (dry run)' if args.dry_run else ''} ===\n")
+    result = asyncio.run(run(args))
+    print(f"\n=== Done: {result['documents']} documents ingested ({result['skipped']} unchanged skipped, "
+          f"{result['duplicates']} duplicates), {result['chunks']} chunks from {result['pages']} pages "
+          f"({result['deleted']} stale chunks deleted) in {result['seconds']:.1f}s; "
+          f"{result['centroids']} document centroids updated ===")
+    print(f"HTTP: {result['requests']} requests, {result['not_modified']} not modified, "
+          f"{result['bytes'] / 1e6:.2f} MB downloaded, {result['bytes_saved'] / 1e6:.2f} MB saved, "
+          f"{result['retries']} retries, {result['errors']} failed queries\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
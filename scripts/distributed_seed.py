@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Distributed seeding: one coordinator, any number of worker processes.
+
+The coordinator recreates the target collection and splits the corpus into
+work units (a few documents each) in a SQLite queue.  Workers, on this
+machine or on any machine that can open the queue file and reach Chroma,
+lease one unit at a time and run chunk → embed → upsert on it:
+
+  lease       a claimed unit belongs to its worker until lease_expires; a
+              heartbeat thread extends it while the unit is being processed
+  retries     a unit whose worker crashed (lease expired) or raised is handed
+              to the next worker, up to MAX_ATTEMPTS times, then parked as
+              'failed'; chunk ids are deterministic and upserts idempotent, so
+              a partially written unit is simply rewritten
+  finalize    once every unit is done the coordinator checks the collection,
+              rebuilds the lexical sidecar, parent store and document
+              centroids, and writes the run manifest (.rag/seed-manifest.json)
+
+Embedding and upserts are network-bound, so total throughput grows with the
+number of workers until the OpenAI rate limit or Chroma is the bottleneck.
+
+The queue relies on SQLite locking: put it on a local disk, or on a shared
+filesystem whose locking SQLite supports, when workers run on other hosts.
+
+Run:
+  python3 scripts/distributed_seed.py run --workers 4                # plan, local workers, finalize
+  python3 scripts/distributed_seed.py plan --unit-size 2 --chunking markdown
+  python3 scripts/distributed_seed.py worker                         # on each worker host
+  python3 scripts/distributed_seed.py status
+  python3 scripts/distributed_seed.py requeue                        # retry units parked as failed
+  python3 scripts/distributed_seed.py finalize
+"""
+
+import argparse, json, os, socket, sqlite3, subprocess, sys, threading, time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from seed_legal_concepts import (
+    ARTIFACT_DIR, COLLECTION_NAME, EMBEDDING_MODEL, LEGAL_CONCEPTS, add_chunking_args, close_writer, get_chroma,
+    open_writer, record_token_stats, recreate_collection, seed_doc_id, seed_document_metadata,
+    seed_documents,
+)
+
+DEFAULT_QUEUE_PATH = ARTIFACT_DIR / "seed-queue.sqlite"
+DEFAULT_MANIFEST_PATH = ARTIFACT_DIR / "seed-manifest.json"
+DEFAULT_UNIT_SIZE = 4
+LEASE_SECONDS = 60.0
+MAX_ATTEMPTS = 3
+POLL_INTERVAL = 1.0
+PAGE_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    config TEXT NOT NULL,
+    planned_at REAL NOT NULL,
+    finalized_at REAL
+);
+CREATE TABLE IF NOT EXISTS units (
+    unit_id INTEGER PRIMARY KEY,
+    docs TEXT NOT NULL,
+    documents INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    chunks INTEGER,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS units_status ON units (status, lease_expires);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+# ---------------------------------------------------------------------------
+# Work queue
+# ---------------------------------------------------------------------------
+
+class WorkQueue:
+    def __init__(self, path: Path = DEFAULT_QUEUE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Many processes share the file: wait on locks instead of failing, and
+        # let readers proceed while a writer commits
+        self.conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _tx(self, sql: str, params=()):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = self.conn.execute(sql, params)
+            self.conn.execute("COMMIT")
+            return cur
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def plan(self, docs: list, config: dict, unit_size: int = DEFAULT_UNIT_SIZE) -> int:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM units")
+            self.conn.execute("DELETE FROM run")
+            self.conn.execute("INSERT INTO run (id, config, planned_at) VALUES (1, ?, ?)",
+                              (json.dumps(config), time.time()))
+            units = [docs[i : i + unit_size] for i in range(0, len(docs), unit_size)]
+            self.conn.executemany("INSERT INTO units (docs, documents) VALUES (?, ?)",
+                                  [(json.dumps(u), len(u)) for u in units])
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return len(units)
+
+    def config(self) -> dict:
+        row = self.conn.execute("SELECT config FROM run WHERE id = 1").fetchone()
+        if row is None:
+            raise SystemExit(f"No seeding run planned in {self.path}; run `distributed_seed.py plan` first")
+        return json.loads(row[0])
+
+    def claim(self, owner: str, lease: float = LEASE_SECONDS):
+        """Lease the next pending unit, or one whose worker stopped heartbeating."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases that have used up their attempts are parked, not retried
+            self.conn.execute(
+                "UPDATE units SET status = 'failed', error = COALESCE(error, 'lease expired'), owner = NULL"
+                " WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?", (now, MAX_ATTEMPTS))
+            row = self.conn.execute(
+                "SELECT unit_id, docs FROM units WHERE status = 'pending'"
+                " OR (status = 'leased' AND lease_expires < ?) ORDER BY unit_id LIMIT 1", (now,)
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE units SET status = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1,"
+                    " started_at = ? WHERE unit_id = ?", (owner, now + lease, now, row[0]))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def heartbeat(self, unit_id: int, owner: str, lease: float = LEASE_SECONDS) -> bool:
+        """Extend the lease; False means it expired and another worker may own the unit now."""
+        return self._tx(
+            "UPDATE units SET lease_expires = ? WHERE unit_id = ? AND owner = ? AND status = 'leased'",
+            (time.time() + lease, unit_id, owner),
+        ).rowcount == 1
+
+    def complete(self, unit_id: int, owner: str, chunks: int) -> bool:
+        return self._tx(
+            "UPDATE units SET status = 'done', chunks = ?, finished_at = ?, owner = NULL, error = NULL"
+            " WHERE unit_id = ? AND owner = ? AND status = 'leased'", (chunks, time.time(), unit_id, owner)
+        ).rowcount == 1
+
+    def fail(self, unit_id: int, owner: str, error: str):
+        self._tx(
+            "UPDATE units SET error = ?, owner = NULL,"
+            " status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END"
+            " WHERE unit_id = ? AND owner = ? AND status = 'leased'", (error, MAX_ATTEMPTS, unit_id, owner))
+
+    def depth(self) -> dict:
+        counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM units GROUP BY status"))
+        out = {s: counts.get(s, 0) for s in ("pending", "leased", "done", "failed")}
+        out["chunks"] = self.conn.execute("SELECT COALESCE(SUM(chunks), 0) FROM units WHERE status = 'done'").fetchone()[0]
+        return out
+
+    def owners(self) -> dict:
+        """Leased units per worker."""
+        return dict(self.conn.execute("SELECT owner, COUNT(*) FROM units WHERE status = 'leased' GROUP BY owner"))
+
+    def requeue_failed(self) -> int:
+        return self._tx("UPDATE units SET status = 'pending', attempts = 0 WHERE status = 'failed'").rowcount
+
+    def failures(self) -> list:
+        return self.conn.execute("SELECT unit_id, attempts, error FROM units WHERE status = 'failed'").fetchall()
+
+    def elapsed(self) -> float:
+        """Seconds from the first unit leased to the last one done (excludes worker start-up)."""
+        first, last = self.conn.execute("SELECT MIN(started_at), MAX(finished_at) FROM units").fetchone()
+        return (last - first) if first and last else 0.0
+
+    def mark_finalized(self):
+        self._tx("UPDATE run SET finalized_at = ? WHERE id = 1", (time.time(),))
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+class Heartbeat(threading.Thread):
+    """Keeps a unit's lease alive from its own connection while the worker thread is busy."""
+
+    def __init__(self, path: Path, unit_id: int, owner: str, lease: float):
+        super().__init__(daemon=True)
+        self.path, self.unit_id, self.owner, self.lease = path, unit_id, owner, lease
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        queue = WorkQueue(self.path)
+        try:
+            while not self.stopped.wait(self.lease / 3):
+                if not queue.heartbeat(self.unit_id, self.owner, self.lease):
+                    self.lost = True
+                    return
+        finally:
+            queue.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_worker(path: Path, owner: str, lease: float = LEASE_SECONDS) -> dict:
+    queue = WorkQueue(path)
+    config = queue.config()
+    args = argparse.Namespace(**{"token_counts": False, **config["chunking"]}, writers=config.get("writers", 1),
+                              compact_metadata=config.get("compact_metadata", False))
+    col = get_chroma().get_collection(name=config["collection"])
+    done = chunks = 0
+    print(f"[{owner}] working on '{config['collection']}' from {path}")
+    try:
+        while True:
+            claimed = queue.claim(owner, lease)
+            if claimed is None:
+                break
+            unit_id, docs = claimed
+            beat = Heartbeat(path, unit_id, owner, lease)
+            beat.start()
+            try:
+                writer = open_writer(config["collection"], args)
+                n = seed_documents(col, docs, args, None, writer)
+                close_writer(writer)
+            except Exception as e:
+                beat.stop()
+                queue.fail(unit_id, owner, f"{type(e).__name__}: {e}")
+                print(f"[{owner}] unit {unit_id} failed: {e}")
+                continue
+            beat.stop()
+            if beat.lost or not queue.complete(unit_id, owner, n):
+                # Another worker took it over; its (identical, idempotent) writes win
+                print(f"[{owner}] unit {unit_id}: lease lost, leaving it to the new owner")
+                continue
+            done += 1
+            chunks += n
+    finally:
+        queue.close()
+    print(f"[{owner}] no more work: {done} units, {chunks} chunks")
+    return {"units": done, "chunks": chunks}
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+# ---------------------------------------------------------------------------
+# Coordinator
+# ---------------------------------------------------------------------------
+
+def plan(args) -> int:
+    config = {
+        "collection": args.collection,
+        "chunking": {
+            "chunking": args.chunking,
+            "chunk_unit": args.chunk_unit,
+            "chunk_size": args.chunk_size,
+            "chunk_overlap": args.chunk_overlap,
+            "token_counts": args.token_counts,
+        },
+        "writers": args.writers,
+        "compact_metadata": args.compact_metadata,
+        "index_profile": args.index_profile,
+        "unit_size": args.unit_size,
+    }
+    recreate_collection(args.collection, {"metadata_mode": "compact" if args.compact_metadata else "full"},
+                        profile=args.index_profile)
+    queue = WorkQueue(args.queue)
+    units = queue.plan(LEGAL_CONCEPTS, config, args.unit_size)
+    queue.close()
+    print(f"Planned {units} work units ({len(LEGAL_CONCEPTS)} documents, {args.unit_size} per unit) → {args.queue}")
+    return units
+
+
+def print_status(queue: WorkQueue):
+    d = queue.depth()
+    held = ", ".join(f"{o}: {n}" for o, n in sorted(queue.owners().items())) or "none"
+    print(f"  units: {d['done']} done, {d['leased']} leased, {d['pending']} pending, {d['failed']} failed; "
+          f"{d['chunks']} chunks written; leases held: {held}")
+
+
+def rebuild_lexical(col) -> int:
+    from lexical_index import LexicalIndex
+
+    lexical = LexicalIndex()
+    lexical.reset()
+    total = col.count()
+    for offset in range(0, total, PAGE_SIZE):
+        page = col.get(limit=PAGE_SIZE, offset=offset, include=["documents", "metadatas"])
+        lexical.upsert(page["ids"], page["documents"], page["metadatas"])
+    n = lexical.count()
+    lexical.close()
+    return n
+
+
+def store_parents(queue: WorkQueue) -> int:
+    """Full text of every planned document into the parent store (workers may not share a disk)."""
+    from parent_store import ParentStore
+
+    parents = ParentStore()
+    parents.reset()
+    for (docs,) in queue.conn.execute("SELECT docs FROM units ORDER BY unit_id"):
+        for doc in json.loads(docs):
+            parents.put(seed_doc_id(doc), doc["content"].strip(), doc["title"])
+    parents.close()
+    return len(parents)
+
+
+def finalize(path: Path, manifest_path: Path = DEFAULT_MANIFEST_PATH, workers=None) -> dict:
+    queue = WorkQueue(path)
+    config = queue.config()
+    depth = queue.depth()
+    failures = queue.failures()
+    if depth["pending"] or depth["leased"] or failures:
+        for unit_id, attempts, error in failures:
+            print(f"  ! unit {unit_id} failed after {attempts} attempts: {error}")
+        queue.close()
+        raise SystemExit(f"Cannot finalize: {depth['pending'] + depth['leased']} units unfinished, "
+                         f"{len(failures)} failed (`requeue` retries failed units)")
+
+    col = get_chroma().get_collection(name=config["collection"])
+    count = col.count()
+    if count != depth["chunks"]:
+        queue.close()
+        raise SystemExit(f"Cannot finalize: collection has {count} chunks, units reported {depth['chunks']}")
+    sample = col.get(limit=1, include=["embeddings"])
+    dimensions = len(sample["embeddings"][0]) if len(sample["ids"]) else None
+    tokens = record_token_stats(col)
+    lexical = parents = None
+    if config["collection"] == COLLECTION_NAME:
+        lexical = rebuild_lexical(col)
+        parents = store_parents(queue)
+    from doc_centroids import build_centroids
+    docs = [doc for (unit,) in queue.conn.execute("SELECT docs FROM units") for doc in json.loads(unit)]
+    centroids = build_centroids(col, doc_metadata=seed_document_metadata(docs))
+
+    seconds = queue.elapsed()
+    manifest = {
+        "collection": config["collection"],
+        "documents": sum(u for (u,) in queue.conn.execute("SELECT documents FROM units")),
+        "units": depth["done"],
+        "chunks": count,
+        "lexical_chunks": lexical,
+        "parent_documents": parents,
+        "centroid_collection": centroids["collection"],
+        "tokens": {k: v for k, v in tokens.items() if k != "token_encoding"} or None,
+        "workers": workers,
+        "seconds": round(seconds, 2),
+        "chunks_per_second": round(count / seconds, 1) if seconds > 0 else None,
+        "embedding": {"model": EMBEDDING_MODEL, "dimensions": dimensions, "space": "cosine"},
+        "chunking": config["chunking"],
+        "index_profile": config["index_profile"],
+        "finalized_at": _now(),
+    }
+    queue.mark_finalized()
+    queue.close()
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n")
+    print(f"Finalized '{config['collection']}': {count} chunks from {manifest['documents']} documents in "
+          f"{seconds:.1f}s ({manifest['chunks_per_second']} chunks/s) → {manifest_path}")
+    return manifest
+
+
+def run(args) -> dict:
+    plan(args)
+    log_dir = Path(args.queue).parent / "seed-workers"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    procs = []
+    for i in range(args.workers):
+        log = open(log_dir / f"worker-{i}.log", "w")
+        procs.append((subprocess.Popen(
+            [sys.executable, __file__, "--queue", str(args.queue), "worker", "--worker-id", f"local-{i}",
+             "--lease", str(args.lease)],
+            stdout=log, stderr=subprocess.STDOUT,
+        ), log))
+    print(f"Started {args.workers} local worker(s); logs in {log_dir}")
+
+    queue = WorkQueue(args.queue)
+    last = None
+    try:
+        while any(p.poll() is None for p, _ in procs):
+            time.sleep(POLL_INTERVAL)
+            if queue.depth() != last:
+                last = queue.depth()
+                print_status(queue)
+    finally:
+        queue.close()
+        for p, log in procs:
+            p.wait()
+            log.close()
+    return finalize(args.queue, args.manifest, workers=args.workers)
+
+
+def main(argv=None):
+    from seed_legal_concepts import INDEX_PROFILES
+
+    parser = argparse.ArgumentParser(description="Seed the corpus with a coordinator and lease-based workers.")
+    parser.add_argument("--queue", type=Path, default=DEFAULT_QUEUE_PATH, help="shared SQLite work queue")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def planning(p):
+        add_chunking_args(p)
+        p.add_argument("--collection", default=COLLECTION_NAME)
+        p.add_argument("--unit-size", type=int, default=DEFAULT_UNIT_SIZE, help="documents per work unit")
+        p.add_argument("--index-profile", choices=sorted(INDEX_PROFILES))
+        p.add_argument("--writers", type=int, default=1, help="parallel Chroma upserts within each worker")
+        p.add_argument("--compact-metadata", action="store_true",
+                       help="filter fields + doc_id on chunks; document fields in <collection>-docs")
+        return p
+
+    planning(sub.add_parser("plan", help="recreate the collection and enqueue work units"))
+    r = planning(sub.add_parser("run", help="plan, run local workers until the queue drains, finalize"))
+    r.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    r.add_argument("--lease", type=float, default=LEASE_SECONDS)
+    w = sub.add_parser("worker", help="process work units until none are left")
+    w.add_argument("--worker-id", default=None, help="default: <hostname>-<pid>")
+    w.add_argument("--lease", type=float, default=LEASE_SECONDS, help="seconds a unit stays leased between heartbeats")
+    sub.add_parser("status", help="show queue progress")
+    sub.add_parser("requeue", help="give failed units a fresh set of attempts")
+    sub.add_parser("finalize", help="verify every unit is done, rebuild the lexical index, write the manifest")
+    args = parser.parse_args(argv)
+
+    if args.command == "plan":
+        plan(args)
+    elif args.command == "run":
+        print(f"\n=== Distributed seed: {args.workers} worker(s) ===\n")
+        run(args)
+    elif args.command == "worker":
+        run_worker(args.queue, args.worker_id or default_worker_id(), args.lease)
+    elif args.command == "status":
+        queue = WorkQueue(args.queue)
+        print_status(queue)
+        queue.close()
+    elif args.command == "requeue":
+        queue = WorkQueue(args.queue)
+        print(f"Requeued {queue.requeue_failed()} failed unit(s)")
+        queue.close()
+    else:
+        finalize(args.queue, args.manifest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Document-level centroid collection for two-stage retrieval.
+
+Every chunk carries a `doc_id`.  This module averages each document's chunk
+vectors (L2-normalized mean: no extra embedding calls) and writes one row
+per document to a small companion collection, "<collection>-docs", carrying
+the document's metadata (chunk-level fields such as chunk_index and
+token_count are dropped) plus its chunk count.  In compact metadata mode
+this is the only copy of the document fields; chunks join them by doc_id.
+
+Two-stage search then queries the companion collection for the top documents
+and searches only their chunks ({doc_id: {$in: [...]}}).  The first stage
+scans one vector per document instead of ~3, and the second stage a fixed
+handful of documents, so query cost stays nearly flat as the corpus grows.
+Document-level filters (industry, authority_tier, published_on, ...) apply
+at both stages because chunks inherit them from their document.  A
+document row's valid_from/valid_to span all of its chunk versions, so a
+validity filter at stage 1 keeps every document with a chunk in force.
+
+The seeder rebuilds the companion collection after every full seed.
+Incremental writers (seed_watch.py, connectors.py, ingest_daemon.py and the
+TS ingesters via lib/rag/doc-centroids.ts) update the rows of just the
+documents they touched.  The companion's `centroid_chunks` metadata counts
+the chunks its rows cover; lib/ai/tools/legal-search.ts only scopes chunk
+search to stage-1 documents while that covers the whole collection, and
+otherwise searches chunks directly, so chunks written without a centroid
+are never hidden.
+
+Run:
+  python3 scripts/doc_centroids.py build
+  python3 scripts/doc_centroids.py query "When is a non-compete enforceable?" --docs 4 -k 8
+"""
+
+import argparse, sys, time
+
+import numpy as np
+
+from metadata_schema import DATE_MAX, DATE_MIN
+from seed_legal_concepts import (
+    BATCH_SIZE, CHUNK_FIELDS, COLLECTION_NAME, embed_texts, get_chroma, recreate_collection, set_collection_metadata,
+)
+
+CENTROID_SUFFIX = "-docs"
+PAGE_SIZE = 1000
+DEFAULT_STAGE1_DOCS = 5
+# Companion collection metadata: chunks covered by its rows (sum of their `chunks`)
+COVERAGE_KEY = "centroid_chunks"
+
+
+def centroid_collection_name(name: str = COLLECTION_NAME) -> str:
+    return f"{name}{CENTROID_SUFFIX}"
+
+
+def chunk_doc_id(chunk_id: str, meta: dict) -> str:
+    """The chunk's doc_id, or the "<doc_id>-chunk-<n>" id prefix for chunks written before doc_id existed."""
+    return (meta or {}).get("doc_id") or chunk_id.rsplit("-chunk-", 1)[0]
+
+
+def document_fields(meta: dict) -> dict:
+    return {k: v for k, v in (meta or {}).items() if k not in CHUNK_FIELDS}
+
+
+def existing_doc_metadata(name: str, page_size: int = PAGE_SIZE) -> dict:
+    try:
+        col = get_chroma().get_collection(name=name)
+    except Exception:
+        return {}
+    out = {}
+    for offset in range(0, col.count(), page_size):
+        page = col.get(limit=page_size, offset=offset, include=["metadatas"])
+        out.update((id_, {k: v for k, v in (m or {}).items() if k != "chunks"})
+                   for id_, m in zip(page["ids"], page["metadatas"]))
+    return out
+
+
+class _Centroids:
+    """Running per-document vector sums, chunk counts, metadata and validity span."""
+
+    def __init__(self, doc_metadata: dict):
+        self.doc_metadata = doc_metadata
+        self.sums, self.counts, self.metas, self.valid = {}, {}, {}, {}
+
+    def add(self, page: dict):
+        for id_, emb, meta in zip(page["ids"], page["embeddings"], page["metadatas"]):
+            doc_id = chunk_doc_id(id_, meta)
+            vec = np.asarray(emb, dtype=np.float64)
+            span = ((meta or {}).get("valid_from", DATE_MIN), (meta or {}).get("valid_to", DATE_MAX))
+            if doc_id in self.sums:
+                self.sums[doc_id] += vec
+                self.counts[doc_id] += 1
+                valid = self.valid[doc_id]
+                self.valid[doc_id] = (min(valid[0], span[0]), max(valid[1], span[1]))
+            else:
+                self.sums[doc_id], self.counts[doc_id], self.valid[doc_id] = vec.copy(), 1, span
+                self.metas[doc_id] = {**document_fields(meta), **self.doc_metadata.get(doc_id, {}), "doc_id": doc_id}
+
+    def write(self, target):
+        ids = list(self.sums)
+        for i in range(0, len(ids), BATCH_SIZE):
+            batch = ids[i : i + BATCH_SIZE]
+            vectors = np.stack([self.sums[d] for d in batch])
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            target.upsert(ids=batch, embeddings=vectors.astype(np.float32),
+                          metadatas=[{**self.metas[d], "chunks": self.counts[d], "valid_from": self.valid[d][0],
+                                      "valid_to": self.valid[d][1]} for d in batch])
+
+
+def build_centroids(col, name: str = None, page_size: int = PAGE_SIZE, doc_metadata: dict = None) -> dict:
+    """
+    Recreate the companion collection of `col` from its stored chunk vectors.
+    `doc_metadata` (doc_id → metadata) supplies the document fields that
+    compact-mode chunks don't carry; by default they are kept from the
+    companion collection being replaced.
+    """
+    name = name or centroid_collection_name(col.name)
+    if doc_metadata is None:
+        doc_metadata = existing_doc_metadata(name, page_size)
+    start = time.perf_counter()
+    centroids = _Centroids(doc_metadata)
+    for offset in range(0, col.count(), page_size):
+        centroids.add(col.get(limit=page_size, offset=offset, include=["embeddings", "metadatas"]))
+
+    covered = sum(centroids.counts.values())
+    centroids.write(recreate_collection(name, {"centroids_of": col.name, "centroid_method": "mean",
+                                               COVERAGE_KEY: covered}))
+    return {"collection": name, "documents": len(centroids.sums), "chunks": sum(centroids.counts.values()),
+            "seconds": time.perf_counter() - start}
+
+
+def update_centroids(col, doc_ids, name: str = None, doc_metadata: dict = None) -> dict:
+    """
+    Recompute the centroid rows of just `doc_ids` from their chunks (by
+    `doc_id`); documents with no chunks left lose their row.  `doc_metadata`
+    as for build_centroids, defaulting to the rows being replaced.  A no-op
+    when the companion collection doesn't exist.
+    """
+    name = name or centroid_collection_name(col.name)
+    doc_ids = sorted(set(doc_ids))
+    start = time.perf_counter()
+    try:
+        target = get_chroma().get_collection(name=name)
+    except Exception:
+        return {"collection": name, "documents": 0, "removed": 0, "seconds": 0.0}
+    old_rows, old_chunks = {}, 0
+    for i in range(0, len(doc_ids), BATCH_SIZE):
+        page = target.get(ids=doc_ids[i : i + BATCH_SIZE], include=["metadatas"])
+        for id_, m in zip(page["ids"], page["metadatas"]):
+            old_chunks += int((m or {}).get("chunks", 0))
+            old_rows[id_] = {k: v for k, v in (m or {}).items() if k != "chunks"}
+    centroids = _Centroids(old_rows if doc_metadata is None else doc_metadata)
+    for i in range(0, len(doc_ids), BATCH_SIZE):
+        centroids.add(col.get(where={"doc_id": {"$in": doc_ids[i : i + BATCH_SIZE]}},
+                              include=["embeddings", "metadatas"]))
+    gone = [d for d in doc_ids if d not in centroids.sums]
+    if gone:
+        target.delete(ids=gone)
+    centroids.write(target)
+    covered = (target.metadata or {}).get(COVERAGE_KEY)
+    if covered is None:
+        covered = sum(int((m or {}).get("chunks", 0)) for offset in range(0, target.count(), PAGE_SIZE)
+                      for m in target.get(limit=PAGE_SIZE, offset=offset, include=["metadatas"])["metadatas"])
+    else:
+        covered += sum(centroids.counts.values()) - old_chunks
+    set_collection_metadata(target, **{COVERAGE_KEY: covered})
+    return {"collection": name, "documents": len(centroids.sums), "removed": len(gone),
+            "seconds": time.perf_counter() - start}
+
+
+def two_stage_query(col, centroids, query_embedding, n_docs=DEFAULT_STAGE1_DOCS, n_results=8, where=None) -> dict:
+    """Pick the `n_docs` nearest documents, then the `n_results` nearest chunks among them."""
+    docs = centroids.query(query_embeddings=[query_embedding], n_results=n_docs, where=where, include=[])
+    doc_ids = docs["ids"][0]
+    if not doc_ids:
+        return {"doc_ids": [], "ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+    scope = {"doc_id": {"$in": doc_ids}}
+    result = col.query(
+        query_embeddings=[query_embedding],
+        n_results=n_results,
+        where={"$and": [where, scope]} if where else scope,
+        include=["documents", "metadatas", "distances"],
+    )
+    return {"doc_ids": doc_ids, **result}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the document-level centroid collection.")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="recreate <collection>-docs from the chunk vectors")
+    q = sub.add_parser("query", help="two-stage search, compared with a flat search")
+    q.add_argument("query")
+    q.add_argument("--docs", type=int, default=DEFAULT_STAGE1_DOCS, help="documents kept by the first stage")
+    q.add_argument("-k", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    chroma = get_chroma()
+    col = chroma.get_collection(name=args.collection)
+    if args.command == "build":
+        r = build_centroids(col)
+        print(f"Centroids: {r['documents']} documents from {r['chunks']} chunks → '{r['collection']}' "
+              f"in {r['seconds']:.1f}s")
+        return
+
+    centroids = chroma.get_collection(name=centroid_collection_name(args.collection))
+    vec = embed_texts([args.query])[0]
+    t = time.perf_counter()
+    staged = two_stage_query(col, centroids, vec, args.docs, args.k)
+    staged_ms = (time.perf_counter() - t) * 1000
+    t = time.perf_counter()
+    flat = col.query(query_embeddings=[vec], n_results=args.k, include=[])
+    flat_ms = (time.perf_counter() - t) * 1000
+    overlap = len(set(staged["ids"][0]) & set(flat["ids"][0]))
+    print(f"Stage 1 documents: {', '.join(staged['doc_ids'])}")
+    for id_, dist in zip(staged["ids"][0], staged["distances"][0]):
+        print(f"  {1 - dist:.3f}  {id_}")
+    print(f"Two-stage {staged_ms:.1f} ms vs flat {flat_ms:.1f} ms; {overlap}/{len(flat['ids'][0])} of the flat "
+          f"top-{args.k} retained")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Content-addressed on-disk embedding cache (SQLite).
+
+Vectors are keyed by (model, sha256(text)) and stored as raw float32 blobs, so
+a chunk or query string is embedded at most once per model across runs and
+across chunking configurations.
+"""
+
+import hashlib, sqlite3
+from pathlib import Path
+
+import numpy as np
+
+from seed_legal_concepts import ARTIFACT_DIR, EMBEDDING_MODEL, embed_texts
+
+DEFAULT_CACHE_PATH = ARTIFACT_DIR / "embedding-cache.sqlite"
+# SQLite's default limit on bound parameters is 999
+_LOOKUP_BATCH = 500
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def truncate_dimensions(vectors: np.ndarray, dimensions=None) -> np.ndarray:
+    """
+    Shorten text-embedding-3 vectors to `dimensions` and re-normalize.  This is
+    equivalent to requesting `dimensions=` from the API, so one full-size
+    embedding serves every smaller configuration.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if not dimensions or dimensions >= vectors.shape[1]:
+        return vectors
+    short = np.ascontiguousarray(vectors[:, :dimensions])
+    norms = np.linalg.norm(short, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return short / norms
+
+
+class EmbeddingCache:
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, key TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, key))"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.conn.close()
+
+    def get_many(self, keys, model=EMBEDDING_MODEL) -> dict:
+        found = {}
+        keys = list(keys)
+        for i in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[i : i + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                [model, *batch],
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, items: dict, model=EMBEDDING_MODEL):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, dim, vector) VALUES (?, ?, ?, ?)",
+                [
+                    (model, key, len(vec), np.asarray(vec, dtype=np.float32).tobytes())
+                    for key, vec in items.items()
+                ],
+            )
+
+    def embed(self, texts: list, model=EMBEDDING_MODEL) -> np.ndarray:
+        """
+        Return an (n, dim) float32 matrix, embedding only texts not already cached.
+        Vectors are cached full-size; shorten them with truncate_dimensions.
+        """
+        keys = [text_key(t) for t in texts]
+        found = self.get_many(set(keys), model=model)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        self.hits += len(keys) - sum(1 for k in keys if k in missing)
+        self.misses += len(missing)
+        if missing:
+            fresh = dict(zip(missing.keys(), embed_texts(list(missing.values()), model=model, dimensions=None)))
+            self.put_many(fresh, model=model)
+            found.update({k: np.asarray(v, dtype=np.float32) for k, v in fresh.items()})
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[k] for k in keys])
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Local embedding gateway: an OpenAI-compatible /v1/embeddings endpoint in front
+of the seeder's embed_texts.
+
+  LRU cache      repeated strings (the same expanded legal query asked again)
+                 are answered from memory
+  single-flight  identical strings requested concurrently share one pending
+                 upstream embedding
+  batching       strings missing from the cache, across all concurrent requests,
+                 are collected for up to `--window` ms and sent upstream as one
+                 call per model (at most MAX_UPSTREAM_BATCH inputs).  A batch
+                 rejected with a 4xx is split and retried, so only the inputs
+                 the API refuses fail, with the upstream status
+
+Point the TypeScript runtime at it with EMBEDDING_GATEWAY_URL
+(lib/rag/embeddings.ts); any OpenAI client works, since float and base64
+encoding_format are both supported.  `dimensions` is honoured by truncating
+and renormalising, which is equivalent for text-embedding-3 models; other
+models (text-embedding-ada-002) can't be shortened and are refused.
+
+Run:
+  python3 scripts/embedding_gateway.py                      # http://127.0.0.1:8787/v1
+  EMBEDDING_GATEWAY_URL=http://127.0.0.1:8787/v1 pnpm dev
+  curl localhost:8787/metrics
+"""
+
+import argparse, asyncio, base64, sys, time
+from collections import OrderedDict
+
+import numpy as np
+from aiohttp import web
+
+from embedding_cache import truncate_dimensions
+from seed_legal_concepts import EMBEDDING_MODEL, count_tokens, embed_texts
+
+DEFAULT_PORT = 8787
+DEFAULT_CACHE_SIZE = 50_000  # vectors; ~6 KB each at 1536 dims
+BATCH_WINDOW_MS = 5
+MAX_UPSTREAM_BATCH = 2048
+SHORTENABLE_MODELS = ("text-embedding-3-",)
+
+
+def client_error(e: Exception) -> bool:
+    """An upstream 4xx that is about the input itself (not a rate limit), so retrying it as-is can't succeed."""
+    status = getattr(e, "status_code", None)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+class LRUCache:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+
+class EmbeddingGateway:
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, window_ms=BATCH_WINDOW_MS, max_batch=MAX_UPSTREAM_BATCH):
+        self.cache = LRUCache(cache_size)
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._inflight = {}  # (model, text) → Future shared by every waiter
+        self._queued = {}  # model → [(text, future)] awaiting the next upstream call
+        self._timers = {}
+        self.requests = self.inputs = self.hits = self.coalesced = self.misses = 0
+        self.upstream_calls = self.upstream_inputs = 0
+        self.upstream_seconds = 0.0
+
+    async def embed(self, texts: list, model=EMBEDDING_MODEL) -> list:
+        """One float32 vector per text, from cache, a pending call, or the next upstream batch."""
+        self.requests += 1
+        self.inputs += len(texts)
+        loop = asyncio.get_running_loop()
+        waits = []
+        for text in texts:
+            key = (model, text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                fut = loop.create_future()
+                fut.set_result(cached)
+            elif key in self._inflight:
+                self.coalesced += 1
+                fut = self._inflight[key]
+            else:
+                self.misses += 1
+                fut = self._inflight[key] = loop.create_future()
+                self._enqueue(model, text, fut)
+            # Shielded so one caller disconnecting doesn't cancel a future others share
+            waits.append(asyncio.shield(fut))
+        return await asyncio.gather(*waits)
+
+    def _enqueue(self, model, text, fut):
+        queued = self._queued.setdefault(model, [])
+        queued.append((text, fut))
+        if len(queued) >= self.max_batch:
+            self._dispatch(model)
+        elif model not in self._timers:
+            self._timers[model] = asyncio.get_running_loop().call_later(self.window, self._dispatch, model)
+
+    def _dispatch(self, model):
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._queued.pop(model, [])
+        if batch:
+            asyncio.ensure_future(self._upstream(model, batch))
+
+    async def _upstream(self, model, batch):
+        texts = [text for text, _ in batch]
+        start = time.perf_counter()
+        try:
+            # Full-size vectors (not the EMBEDDING_DIMENSIONS default): the cache serves every `dimensions`
+            vectors = await asyncio.to_thread(embed_texts, texts, model=model, dimensions=None)
+        except Exception as e:
+            if client_error(e) and len(batch) > 1:
+                # Isolate the inputs the API refuses instead of failing the whole batch
+                mid = len(batch) // 2
+                await asyncio.gather(self._upstream(model, batch[:mid]), self._upstream(model, batch[mid:]))
+                return
+            for text, fut in batch:
+                self._inflight.pop((model, text), None)
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self.upstream_seconds += time.perf_counter() - start
+        self.upstream_calls += 1
+        self.upstream_inputs += len(texts)
+        for (text, fut), vec in zip(batch, vectors):
+            vec = np.asarray(vec, dtype=np.float32)
+            self.cache.put((model, text), vec)
+            self._inflight.pop((model, text), None)
+            if not fut.done():
+                fut.set_result(vec)
+
+    def metrics(self) -> dict:
+        return {
+            "requests": self.requests,
+            "inputs": self.inputs,
+            "cache_hits": self.hits,
+            "coalesced": self.coalesced,
+            "upstream_inputs": self.upstream_inputs,
+            "upstream_calls": self.upstream_calls,
+            "hit_rate": (self.hits + self.coalesced) / self.inputs if self.inputs else 0.0,
+            "mean_upstream_batch": self.upstream_inputs / self.upstream_calls if self.upstream_calls else 0.0,
+            "upstream_ms_mean": self.upstream_seconds * 1000 / self.upstream_calls if self.upstream_calls else 0.0,
+            "cached_vectors": len(self.cache),
+        }
+
+
+# ---------------------------------------------------------------------------
+# HTTP API
+# ---------------------------------------------------------------------------
+
+def _error(message: str, status=400):
+    return web.json_response({"error": {"message": message, "type": "invalid_request_error"}}, status=status)
+
+
+def make_app(gateway: EmbeddingGateway) -> web.Application:
+    async def embeddings(request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return _error("request body must be JSON")
+        inputs = body.get("input")
+        texts = [inputs] if isinstance(inputs, str) else inputs
+        if not isinstance(texts, list) or not texts or not all(isinstance(t, str) for t in texts):
+            # Token-id inputs aren't supported; callers here always send strings
+            return _error("input must be a non-empty string or list of strings")
+        model = body.get("model") or EMBEDDING_MODEL
+        fmt = body.get("encoding_format") or "float"
+        if fmt not in ("float", "base64"):
+            return _error(f"unsupported encoding_format {fmt!r}")
+        if body.get("dimensions") and not model.startswith(SHORTENABLE_MODELS):
+            return _error(f"model {model!r} does not support dimensions")
+
+        try:
+            vectors = await gateway.embed(texts, model)
+        except Exception as e:
+            return _error(f"upstream error: {e}", status=e.status_code if client_error(e) else 502)
+        if body.get("dimensions"):
+            vectors = truncate_dimensions(np.stack(vectors), int(body["dimensions"]))
+
+        data = []
+        for i, vec in enumerate(vectors):
+            vec = np.asarray(vec, dtype="<f4")
+            embedding = base64.b64encode(vec.tobytes()).decode() if fmt == "base64" else vec.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+        tokens = await asyncio.to_thread(lambda: sum(count_tokens(t, model) for t in texts))
+        return web.json_response({
+            "object": "list",
+            "data": data,
+            "model": model,
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    async def metrics(request):
+        return web.json_response(gateway.metrics())
+
+    app = web.Application(client_max_size=16 * 1024 * 1024)
+    app.router.add_post("/v1/embeddings", embeddings)
+    app.router.add_post("/embeddings", embeddings)
+    app.router.add_get("/metrics", metrics)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local OpenAI-compatible embedding gateway.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="vectors kept in the LRU")
+    parser.add_argument("--window", type=float, default=BATCH_WINDOW_MS, help="ms to collect misses into one call")
+    args = parser.parse_args(argv)
+
+    gateway = EmbeddingGateway(args.cache_size, args.window)
+    print(f"\n=== Embedding gateway on http://{args.host}:{args.port}/v1 "
+          f"(LRU {args.cache_size}, window {args.window} ms) ===\n")
+    web.run_app(make_app(gateway), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Local fake of the eCFR search and Federal Register documents APIs.
+
+Serves the JSON shapes connectors.py reads (eCFR `meta.total_count` +
+`results`, Federal Register `count` / `next_page_url` + `results`) with
+deterministic documents, real pagination and ETag / If-None-Match handling.
+Failures can be injected per page: the first `--fail-429` requests of every
+page get a 429 and the next `--fail-5xx` a 503 (both with Retry-After: 0),
+and any query containing `--broken` always gets a 500.  Connectors then run
+end to end, retries included, with no network access.
+
+Run:
+  python3 scripts/fake_regulatory_api.py --port 8081 --fail-429 1 --fail-5xx 1
+  python3 scripts/connectors.py --dry-run --no-cache --rate 0 \\
+      --ecfr-url http://127.0.0.1:8081/api/search/v1/results --fr-url http://127.0.0.1:8081/api/v1/documents.json
+"""
+
+import argparse, hashlib, json, math, sys, zlib
+from collections import Counter
+
+from aiohttp import web
+
+ECFR_PATH = "/api/search/v1/results"
+FR_PATH = "/api/v1/documents.json"
+FR_TYPES = ("Rule", "Proposed Rule", "Notice")
+_FILLER = ("The regulated entity shall maintain written policies and procedures, keep records for six years, "
+           "and make them available to the agency on request. ")
+
+
+class FakeRegulatoryApi:
+    def __init__(self, ecfr_total=45, fr_total=250, fail_429=0, fail_5xx=0, broken=None):
+        self.ecfr_total = ecfr_total
+        self.fr_total = fr_total
+        self.fail_429 = fail_429
+        self.fail_5xx = fail_5xx
+        self.broken = broken
+        self.hits = Counter()      # (path, query string) → requests seen
+        self.statuses = Counter()  # status → responses sent
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(ECFR_PATH, self.ecfr)
+        app.router.add_get(FR_PATH, self.federal_register)
+        return app
+
+    def _respond(self, request, status=200, payload=None) -> web.Response:
+        if payload is None:
+            self.statuses[status] += 1
+            return web.Response(status=status, headers={"Retry-After": "0"})
+        body = json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.statuses[304] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        self.statuses[status] += 1
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+    def _fault(self, request):
+        """The injected failure for this request, if any (counted per path + query string)."""
+        key = (request.path, request.query_string)
+        seen = self.hits[key]
+        self.hits[key] += 1
+        if self.broken and self.broken in request.query_string:
+            return self._respond(request, 500)
+        if seen < self.fail_429:
+            return self._respond(request, 429)
+        if seen < self.fail_429 + self.fail_5xx:
+            return self._respond(request, 503)
+        return None
+
+    @staticmethod
+    def _window(request, total, default_per_page):
+        page = int(request.query.get("page", 1))
+        per_page = int(request.query.get("per_page", default_per_page))
+        return page, per_page, range((page - 1) * per_page, min(page * per_page, total))
+
+    async def ecfr(self, request):
+        fault = self._fault(request)
+        if fault is not None:
+            return fault
+        query = request.query.get("query", "")
+        tag = zlib.crc32(query.encode()) % 1000
+        page, _, window = self._window(request, self.ecfr_total, 20)
+        results = [{
+            "starts_on": "2020-01-01",
+            "ends_on": None,
+            "full_text_excerpt": f"<p>§ {tag}.{i + 1} Result {i + 1} for {query}.</p> {_FILLER}",
+            "headings": {"title": "Fake Title", "part": f"Part {tag}", "section": f"§ {tag}.{i + 1}"},
+            "hierarchy": {"part": str(tag), "section": f"{tag}.{i + 1}"},
+        } for i in window]
+        return self._respond(request, payload={"meta": {"total_count": self.ecfr_total, "current_page": page},
+                                               "results": results})
+
+    async def federal_register(self, request):
+        fault = self._fault(request)
+        if fault is not None:
+            return fault
+        agency = request.query.get("conditions[agencies][]", "agency")
+        page, per_page, window = self._window(request, self.fr_total, 20)
+        pages = math.ceil(self.fr_total / per_page)
+        results = [{
+            "document_number": f"{agency}-{i + 1:05d}",
+            "title": f"{agency} document {i + 1}",
+            "type": FR_TYPES[i % len(FR_TYPES)],
+            "abstract": _FILLER,
+            "html_url": f"https://www.federalregister.gov/d/{agency}-{i + 1:05d}",
+            "publication_date": "2025-01-15",
+            "agencies": [{"slug": agency}],
+            "excerpts": None,
+        } for i in window]
+        next_url = str(request.url.update_query(page=str(page + 1))) if page < pages else None
+        return self._respond(request, payload={"count": self.fr_total, "total_pages": pages,
+                                               "next_page_url": next_url, "results": results})
+
+
+async def serve(api: FakeRegulatoryApi, host="127.0.0.1", port=0):
+    """Start `api` in the running event loop → (runner, base URL); call runner.cleanup() to stop."""
+    runner = web.AppRunner(api.app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake eCFR / Federal Register API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--ecfr-total", type=int, default=45, help="results per eCFR query")
+    parser.add_argument("--fr-total", type=int, default=250, help="documents per Federal Register agency")
+    parser.add_argument("--fail-429", type=int, default=0, help="429s before each page succeeds")
+    parser.add_argument("--fail-5xx", type=int, default=0, help="503s before each page succeeds (after the 429s)")
+    parser.add_argument("--broken", help="queries containing this string always get a 500")
+    args = parser.parse_args(argv)
+
+    api = FakeRegulatoryApi(args.ecfr_total, args.fr_total, args.fail_429, args.fail_5xx, args.broken)
+    print(f"Fake regulatory API on http://{args.host}:{args.port} ({ECFR_PATH}, {FR_PATH})")
+    web.run_app(api.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
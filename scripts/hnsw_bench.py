@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HNSW index profiles (seed_legal_concepts.INDEX_PROFILES).
+
+For each profile the seeded vectors are loaded into a fresh on-disk Chroma
+collection built with that profile, then measured for build time, on-disk size,
+single-query latency (p50/p99) and recall@k against exact brute-force search
+(LocalIndex).  Queries are corpus vectors with a little noise added, so the
+numbers reflect the seeded data rather than a toy distribution.
+
+Vectors come from the local snapshot (`local_search.py snapshot`), or
+`--synthetic N` generates a clustered corpus to see how profiles scale.
+
+Run:
+  python3 scripts/local_search.py snapshot
+  python3 scripts/hnsw_bench.py
+  python3 scripts/hnsw_bench.py --profiles balanced,high-recall --queries 500 --k 8
+  python3 scripts/hnsw_bench.py --synthetic 50000 --dim 256 --json .rag/hnsw-bench.json
+"""
+
+import argparse, json, shutil, sys, tempfile, time
+from pathlib import Path
+
+import chromadb
+import numpy as np
+
+from local_search import DEFAULT_INDEX_DIR, LocalIndex
+from seed_legal_concepts import INDEX_PROFILES
+
+BENCH_BATCH_SIZE = 1000
+
+
+def synthetic_vectors(n: int, dim: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Gaussian clusters on the unit sphere — closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, size=n)] + rng.normal(0, 0.6, size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def bench_profile(profile: str, ids, vectors, queries, exact_ids, k: int, workdir: Path) -> dict:
+    path = workdir / profile
+    client = chromadb.PersistentClient(path=str(path))
+    col = client.create_collection(
+        name="hnsw-bench",
+        metadata={"hnsw:space": "cosine", **INDEX_PROFILES[profile]},
+        embedding_function=None,
+    )
+
+    start = time.perf_counter()
+    for i in range(0, len(ids), BENCH_BATCH_SIZE):
+        col.add(ids=ids[i : i + BENCH_BATCH_SIZE], embeddings=vectors[i : i + BENCH_BATCH_SIZE])
+    build_seconds = time.perf_counter() - start
+
+    latencies, recalls = [], []
+    for qv, truth in zip(queries, exact_ids):
+        start = time.perf_counter()
+        res = col.query(query_embeddings=[qv], n_results=k, include=[])
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len(truth.intersection(res["ids"][0])) / len(truth))
+
+    # Let Chroma flush before sizing the directory
+    del col
+    client.clear_system_cache()
+    return {
+        "profile": profile,
+        **{key.split(":", 1)[1]: value for key, value in INDEX_PROFILES[profile].items()},
+        "vectors": len(ids),
+        "build_seconds": build_seconds,
+        "disk_mb": dir_size(path) / 1e6,
+        f"recall@{k}": float(np.mean(recalls)),
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p99": float(np.percentile(latencies, 99)),
+    }
+
+
+def print_table(rows: list):
+    cols = list(rows[0])
+    print("  ".join(f"{c:>16}" for c in cols))
+    for row in rows:
+        print("  ".join(f"{row[c]:>16.4f}" if isinstance(row[c], float) else f"{row[c]:>16}" for c in cols))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HNSW index profiles against exact search.")
+    parser.add_argument("--index-dir", type=Path, default=DEFAULT_INDEX_DIR, help="local_search.py snapshot dir")
+    parser.add_argument("--synthetic", type=int, help="use N synthetic vectors instead of the snapshot")
+    parser.add_argument("--dim", type=int, default=1536, help="with --synthetic: vector dimensions")
+    parser.add_argument("--profiles", type=lambda v: v.split(","), default=sorted(INDEX_PROFILES))
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.profiles) - set(INDEX_PROFILES)
+    if unknown:
+        parser.error(f"unknown profile(s) {', '.join(sorted(unknown))}; known: {', '.join(sorted(INDEX_PROFILES))}")
+
+    if args.synthetic:
+        vectors = synthetic_vectors(args.synthetic, args.dim, seed=args.seed)
+        ids = [f"v{i}" for i in range(len(vectors))]
+        exact = LocalIndex(ids, vectors, [""] * len(ids), [{}] * len(ids), normalized=True)
+        source = f"{args.synthetic} synthetic vectors"
+    else:
+        exact = LocalIndex.load(args.index_dir, mmap=False)
+        ids, vectors = exact.ids, np.asarray(exact.vectors, dtype=np.float32)
+        source = f"snapshot {args.index_dir}"
+    if not len(ids):
+        raise SystemExit("No vectors to benchmark — seed and snapshot first, or pass --synthetic N")
+
+    rng = np.random.default_rng(args.seed)
+    queries = vectors[rng.integers(0, len(vectors), size=args.queries)]
+    queries = queries + rng.normal(0, 0.01, size=queries.shape).astype(np.float32)
+    k = min(args.k, len(ids))
+    exact_ids = [{h["id"] for h in hits}
+                 for hits in exact.search(queries, k=k, tiers=None, include_deprecated=True)]
+
+    print(f"\n=== HNSW profile benchmark: {source}, dim {vectors.shape[1]}, "
+          f"{args.queries} queries, k={k} ===\n")
+    workdir = Path(tempfile.mkdtemp(prefix="hnsw-bench-"))
+    rows = []
+    try:
+        for profile in args.profiles:
+            print(f"  building '{profile}' ...")
+            rows.append(bench_profile(profile, ids, vectors, queries.tolist(), exact_ids, k, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    print_table(rows)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(rows, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
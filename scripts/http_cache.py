@@ -0,0 +1,160 @@
+"""
+On-disk HTTP response cache and document fingerprints for source ingestion (SQLite).
+
+responses   one row per request URL (with its query string), holding the last
+            200 body and its ETag / Last-Modified validators.  Re-fetches send
+            If-None-Match / If-Modified-Since, and a 304 is answered from the
+            stored body.
+documents   sha256 of each ingested document's source-stable fields (its
+            `version`, see document_fingerprint) and chunking config, plus its
+            chunk id span, per collection.  Documents whose fingerprint hasn't
+            changed are skipped before chunking, so they are never re-embedded;
+            a changed one that re-chunks shorter has its tail chunks deleted.
+collections the Chroma id of the collection the fingerprints were written
+            to.  A recreated collection has a new id; its fingerprints are
+            dropped (bind) so the documents are ingested again rather than
+            skipped as unchanged while their chunks are gone.
+"""
+
+import hashlib, json, sqlite3, time, zlib
+from pathlib import Path
+from urllib.parse import urlencode
+
+from seed_legal_concepts import ARTIFACT_DIR
+
+DEFAULT_HTTP_CACHE_PATH = ARTIFACT_DIR / "http-cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    chunks INTEGER,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (collection, doc_id)
+);
+CREATE TABLE IF NOT EXISTS collections (
+    collection TEXT PRIMARY KEY,
+    collection_id TEXT NOT NULL
+);
+"""
+
+
+def request_key(url: str, params=None) -> str:
+    if not params:
+        return url
+    items = params.items() if isinstance(params, dict) else params
+    return f"{url}?{urlencode(sorted(items))}"
+
+
+def document_fingerprint(doc: dict, chunking: dict = None) -> str:
+    """
+    Hash of `doc["version"]` (the fields that identify this revision at the
+    source) or, without one, of its text and metadata, plus the chunking config.
+    """
+    content = doc["version"] if "version" in doc else [doc["text"], doc["metadata"]]
+    payload = json.dumps([content, chunking or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    def __init__(self, path: Path = DEFAULT_HTTP_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(_SCHEMA)
+        if "chunks" not in {row[1] for row in self.conn.execute("PRAGMA table_info(documents)")}:
+            with self.conn:
+                self.conn.execute("ALTER TABLE documents ADD COLUMN chunks INTEGER")
+        self.not_modified = 0
+        self.bytes_saved = 0
+
+    def close(self):
+        self.conn.close()
+
+    # -- responses ----------------------------------------------------------
+
+    def validators(self, key: str) -> dict:
+        """Conditional-request headers for a previously cached response (empty if none)."""
+        row = self.conn.execute("SELECT etag, last_modified FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def cached_body(self, key: str) -> bytes:
+        """Stored body for a 304; counts the bytes the server didn't have to send."""
+        row = self.conn.execute("SELECT body FROM responses WHERE key = ?", (key,)).fetchone()
+        body = zlib.decompress(row[0])
+        self.not_modified += 1
+        self.bytes_saved += len(body)
+        return body
+
+    def store(self, key: str, body: bytes, etag=None, last_modified=None):
+        if not etag and not last_modified:
+            # Nothing to revalidate with; don't keep the body around
+            with self.conn:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (key, etag, last_modified, zlib.compress(body), time.time()),
+            )
+
+    # -- documents ----------------------------------------------------------
+
+    def unchanged(self, collection: str, doc_id: str, fingerprint: str) -> bool:
+        row = self.conn.execute(
+            "SELECT fingerprint FROM documents WHERE collection = ? AND doc_id = ?", (collection, doc_id)
+        ).fetchone()
+        return row is not None and row[0] == fingerprint
+
+    def chunk_span(self, collection: str, doc_id: str):
+        """1 + the highest chunk index last written for the document; None if unknown."""
+        row = self.conn.execute(
+            "SELECT chunks FROM documents WHERE collection = ? AND doc_id = ?", (collection, doc_id)
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_ingested(self, collection: str, documents: dict):
+        """Record doc_id → (fingerprint, chunk span) once a document's chunks are written."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO documents (collection, doc_id, fingerprint, chunks, ingested_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(collection, doc_id, fp, chunks, now) for doc_id, (fp, chunks) in documents.items()],
+            )
+
+    def forget(self, collection: str) -> int:
+        with self.conn:
+            return self.conn.execute("DELETE FROM documents WHERE collection = ?", (collection,)).rowcount
+
+    def bind(self, collection: str, collection_id: str, keep: bool = False) -> int:
+        """
+        Tie `collection`'s fingerprints to the Chroma collection with this id.
+        If it was recreated since (or was never bound), its fingerprints are
+        forgotten, unless `keep` says the chunks were carried over (a promoted
+        re-embed).  Returns the number of fingerprints forgotten.
+        """
+        row = self.conn.execute("SELECT collection_id FROM collections WHERE collection = ?",
+                                (collection,)).fetchone()
+        forgotten = 0
+        if not keep and (row is None or row[0] != collection_id):
+            forgotten = self.forget(collection)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO collections (collection, collection_id) VALUES (?, ?)",
+                              (collection, collection_id))
+        return forgotten
@@ -2,6 +2,8 @@ import 'dotenv/config';
 import { getOrCreateCollection, LEGAL_COLLECTION } from '../lib/rag/chroma';
 import { embedTexts } from '../lib/rag/embeddings';
 import { chunkLegalText } from '../lib/rag/chunker';
+import { type ChunkMetadata, toTypedMetadata } from '../lib/rag/metadata-schema';
+import { updateDocumentCentroids } from '../lib/rag/doc-centroids';
 
 // CFR titles mapped to industry verticals
 const CFR_MAPPINGS: {
@@ -184,6 +186,7 @@ async function ingestECFR() {
   const collection = await getOrCreateCollection(LEGAL_COLLECTION);
 
   let totalChunks = 0;
+  const touched = new Set<string>();
 
   for (const mapping of CFR_MAPPINGS) {
     console.log(
@@ -203,7 +206,7 @@ async function ingestECFR() {
 
           const ids: string[] = [];
           const embeddings: number[][] = [];
-          const metadatas: Record<string, string>[] = [];
+          const metadatas: ChunkMetadata[] = [];
           const documents: string[] = [];
 
           for (const result of data.results) {
@@ -228,6 +231,13 @@ async function ingestECFR() {
 
             if (!text || text.length < 100) continue;
 
+            // Same document key as scripts/connectors.py; groups chunks for the centroid collection
+            const docId = `ecfr-t${mapping.title}-${
+              result.hierarchy?.section ||
+              result.hierarchy?.part ||
+              `${searchTerm.replace(/\s+/g, '_')}-p${page}-${ids.length}`
+            }`;
+
             const baseMetadata: Record<string, string> = {
               source: 'ecfr',
               title: sectionTitle || `CFR Title ${mapping.title}`,
@@ -240,6 +250,7 @@ async function ingestECFR() {
               authority_tier: '1',
               market_standard_from: result.starts_on || '',
               deprecated_on: result.ends_on || '',
+              doc_id: docId,
             };
 
             const chunks = chunkLegalText(text, baseMetadata);
@@ -247,7 +258,7 @@ async function ingestECFR() {
             for (const chunk of chunks) {
               const id = `ecfr-t${mapping.title}-${searchTerm.replace(/\s+/g, '_')}-p${page}-${ids.length}`;
               ids.push(id);
-              metadatas.push(chunk.metadata);
+              metadatas.push(toTypedMetadata(chunk.metadata));
               documents.push(chunk.text);
             }
           }
@@ -269,6 +280,7 @@ async function ingestECFR() {
             }
 
             totalChunks += ids.length;
+            for (const meta of metadatas) touched.add(meta.doc_id as string);
             console.log(
               `  [${searchTerm}] Page ${page}: Indexed ${ids.length} chunks`,
             );
@@ -290,7 +302,8 @@ async function ingestECFR() {
     }
   }
 
-  console.log(`\n=== eCFR Ingestion Complete: ${totalChunks} total chunks ===`);
+  const centroids = await updateDocumentCentroids(collection, touched);
+  console.log(`\n=== eCFR Ingestion Complete: ${totalChunks} total chunks, ${centroids} document centroids ===`);
   return totalChunks;
 }
 
@@ -2,6 +2,8 @@ import 'dotenv/config';
 import { getOrCreateCollection, LEGAL_COLLECTION } from '../lib/rag/chroma';
 import { embedTexts } from '../lib/rag/embeddings';
 import { chunkLegalText } from '../lib/rag/chunker';
+import { type ChunkMetadata, toTypedMetadata } from '../lib/rag/metadata-schema';
+import { updateDocumentCentroids } from '../lib/rag/doc-centroids';
 
 // Agency slugs mapped to industry verticals
 const AGENCY_MAPPINGS: {
@@ -149,6 +151,7 @@ async function ingestFederalRegister() {
   const collection = await getOrCreateCollection(LEGAL_COLLECTION);
 
   let totalChunks = 0;
+  const touched = new Set<string>();
 
   for (const agency of AGENCY_MAPPINGS) {
     console.log(`\nProcessing ${agency.name} (${agency.slug}) [${agency.industry}]`);
@@ -165,7 +168,7 @@ async function ingestFederalRegister() {
 
         const ids: string[] = [];
         const allEmbeddings: number[][] = [];
-        const metadatas: Record<string, string>[] = [];
+        const metadatas: ChunkMetadata[] = [];
         const documents: string[] = [];
 
         for (const doc of data.results) {
@@ -199,6 +202,8 @@ async function ingestFederalRegister() {
             authority_tier: authorityTier,
             market_standard_from: doc.publication_date || '',
             deprecated_on: '',
+            // Same document key as scripts/connectors.py; groups chunks for the centroid collection
+            doc_id: `fr-${doc.document_number || `${agency.slug}-${page}-${ids.length}`}`,
           };
 
           const chunks = chunkLegalText(text, baseMetadata);
@@ -206,7 +211,7 @@ async function ingestFederalRegister() {
           for (const chunk of chunks) {
             const id = `fr-${agency.slug}-${doc.document_number || page}-${ids.length}`;
             ids.push(id);
-            metadatas.push(chunk.metadata);
+            metadatas.push(toTypedMetadata(chunk.metadata));
             documents.push(chunk.text);
           }
         }
@@ -227,6 +232,7 @@ async function ingestFederalRegister() {
           }
 
           totalChunks += ids.length;
+          for (const meta of metadatas) touched.add(meta.doc_id as string);
           console.log(
             `  Page ${page}: Indexed ${ids.length} chunks from ${data.results.length} documents`,
           );
@@ -249,8 +255,9 @@ async function ingestFederalRegister() {
     console.log(`  ${agency.name} done: ${docsProcessed} docs processed`);
   }
 
+  const centroids = await updateDocumentCentroids(collection, touched);
   console.log(
-    `\n=== Federal Register Ingestion Complete: ${totalChunks} total chunks ===`,
+    `\n=== Federal Register Ingestion Complete: ${totalChunks} total chunks, ${centroids} document centroids ===`,
   );
   return totalChunks;
 }
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Long-running ingestion daemon: a small HTTP API in front of a durable queue.
+
+Submitters (uploads, scrapers, admin tools) POST documents, and the daemon
+stores them in an SQLite queue before answering 202, so nothing accepted is
+lost on a crash.  A single worker chunks queued documents with chunk_text, using
+the seeder's metadata conventions, and micro-batches chunks from every
+submitter into full embedding + upsert requests.  A batch is sent as soon as
+it is full, or once its oldest chunk has waited `--window` seconds.  Chunking
+and queue (SQLite) calls run in worker threads, so the event loop keeps
+answering submitters while a large document is split.  Jobs left processing
+by a crash count that as an attempt, so a document that kills the daemon is
+parked as failed after MAX_ATTEMPTS restarts instead of looping forever.
+
+API (JSON):
+  POST /documents        {id, content, title?, industry?, document_type?, jurisdiction?,
+                          date?, source?, metadata?}  or a list of them → 202 {jobs: [...]}
+  GET  /documents/{id}   latest job status for a document
+  GET  /metrics          queue depth, batch sizes, throughput, embed latency
+  GET  /healthz
+
+Chunk ids are "ingest-{id}-chunk-{n}" with doc_id "ingest-{id}"; resubmitting a
+document overwrites its chunks and deletes any left over from a longer
+previous version.  Finished documents get their centroid row updated
+(doc_centroids.update_centroids) after each batch.
+
+Run:
+  python3 scripts/ingest_daemon.py                         # http://127.0.0.1:8765
+  python3 scripts/ingest_daemon.py --socket /tmp/elle-ingest.sock --window 0.5
+  curl -X POST localhost:8765/documents -d '{"id": "nda-guide", "content": "..."}'
+"""
+
+import argparse, asyncio, json, sqlite3, sys, threading, time
+from collections import deque
+from pathlib import Path
+
+from aiohttp import web
+
+from doc_centroids import update_centroids
+from lexical_index import DEFAULT_LEXICAL_PATH, LexicalIndex
+from metadata_schema import METADATA_SCHEMA_VERSION, typed_metadata
+from seed_legal_concepts import (
+    ARTIFACT_DIR, BATCH_SIZE, COLLECTION_NAME, add_chunking_args, chunk_text, document_metadata, embed_texts,
+    get_chroma, get_embedding_function, link_chunks,
+)
+
+DEFAULT_QUEUE_PATH = ARTIFACT_DIR / "ingest-queue.sqlite"
+DEFAULT_PORT = 8765
+BATCH_WINDOW = 0.25  # seconds a chunk may wait for its batch to fill
+CLAIM_LIMIT = 32  # documents taken off the queue per worker pass
+MAX_ATTEMPTS = 3
+THROUGHPUT_WINDOW = 60  # seconds
+CHUNK_ID_PREFIX = "ingest-"
+DAEMON_SOURCE = "elle-ingest-daemon"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    chunks INTEGER,
+    submitted_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, job_id);
+CREATE INDEX IF NOT EXISTS jobs_doc ON jobs (doc_id, job_id);
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    chunks INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def validate_document(doc) -> dict:
+    if not isinstance(doc, dict):
+        raise ValueError("each document must be a JSON object")
+    missing = [k for k in ("id", "content") if not str(doc.get(k) or "").strip()]
+    if missing:
+        raise ValueError(f"document missing {', '.join(missing)}")
+    if doc.get("metadata") is not None and not isinstance(doc["metadata"], dict):
+        raise ValueError("metadata must be an object")
+    return doc
+
+
+def submitted_metadata(doc: dict) -> dict:
+    """The seeder's metadata for a submitted document; `source` and `metadata` override the defaults."""
+    meta = document_metadata({
+        "title": doc["id"],
+        "industry": "general",
+        "document_type": "legal_guide",
+        "jurisdiction": "US",
+        **doc,
+    })
+    meta["source"] = doc.get("source") or DAEMON_SOURCE
+    meta.update(doc.get("metadata") or {})
+    meta["doc_id"] = f"{CHUNK_ID_PREFIX}{doc['id']}"
+    return typed_metadata(meta)
+
+
+# ---------------------------------------------------------------------------
+# Durable queue
+# ---------------------------------------------------------------------------
+
+class IngestQueue:
+    """
+    SQLite job queue.  Called from the event loop and from worker threads
+    (asyncio.to_thread), so one connection is shared under a lock.
+    """
+
+    def __init__(self, path: Path = DEFAULT_QUEUE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def recover(self) -> int:
+        """
+        Requeue jobs a previous process claimed but never finished.  The crash
+        counts as an attempt: a job that reaches MAX_ATTEMPTS is parked as 'failed'.
+        """
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "UPDATE jobs SET attempts = attempts + 1, error = COALESCE(error, 'interrupted'),"
+                " status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END WHERE status = 'processing'",
+                (MAX_ATTEMPTS,),
+            ).rowcount
+
+    def submit(self, docs: list) -> list:
+        now = time.time()
+        with self._lock, self.conn:
+            return [
+                self.conn.execute(
+                    "INSERT INTO jobs (doc_id, payload, submitted_at) VALUES (?, ?, ?)",
+                    (str(doc["id"]), json.dumps(doc), now),
+                ).lastrowid
+                for doc in docs
+            ]
+
+    def claim(self, limit=CLAIM_LIMIT) -> list:
+        with self._lock, self.conn:
+            rows = self.conn.execute(
+                "SELECT job_id, payload FROM jobs WHERE status = 'pending' ORDER BY job_id LIMIT ?", (limit,)
+            ).fetchall()
+            self.conn.executemany("UPDATE jobs SET status = 'processing' WHERE job_id = ?", [(r[0],) for r in rows])
+        return [(job_id, json.loads(payload)) for job_id, payload in rows]
+
+    def previous_chunks(self, doc_id: str) -> int:
+        with self._lock:
+            row = self.conn.execute("SELECT chunks FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+        return row[0] if row else 0
+
+    def complete(self, job_id: int, doc_id: str, chunks: int):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE jobs SET status = 'done', chunks = ?, finished_at = ? WHERE job_id = ?",
+                              (chunks, now, job_id))
+            self.conn.execute("INSERT OR REPLACE INTO documents (doc_id, chunks, updated_at) VALUES (?, ?, ?)",
+                              (doc_id, chunks, now))
+
+    def fail(self, job_id: int, error: str) -> str:
+        """Record a failed attempt; the job is retried until MAX_ATTEMPTS, then parked as 'failed'."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET attempts = attempts + 1, error = ?,"
+                " status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END WHERE job_id = ?",
+                (error, MAX_ATTEMPTS, job_id),
+            )
+            return self.conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()[0]
+
+    def status(self, doc_id: str):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT job_id, status, attempts, error, chunks, submitted_at, finished_at FROM jobs"
+                " WHERE doc_id = ? ORDER BY job_id DESC LIMIT 1", (doc_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("job", "status", "attempts", "error", "chunks", "submitted_at", "finished_at")
+        return dict(zip(keys, row))
+
+    def depth(self) -> dict:
+        with self._lock:
+            counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        return {s: counts.get(s, 0) for s in ("pending", "processing", "done", "failed")}
+
+
+# ---------------------------------------------------------------------------
+# Micro-batching worker
+# ---------------------------------------------------------------------------
+
+class MicroBatcher:
+    """
+    Buffers chunks from every claimed job and writes them BATCH_SIZE at a time.
+    A job completes when its last chunk has been written; any failure in a
+    batch fails (and requeues) every job with chunks in that batch.
+    """
+
+    def __init__(self, col, queue: IngestQueue, args, lexical=None):
+        self.col = col
+        self.queue = queue
+        self.args = args
+        self.lexical = lexical
+        self.batch_size = args.batch_size
+        self.window = args.window
+        self.wakeup = asyncio.Event()
+        self.buffer = deque()  # (job_id, chunk id, text, metadata, enqueued_at)
+        self.jobs = {}  # job_id → {doc_id, chunks, unwritten}
+        self.touched = set()  # finished documents' doc_id metadata, for update_centroids
+        self.started = time.time()
+        self.batches = self.chunks_written = self.docs_done = self.docs_failed = 0
+        self.embed_seconds = 0.0
+        self._recent = deque()  # (finished_at, chunks) for throughput
+
+    async def _take(self, job_id: int, doc: dict):
+        doc = {**doc, "id": str(doc["id"])}
+        chunks = await asyncio.to_thread(
+            chunk_text, doc["content"].strip(), submitted_metadata(doc), chunk_size=self.args.chunk_size,
+            overlap=self.args.chunk_overlap, mode=self.args.chunking, unit=self.args.chunk_unit,
+            token_counts=self.args.token_counts,
+        )
+        self.jobs[job_id] = {"doc_id": doc["id"], "chunks": len(chunks), "unwritten": len(chunks)}
+        now = time.monotonic()
+        ids = [f"{CHUNK_ID_PREFIX}{doc['id']}-chunk-{i}" for i in range(len(chunks))]
+        link_chunks(ids, chunks)
+        for id_, c in zip(ids, chunks):
+            self.buffer.append((job_id, id_, c["text"], c["metadata"], now))
+        if not chunks:
+            await self._finish(job_id)
+
+    async def _finish(self, job_id: int):
+        job = self.jobs.pop(job_id)
+        previous = await asyncio.to_thread(self.queue.previous_chunks, job["doc_id"])
+        stale = [f"{CHUNK_ID_PREFIX}{job['doc_id']}-chunk-{i}" for i in range(job["chunks"], previous)]
+        if stale:
+            await asyncio.to_thread(self.col.delete, ids=stale)
+            if self.lexical is not None:
+                self.lexical.delete(stale)
+        await asyncio.to_thread(self.queue.complete, job_id, job["doc_id"], job["chunks"])
+        self.touched.add(f"{CHUNK_ID_PREFIX}{job['doc_id']}")
+        self.docs_done += 1
+
+    async def _update_centroids(self):
+        touched, self.touched = self.touched, set()
+        try:
+            await asyncio.to_thread(update_centroids, self.col, touched, doc_metadata={})
+        except Exception as e:
+            # The chunks are written; legalSearch searches them without stage 1 until the next update
+            self.touched |= touched
+            print(f"  ! centroid update for {len(touched)} documents: {type(e).__name__}: {e}")
+
+    async def _fail(self, job_ids: set, error: str):
+        self.buffer = deque(item for item in self.buffer if item[0] not in job_ids)
+        for job_id in job_ids:
+            self.jobs.pop(job_id, None)
+            status = await asyncio.to_thread(self.queue.fail, job_id, error)
+            if status == "failed":
+                self.docs_failed += 1
+            print(f"  ! job {job_id}: {error} ({status})")
+
+    async def _flush(self, n: int):
+        batch = [self.buffer.popleft() for _ in range(min(n, len(self.buffer)))]
+        job_ids = {item[0] for item in batch}
+        ids = [item[1] for item in batch]
+        texts = [item[2] for item in batch]
+        metas = [item[3] for item in batch]
+        try:
+            start = time.perf_counter()
+            embeddings = await asyncio.to_thread(embed_texts, texts)
+            self.embed_seconds += time.perf_counter() - start
+            await asyncio.to_thread(self.col.upsert, ids=ids, embeddings=embeddings, documents=texts,
+                                    metadatas=metas)
+            if self.lexical is not None:
+                self.lexical.upsert(ids, texts, metas)
+        except Exception as e:
+            await self._fail(job_ids, f"{type(e).__name__}: {e}")
+            return
+        self.batches += 1
+        self.chunks_written += len(batch)
+        self._recent.append((time.time(), len(batch)))
+        for job_id, *_ in batch:
+            job = self.jobs[job_id]
+            job["unwritten"] -= 1
+            if job["unwritten"] == 0:
+                await self._finish(job_id)
+        if self.touched:
+            await self._update_centroids()
+
+    async def run(self):
+        while True:
+            # Keep a batch's worth of chunks buffered ahead of the writer
+            if len(self.buffer) < self.batch_size:
+                for job_id, doc in await asyncio.to_thread(self.queue.claim, CLAIM_LIMIT):
+                    try:
+                        await self._take(job_id, doc)
+                    except Exception as e:
+                        await self._fail({job_id}, f"{type(e).__name__}: {e}")
+            if len(self.buffer) >= self.batch_size:
+                await self._flush(self.batch_size)
+                continue
+            if self.buffer:
+                waited = time.monotonic() - self.buffer[0][4]
+                if waited >= self.window:
+                    await self._flush(len(self.buffer))
+                    continue
+                timeout = self.window - waited
+            else:
+                timeout = None
+                if self.touched:
+                    await self._update_centroids()
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def metrics(self) -> dict:
+        now = time.time()
+        while self._recent and now - self._recent[0][0] > THROUGHPUT_WINDOW:
+            self._recent.popleft()
+        recent = sum(n for _, n in self._recent)
+        return {
+            "queue": self.queue.depth(),
+            "buffered_chunks": len(self.buffer),
+            "batches": self.batches,
+            "chunks_written": self.chunks_written,
+            "documents_done": self.docs_done,
+            "documents_failed": self.docs_failed,
+            "mean_batch_size": self.chunks_written / self.batches if self.batches else 0.0,
+            "chunks_per_second": recent / min(THROUGHPUT_WINDOW, max(now - self.started, 1e-9)),
+            "embed_ms_mean": self.embed_seconds * 1000 / self.batches if self.batches else 0.0,
+            "uptime_seconds": now - self.started,
+        }
+
+
+# ---------------------------------------------------------------------------
+# HTTP API
+# ---------------------------------------------------------------------------
+
+def make_app(queue: IngestQueue, batcher: MicroBatcher) -> web.Application:
+    async def submit(request):
+        try:
+            body = await request.json()
+            docs = [validate_document(d) for d in (body if isinstance(body, list) else [body])]
+        except (ValueError, json.JSONDecodeError) as e:
+            return web.json_response({"error": str(e)}, status=400)
+        job_ids = await asyncio.to_thread(queue.submit, docs)
+        batcher.wakeup.set()
+        return web.json_response({"jobs": [{"job": j, "id": str(d["id"])} for j, d in zip(job_ids, docs)]},
+                                 status=202)
+
+    async def status(request):
+        found = await asyncio.to_thread(queue.status, request.match_info["doc_id"])
+        if found is None:
+            return web.json_response({"error": "unknown document"}, status=404)
+        return web.json_response(found)
+
+    async def metrics(request):
+        return web.json_response(batcher.metrics())
+
+    async def healthz(request):
+        return web.json_response({"ok": True})
+
+    async def start_worker(app):
+        app["worker"] = asyncio.create_task(batcher.run())
+
+    async def stop_worker(app):
+        app["worker"].cancel()
+
+    app = web.Application()
+    app.router.add_post("/documents", submit)
+    app.router.add_get("/documents/{doc_id}", status)
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/healthz", healthz)
+    app.on_startup.append(start_worker)
+    app.on_cleanup.append(stop_worker)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the document ingestion daemon.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--queue", type=Path, default=DEFAULT_QUEUE_PATH)
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="chunks per embedding/upsert request")
+    parser.add_argument("--window", type=float, default=BATCH_WINDOW, help="max seconds a chunk waits for a batch")
+    add_chunking_args(parser)
+    args = parser.parse_args(argv)
+
+    col = get_chroma().get_or_create_collection(
+        name=args.collection,
+        metadata={"hnsw:space": "cosine", "metadata_schema": METADATA_SCHEMA_VERSION},
+        embedding_function=get_embedding_function(),
+    )
+    lexical = None
+    if args.collection == COLLECTION_NAME and DEFAULT_LEXICAL_PATH.exists():
+        lexical = LexicalIndex()
+    queue = IngestQueue(args.queue)
+    recovered = queue.recover()
+    batcher = MicroBatcher(col, queue, args, lexical)
+
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"\n=== Ingestion daemon → '{args.collection}' on {where} "
+          f"(batch {args.batch_size}, window {args.window}s; {recovered} jobs recovered) ===\n")
+    try:
+        if args.socket:
+            web.run_app(make_app(queue, batcher), path=args.socket, print=None)
+        else:
+            web.run_app(make_app(queue, batcher), host=args.host, port=args.port, print=None)
+    finally:
+        queue.close()
+        if lexical is not None:
+            lexical.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
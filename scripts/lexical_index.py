@@ -0,0 +1,195 @@
+"""
+SQLite FTS5 lexical sidecar for the legal-documents collection.
+
+Indexes the same chunk ids the seeder upserts into Chroma, so exact legal terms
+and citations ("Rule 506(c)", "Section 1202", "HSR") can be looked up locally
+with BM25 ranking and no embedding call.  Chunks live in a plain table keyed by
+id; an external-content FTS5 table is kept in sync by triggers, which makes
+upserts and deletes incremental.
+
+Run:
+  python3 scripts/lexical_index.py "Rule 506(c)"
+  python3 scripts/lexical_index.py HSR filing --mode all --industry general -k 5
+"""
+
+import argparse, re, sqlite3, sys, time
+from pathlib import Path
+
+from metadata_schema import DATE_MAX, today_epoch_day, typed_metadata
+from seed_legal_concepts import ARTIFACT_DIR
+
+DEFAULT_LEXICAL_PATH = ARTIFACT_DIR / "lexical.sqlite"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS chunks (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL,
+    industry TEXT NOT NULL DEFAULT '',
+    authority_tier INTEGER NOT NULL DEFAULT 0,
+    deprecated_on INTEGER NOT NULL DEFAULT {DATE_MAX}
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    title, text,
+    content='chunks', content_rowid='rowid',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts(rowid, title, text) VALUES (new.rowid, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, title, text) VALUES ('delete', old.rowid, old.title, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, title, text) VALUES ('delete', old.rowid, old.title, old.text);
+    INSERT INTO chunks_fts(rowid, title, text) VALUES (new.rowid, new.title, new.text);
+END;
+"""
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(query: str, mode: str = "phrase") -> str:
+    """
+    Build an FTS5 MATCH expression from free text.  Every token is quoted, so
+    punctuation in citations never reaches the FTS5 query parser:
+      phrase — tokens must appear consecutively ("Rule 506(c)" → "rule" "506" "c" in order)
+      all    — every token must appear
+      any    — at least one token must appear (BM25 ranks the rest)
+    """
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return ""
+    if mode == "phrase":
+        return '"' + " ".join(tokens) + '"'
+    joiner = " AND " if mode == "all" else " OR "
+    return joiner.join(f'"{t}"' for t in tokens)
+
+
+def _typed(meta: dict) -> dict:
+    return typed_metadata({"authority_tier": 0, "deprecated_on": DATE_MAX, **meta})
+
+
+class LexicalIndex:
+    def __init__(self, path: Path = DEFAULT_LEXICAL_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def reset(self):
+        """Drop every chunk (used when the seeder recreates the collection)."""
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks")
+            self.conn.execute("INSERT INTO chunks_fts(chunks_fts) VALUES ('rebuild')")
+
+    def upsert(self, ids: list, documents: list, metadatas: list):
+        rows = [
+            (
+                id_,
+                meta.get("title", ""),
+                doc,
+                meta.get("industry", ""),
+                typed["authority_tier"],
+                typed["deprecated_on"],
+            )
+            for id_, doc, meta, typed in zip(ids, documents, metadatas, map(_typed, metadatas))
+        ]
+        with self.conn:
+            # ON CONFLICT DO UPDATE keeps the rowid stable and fires the update trigger
+            self.conn.executemany(
+                "INSERT INTO chunks (id, title, text, industry, authority_tier, deprecated_on) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET title = excluded.title, text = excluded.text, "
+                "industry = excluded.industry, authority_tier = excluded.authority_tier, "
+                "deprecated_on = excluded.deprecated_on",
+                rows,
+            )
+
+    def update_metadata(self, ids: list, metadatas: list):
+        """Refresh the filter columns only; text (and so the FTS index) is untouched."""
+        rows = [
+            (meta.get("title", ""), meta.get("industry", ""), typed["authority_tier"], typed["deprecated_on"], id_)
+            for id_, meta, typed in zip(ids, metadatas, map(_typed, metadatas))
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE chunks SET title = ?, industry = ?, authority_tier = ?, deprecated_on = ? WHERE id = ?",
+                rows,
+            )
+
+    def delete(self, ids: list):
+        with self.conn:
+            self.conn.executemany("DELETE FROM chunks WHERE id = ?", [(i,) for i in ids])
+
+    def delete_industry(self, industry: str, id_prefix: str = ""):
+        """Drop an industry's rows, optionally only ids starting with `id_prefix` (e.g. seeded chunks)."""
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks WHERE industry = ? AND substr(id, 1, ?) = ?",
+                              (industry, len(id_prefix), id_prefix))
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def search(self, query: str, k=8, mode="phrase", industry=None, tiers=None, include_deprecated=True):
+        """
+        BM25-ranked lookup.  Filters mirror LocalIndex/legalSearch; by default all
+        tiers and deprecated chunks are returned since exact-term lookups are
+        usually precise already.  Returns [{id, score, title, text, industry, authority_tier}].
+        """
+        expr = match_expression(query, mode)
+        if not expr:
+            return []
+        sql = [
+            "SELECT c.id, bm25(chunks_fts) AS score, c.title, c.text, c.industry, c.authority_tier",
+            "FROM chunks_fts JOIN chunks c ON c.rowid = chunks_fts.rowid",
+            "WHERE chunks_fts MATCH ?",
+        ]
+        params = [expr]
+        if industry:
+            sql.append("AND c.industry = ?")
+            params.append(industry)
+        if tiers:
+            sql.append(f"AND c.authority_tier IN ({','.join('?' * len(tiers))})")
+            params.extend(int(t) for t in tiers)
+        if not include_deprecated:
+            sql.append("AND c.deprecated_on > ?")
+            params.append(today_epoch_day())
+        sql.append("ORDER BY score LIMIT ?")
+        params.append(k)
+        rows = self.conn.execute(" ".join(sql), params).fetchall()
+        # FTS5 bm25() is negative (lower is better); flip it so higher is better
+        return [
+            {"id": r[0], "score": -r[1], "title": r[2], "text": r[3], "industry": r[4], "authority_tier": r[5]}
+            for r in rows
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact-term lookup against the lexical sidecar index.")
+    parser.add_argument("query", nargs="+")
+    parser.add_argument("-k", type=int, default=8)
+    parser.add_argument("--mode", choices=["phrase", "all", "any"], default="phrase")
+    parser.add_argument("--industry")
+    parser.add_argument("--path", type=Path, default=DEFAULT_LEXICAL_PATH)
+    args = parser.parse_args(argv)
+
+    index = LexicalIndex(args.path)
+    query = " ".join(args.query)
+    start = time.perf_counter()
+    hits = index.search(query, k=args.k, mode=args.mode, industry=args.industry)
+    elapsed_us = (time.perf_counter() - start) * 1e6
+    for h in hits:
+        print(f"  {h['score']:7.3f}  {h['id']}  {h['title']}")
+    print(f"\n{len(hits)} hits for {match_expression(query, args.mode)} "
+          f"over {index.count()} chunks in {elapsed_us:.0f} µs")
+    index.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+In-process exact top-k search over the seeded legal-documents collection.
+
+Loads every vector into one contiguous float32 matrix (optionally memory-mapped
+from a snapshot on disk) and answers batched cosine top-k queries with NumPy.
+Supports the same pre-retrieval filters as `legalSearch` (in force today
+per valid_from/valid_to, authority_tier, industry), so it doubles as an exact-recall baseline for the
+HNSW index and as a fast local backend for offline evaluation.
+
+Run:
+  python3 scripts/local_search.py snapshot                  # Chroma → .rag/local-index/
+  python3 scripts/local_search.py query "SAFE note cap" --industry saas
+  python3 scripts/local_search.py bench --queries 2000 --batch 64
+"""
+
+import argparse, json, sys, time
+from pathlib import Path
+
+import numpy as np
+
+from metadata_schema import DATE_MIN, today_epoch_day
+from seed_legal_concepts import ARTIFACT_DIR, COLLECTION_NAME, embed_texts, get_chroma
+
+DEFAULT_INDEX_DIR = ARTIFACT_DIR / "local-index"
+SNAPSHOT_PAGE_SIZE = 1000
+# Tiers legalSearch keeps in its filtered pass ({ authority_tier: { $in: [1, 2] } })
+DEFAULT_TIERS = (1, 2)
+
+
+def _as_int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _is_deprecated(value, today):
+    # Legacy string schema uses "" for "not deprecated"; the typed schema stores
+    # an epoch day (DATE_MAX when never deprecated)
+    if value is None or value == "":
+        return False
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value <= today
+    return True
+
+
+def _is_superseded(meta: dict, today) -> bool:
+    """Not in force today: outside [valid_from, valid_to) (schema v3), else deprecated."""
+    if isinstance(meta.get("valid_to"), int):
+        return not meta.get("valid_from", DATE_MIN) <= today < meta["valid_to"]
+    return _is_deprecated(meta.get("deprecated_on"), today)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class LocalIndex:
+    """Exact cosine index: row i of `vectors` belongs to ids[i] / metadatas[i]."""
+
+    def __init__(self, ids, vectors, documents, metadatas, normalized=False):
+        self.ids = list(ids)
+        self.vectors = vectors if normalized else normalize_rows(vectors)
+        self.documents = list(documents)
+        self.metadatas = list(metadatas)
+        # Column arrays for vectorized filtering
+        self.industry = np.array([m.get("industry", "") for m in self.metadatas], dtype=object)
+        self.tier = np.array([_as_int(m.get("authority_tier")) for m in self.metadatas], dtype=np.int8)
+        today = today_epoch_day()
+        self.deprecated = np.array([_is_superseded(m, today) for m in self.metadatas], dtype=bool)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1] if self.vectors.ndim == 2 else 0
+
+    # -- construction -------------------------------------------------------
+
+    @classmethod
+    def from_collection(cls, col, page_size=SNAPSHOT_PAGE_SIZE):
+        total = col.count()
+        ids, documents, metadatas = [], [], []
+        vectors = None
+        for offset in range(0, total, page_size):
+            page = col.get(
+                limit=page_size,
+                offset=offset,
+                include=["embeddings", "documents", "metadatas"],
+            )
+            emb = np.asarray(page["embeddings"], dtype=np.float32)
+            if vectors is None:
+                vectors = np.empty((total, emb.shape[1]), dtype=np.float32)
+            vectors[len(ids) : len(ids) + len(emb)] = emb
+            ids.extend(page["ids"])
+            documents.extend(page["documents"])
+            metadatas.extend(page["metadatas"])
+        if vectors is None:
+            vectors = np.empty((0, 0), dtype=np.float32)
+        return cls(ids, vectors[: len(ids)], documents, metadatas)
+
+    def save(self, path: Path = DEFAULT_INDEX_DIR):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "vectors.npy", np.ascontiguousarray(self.vectors))
+        with open(path / "records.jsonl", "w") as f:
+            for id_, doc, meta in zip(self.ids, self.documents, self.metadatas):
+                f.write(json.dumps({"id": id_, "document": doc, "metadata": meta}) + "\n")
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_INDEX_DIR, mmap=True):
+        path = Path(path)
+        vectors = np.load(path / "vectors.npy", mmap_mode="r" if mmap else None)
+        ids, documents, metadatas = [], [], []
+        with open(path / "records.jsonl") as f:
+            for line in f:
+                rec = json.loads(line)
+                ids.append(rec["id"])
+                documents.append(rec["document"])
+                metadatas.append(rec["metadata"])
+        # Snapshots are written normalized; don't copy a memory-mapped matrix
+        return cls(ids, vectors, documents, metadatas, normalized=True)
+
+    # -- search -------------------------------------------------------------
+
+    def mask(self, industry=None, tiers=DEFAULT_TIERS, include_deprecated=False):
+        """Boolean row mask equivalent to legalSearch's WHERE clause (None = all rows)."""
+        m = None
+        if not include_deprecated:
+            m = ~self.deprecated
+        if tiers:
+            t = np.isin(self.tier, np.asarray(tiers, dtype=np.int8))
+            m = t if m is None else m & t
+        if industry:
+            i = self.industry == industry
+            m = i if m is None else m & i
+        return m
+
+    def search(self, queries, k=8, industry=None, tiers=DEFAULT_TIERS, include_deprecated=False):
+        """
+        Batched exact cosine top-k.  `queries` is a (q, dim) array or a single vector.
+        Returns one list of hits per query: {id, score, distance, document, metadata}.
+        """
+        q = normalize_rows(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        if len(self) == 0:
+            return [[] for _ in range(len(q))]
+        scores = q @ self.vectors.T
+        m = self.mask(industry, tiers, include_deprecated)
+        if m is not None:
+            scores[:, ~m] = -np.inf
+
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        results = []
+        for rows, row_scores in zip(top, top_scores):
+            hits = []
+            for r, s in zip(rows, row_scores):
+                if not np.isfinite(s):
+                    break
+                hits.append({
+                    "id": self.ids[r],
+                    "score": float(s),
+                    "distance": float(1.0 - s),  # matches Chroma's cosine distance
+                    "document": self.documents[r],
+                    "metadata": self.metadatas[r],
+                })
+            results.append(hits)
+        return results
+
+    def benchmark(self, n_queries=1000, batch=64, k=8, industry=None, seed=0):
+        """Measure queries per second using perturbed corpus vectors as queries."""
+        rng = np.random.default_rng(seed)
+        picks = rng.integers(0, len(self), size=n_queries)
+        queries = np.asarray(self.vectors[picks], dtype=np.float32)
+        queries += rng.normal(0, 0.01, size=queries.shape).astype(np.float32)
+        start = time.perf_counter()
+        for i in range(0, n_queries, batch):
+            self.search(queries[i : i + batch], k=k, industry=industry)
+        elapsed = time.perf_counter() - start
+        return {"queries": n_queries, "batch": batch, "seconds": elapsed, "qps": n_queries / elapsed}
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--index-dir", type=Path, default=DEFAULT_INDEX_DIR)
+    parser.add_argument("--no-mmap", action="store_true", help="load the matrix into RAM")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    snap = sub.add_parser("snapshot", help="dump the Chroma collection to the local index dir")
+    snap.add_argument("--collection", default=COLLECTION_NAME)
+
+    q = sub.add_parser("query", help="embed one or more queries and print top-k hits")
+    q.add_argument("queries", nargs="+")
+    q.add_argument("-k", type=int, default=8)
+    q.add_argument("--industry")
+    q.add_argument("--all-tiers", action="store_true")
+    q.add_argument("--include-deprecated", action="store_true")
+
+    b = sub.add_parser("bench", help="report queries per second")
+    b.add_argument("--queries", type=int, default=1000)
+    b.add_argument("--batch", type=int, default=64)
+    b.add_argument("-k", type=int, default=8)
+    b.add_argument("--industry")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "snapshot":
+        col = get_chroma().get_collection(name=args.collection)
+        start = time.perf_counter()
+        index = LocalIndex.from_collection(col)
+        index.save(args.index_dir)
+        print(f"Snapshot: {len(index)} vectors × {index.dim} dims → {args.index_dir} "
+              f"({time.perf_counter() - start:.1f}s)")
+        return
+
+    index = LocalIndex.load(args.index_dir, mmap=not args.no_mmap)
+
+    if args.command == "query":
+        vectors = np.asarray(embed_texts(args.queries), dtype=np.float32)
+        start = time.perf_counter()
+        results = index.search(
+            vectors,
+            k=args.k,
+            industry=args.industry,
+            tiers=None if args.all_tiers else DEFAULT_TIERS,
+            include_deprecated=args.include_deprecated,
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for query, hits in zip(args.queries, results):
+            print(f"\n{query}")
+            for h in hits:
+                print(f"  {h['score']:.3f}  {h['id']}  {h['metadata'].get('title', '')}")
+        print(f"\n{len(args.queries)} queries over {len(index)} vectors in {elapsed_ms:.2f} ms")
+    elif args.command == "bench":
+        r = index.benchmark(args.queries, args.batch, args.k, args.industry)
+        print(f"{r['queries']} queries (batch {r['batch']}) over {len(index)} vectors: "
+              f"{r['seconds']:.3f}s, {r['qps']:.0f} queries/s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Measure chunk metadata size in full vs compact mode (`--compact-metadata`).
+
+Full mode copies every document field (title, source, relevance_score, ...)
+into each chunk; compact mode keeps FILTER_FIELDS, doc_id and chunk-level
+fields, and stores the document fields once in <collection>-docs.  For the
+seed corpus this reports:
+
+  upsert payload     JSON bytes of the metadatas sent with every upsert
+  query response     metadata bytes in an include=['metadatas'] response of k hits
+  storage            rows and key/value bytes in Chroma's embedding_metadata
+                     table, and chroma.sqlite3 size, after seeding a scratch
+                     on-disk collection (compact includes its document rows)
+
+Run:
+  python3 scripts/metadata_footprint.py
+  python3 scripts/metadata_footprint.py --chunking markdown -k 8
+"""
+
+import argparse, json, sqlite3, sys, tempfile
+from pathlib import Path
+
+import chromadb
+import numpy as np
+
+from seed_legal_concepts import (
+    LEGAL_CONCEPTS, add_chunking_args, chunk_document, compact_metadata, seed_doc_id, seed_document_metadata,
+)
+
+SCRATCH_DIM = 8  # vector size is irrelevant here; keep the index small
+
+
+def payload_bytes(metas: list) -> int:
+    return sum(len(json.dumps(m, separators=(",", ":")).encode()) for m in metas)
+
+
+def stored_footprint(workdir: Path, ids: list, metas: list, doc_rows: dict) -> dict:
+    client = chromadb.PersistentClient(path=str(workdir))
+    rng = np.random.default_rng(0)
+    col = client.create_collection("footprint", embedding_function=None)
+    for i in range(0, len(ids), 500):
+        col.add(ids=ids[i : i + 500], metadatas=metas[i : i + 500],
+                embeddings=rng.normal(size=(len(ids[i : i + 500]), SCRATCH_DIM)).astype(np.float32))
+    if doc_rows:
+        docs = client.create_collection("footprint-docs", embedding_function=None)
+        docs.add(ids=list(doc_rows), metadatas=list(doc_rows.values()),
+                 embeddings=rng.normal(size=(len(doc_rows), SCRATCH_DIM)).astype(np.float32))
+    del client
+    db = sqlite3.connect(str(workdir / "chroma.sqlite3"))
+    rows, kv_bytes = db.execute(
+        "SELECT COUNT(*), SUM(LENGTH(key) + COALESCE(LENGTH(string_value), 8)) FROM embedding_metadata"
+    ).fetchone()
+    db.execute("VACUUM")
+    db.close()
+    return {"rows": rows, "kv_bytes": kv_bytes or 0, "sqlite_bytes": (workdir / "chroma.sqlite3").stat().st_size}
+
+
+def measure(args) -> dict:
+    ids, full = [], []
+    for doc in LEGAL_CONCEPTS:
+        for i, c in enumerate(chunk_document(doc, args)):
+            ids.append(f"{seed_doc_id(doc)}-chunk-{i}")
+            full.append(c["metadata"])
+    compact = [compact_metadata(m) for m in full]
+    doc_rows = seed_document_metadata(LEGAL_CONCEPTS)
+
+    result = {"chunks": len(ids), "documents": len(doc_rows)}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, metas, docs in (("full", full, {}), ("compact", compact, doc_rows)):
+            per_chunk = payload_bytes(metas) / len(metas)
+            result[mode] = {
+                "upsert_bytes": payload_bytes(metas),
+                "per_chunk_bytes": round(per_chunk, 1),
+                "query_bytes": round(per_chunk * args.k),
+                "document_table_bytes": payload_bytes(list(docs.values())),
+                **stored_footprint(Path(tmp) / mode, ids, metas, docs),
+            }
+    return result
+
+
+def main(argv=None):
+    parser = add_chunking_args(argparse.ArgumentParser(description="Compare full vs compact chunk metadata size."))
+    parser.add_argument("-k", type=int, default=8, help="hits per query response")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    r = measure(args)
+    if args.json:
+        print(json.dumps(r, indent=2))
+        return
+    full, compact = r["full"], r["compact"]
+
+    def row(label, key):
+        saved = 1 - compact[key] / full[key] if full[key] else 0
+        print(f"  {label:<34} {full[key]:>12,} {compact[key]:>12,} {saved:>8.0%}")
+
+    print(f"\n{r['chunks']} chunks from {r['documents']} documents\n")
+    print(f"  {'':<34} {'full':>12} {'compact':>12} {'saved':>8}")
+    row("upsert payload (metadata bytes)", "upsert_bytes")
+    row("per-chunk metadata (bytes)", "per_chunk_bytes")
+    row(f"query response, k={args.k} (bytes)", "query_bytes")
+    row("embedding_metadata rows", "rows")
+    row("embedding_metadata key/value bytes", "kv_bytes")
+    row("chroma.sqlite3 (bytes)", "sqlite_bytes")
+    print(f"\n  compact mode stores {compact['document_table_bytes']:,} bytes of document metadata once "
+          f"(included in the storage rows above)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Typed chunk metadata schema and in-place migration.
+
+Chroma compares metadata by type, so tiers stored as "2" and dates stored as
+free-form strings can only be filtered with $in / $eq string matches.  Schema v2
+stores:
+  authority_tier        int   (1 primary, 2 secondary, 3 tertiary; derived from
+                              source / document_type / url when missing or invalid)
+  relevance_score       float
+  chunk_index           int
+  cfr_title             int
+  market_standard_from  int   epoch day; DATE_MIN when unknown (always in force)
+  deprecated_on         int   epoch day; DATE_MAX when not deprecated
+
+and v3 adds the chunk's validity interval [valid_from, valid_to) and a numeric
+publication date:
+  valid_from            int   epoch day; defaults to market_standard_from
+  valid_to              int   epoch day; at most deprecated_on (DATE_MAX while current)
+  published_on          int   epoch day of `date`; DATE_MAX when undated, so
+                              recency cutoffs never drop undated primary law
+
+Superseded chunk versions are kept with a closed interval (seed_watch.py
+--keep-history), so "in force on day D, tier 1–2" is one pre-retrieval filter:
+  { valid_from: { $lte: D }, valid_to: { $gt: D }, authority_tier: { $in: [1, 2] } }
+lib/rag/metadata-schema.ts mirrors these rules for the TypeScript ingesters.
+
+Run:
+  python3 scripts/metadata_schema.py migrate                 # rewrite legal-documents in pages
+  python3 scripts/metadata_schema.py migrate --dry-run --page-size 1000
+"""
+
+import argparse, sys, time
+from datetime import date, datetime, timezone
+
+from seed_legal_concepts import COLLECTION_NAME, get_chroma, set_collection_metadata
+
+METADATA_SCHEMA_VERSION = 3
+DATE_MIN = 0
+DATE_MAX = 999_999  # ~ year 4707; "never"
+DATE_FIELDS = ("market_standard_from", "deprecated_on", "valid_from", "valid_to", "published_on")
+MIGRATION_PAGE_SIZE = 500
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def epoch_day(d: date) -> int:
+    return d.toordinal() - _EPOCH
+
+
+def today_epoch_day() -> int:
+    return epoch_day(datetime.now(timezone.utc).date())
+
+
+def parse_epoch_day(value, missing: int):
+    """
+    Accepts epoch days, "YYYY", "YYYY-MM", "YYYY-MM-DD" or ISO datetimes.
+    Blank/None → `missing`; unparseable → None.
+    """
+    if value is None or value == "":
+        return missing
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    s = str(value).strip()
+    if not s:
+        return missing
+    for fmt, width in (("%Y-%m-%d", 10), ("%Y-%m", 7), ("%Y", 4)):
+        try:
+            return epoch_day(datetime.strptime(s[:width], fmt).date())
+        except ValueError:
+            continue
+    return None
+
+
+def _int(value, default=0):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def typed_metadata(meta: dict) -> dict:
+    """Return a copy of `meta` with schema fields coerced.  Idempotent."""
+    out = dict(meta)
+    if "authority_tier" in out:
+        # Never 0: an unknown tier would pass every `$lte` tier filter
+        tier = _int(out["authority_tier"])
+        out["authority_tier"] = tier if 1 <= tier <= 3 else derive_authority_tier(out)
+    if "relevance_score" in out:
+        out["relevance_score"] = _float(out["relevance_score"])
+    if "chunk_index" in out:
+        out["chunk_index"] = _int(out["chunk_index"])
+    if "cfr_title" in out:
+        out["cfr_title"] = _int(out["cfr_title"])
+    if "market_standard_from" in out:
+        parsed = parse_epoch_day(out["market_standard_from"], DATE_MIN)
+        out["market_standard_from"] = DATE_MIN if parsed is None else parsed
+    if "deprecated_on" in out:
+        # An unreadable deprecation date is treated as already deprecated rather
+        # than silently serving possibly-obsolete law
+        parsed = parse_epoch_day(out["deprecated_on"], DATE_MAX)
+        out["deprecated_on"] = DATE_MIN if parsed is None else parsed
+    # v3 validity interval; an explicit valid_to is only ever shortened by deprecated_on
+    parsed = parse_epoch_day(out.get("valid_from", out.get("market_standard_from")), DATE_MIN)
+    out["valid_from"] = DATE_MIN if parsed is None else parsed
+    parsed = parse_epoch_day(out.get("valid_to"), DATE_MAX)
+    out["valid_to"] = min(DATE_MIN if parsed is None else parsed, out.get("deprecated_on", DATE_MAX))
+    # Chunks without a `date` (the Python seeder) keep the published_on they carry
+    parsed = parse_epoch_day(out.get("date") or out.get("published_on"), DATE_MAX)
+    out["published_on"] = DATE_MAX if parsed is None else parsed
+    return out
+
+
+def derive_authority_tier(meta: dict) -> int:
+    """Python port of deriveAuthorityTier (lib/rag/chunker.ts) for legacy chunks."""
+    src = str(meta.get("source", "")).lower()
+    dtype = str(meta.get("document_type", "")).lower()
+    url = str(meta.get("url", "")).lower()
+
+    if (
+        any(s in src for s in ("ecfr", "federal_register", "usc", "scotus"))
+        or any(d in dtype for d in ("statute", "regulation", "case_law", "official_guidance", "final_rule"))
+        or any(u in url for u in ("ecfr.gov", "federalregister.gov", "law.cornell.edu", "supremecourt.gov", "congress.gov"))
+        or (".gov" in url and "blog" not in url)
+    ):
+        return 1
+    if (
+        any(d in dtype for d in ("advisory", "whitepaper", "industry_standard", "template", "guidance"))
+        or "aba" in src
+        or any(u in url for u in ("americanbar.org", "nolo.com", "justia.com"))
+    ):
+        return 2
+    return 3
+
+
+# ---------------------------------------------------------------------------
+# Migration
+# ---------------------------------------------------------------------------
+
+def migrate_collection(col, page_size=MIGRATION_PAGE_SIZE, dry_run=False):
+    """
+    Rewrite every chunk's metadata to the current schema via metadata-only `update`
+    calls — embeddings and documents are never read or re-sent.
+    """
+    total = col.count()
+    scanned = changed = 0
+    start = time.perf_counter()
+    for offset in range(0, total, page_size):
+        page = col.get(limit=page_size, offset=offset, include=["metadatas"])
+        ids, metas = [], []
+        for id_, meta in zip(page["ids"], page["metadatas"]):
+            typed = typed_metadata(meta or {})
+            if typed != meta:
+                ids.append(id_)
+                metas.append(typed)
+        if ids and not dry_run:
+            col.update(ids=ids, metadatas=metas)
+        scanned += len(page["ids"])
+        changed += len(ids)
+        rate = scanned / max(time.perf_counter() - start, 1e-9)
+        print(f"  {scanned}/{total} scanned, {changed} rewritten ({rate:.0f} rows/s)")
+    if not dry_run:
+        set_collection_metadata(col, metadata_schema=METADATA_SCHEMA_VERSION)
+    return {"scanned": scanned, "changed": changed, "seconds": time.perf_counter() - start}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Typed metadata schema tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    m = sub.add_parser("migrate", help="rewrite a collection's metadata to the typed schema in place")
+    m.add_argument("--collection", default=COLLECTION_NAME)
+    m.add_argument("--page-size", type=int, default=MIGRATION_PAGE_SIZE)
+    m.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    col = get_chroma().get_collection(name=args.collection)
+    print(f"\n=== Migrating '{args.collection}' to metadata schema v{METADATA_SCHEMA_VERSION}"
+          f"{' (dry run)' if args.dry_run else ''} ===\n")
+    result = migrate_collection(col, page_size=args.page_size, dry_run=args.dry_run)
+    print(f"\n=== Done: {result['changed']}/{result['scanned']} chunks rewritten "
+          f"in {result['seconds']:.1f}s ===\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Parent-document store: every source document once, compressed, keyed by doc_id.
+
+Chunks overlap their neighbours (400 of every 2000 characters by default),
+and expanding a hit to its surrounding section used to mean more vector
+queries.  The seeder now stores each document's full text here, and every
+chunk records `start`/`end` offsets into it plus `prev_chunk_id` /
+`next_chunk_id`.  The runtime merges adjacent or overlapping hits from the
+same document into one span and reads the exact text, padded with context if
+wanted, with one local lookup (lib/rag/parent-store.ts).
+
+Layout (.rag/parents/), readable without SQLite from Node:
+  index.json   {version, documents: {doc_id: [offset, length, chars, title]}}
+  blobs.bin    zlib streams, one per document, appended; index.json points
+               at the live one (superseded blobs are dead space until compact)
+
+Run:
+  python3 scripts/parent_store.py stats
+  python3 scripts/parent_store.py get seed-safe-notes --start 0 --end 400
+  python3 scripts/parent_store.py compact
+"""
+
+import argparse, json, os, sys, zlib
+from pathlib import Path
+
+from seed_legal_concepts import ARTIFACT_DIR
+
+DEFAULT_PARENT_DIR = ARTIFACT_DIR / "parents"
+STORE_VERSION = 1
+COMPRESSION_LEVEL = 9
+
+
+class ParentStore:
+    def __init__(self, path: Path = DEFAULT_PARENT_DIR):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.path / "index.json"
+        self.blob_path = self.path / "blobs.bin"
+        self.documents = {}
+        if self.index_path.exists():
+            self.documents = json.loads(self.index_path.read_text())["documents"]
+        self._blobs = open(self.blob_path, "a+b")
+        self._dirty = False
+
+    def close(self):
+        self.save()
+        self._blobs.close()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def save(self):
+        """Write index.json atomically (after flushing blobs, so it never points past the end)."""
+        if not self._dirty:
+            return
+        self._blobs.flush()
+        os.fsync(self._blobs.fileno())
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": STORE_VERSION, "documents": self.documents}))
+        tmp.replace(self.index_path)
+        self._dirty = False
+
+    def reset(self):
+        self.documents = {}
+        self._blobs.truncate(0)
+        self._dirty = True
+        self.save()
+
+    def put(self, doc_id: str, text: str, title: str = ""):
+        current = self.documents.get(doc_id)
+        if current is not None and current[2] == len(text) and self.get(doc_id) == text:
+            if current[3] != title:
+                current[3] = title
+                self._dirty = True
+            return
+        blob = zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+        self._blobs.seek(0, os.SEEK_END)
+        offset = self._blobs.tell()
+        self._blobs.write(blob)
+        self.documents[doc_id] = [offset, len(blob), len(text), title]
+        self._dirty = True
+
+    def delete(self, doc_id: str):
+        if self.documents.pop(doc_id, None) is not None:
+            self._dirty = True
+
+    def get(self, doc_id: str):
+        entry = self.documents.get(doc_id)
+        if entry is None:
+            return None
+        offset, length = entry[0], entry[1]
+        self._blobs.flush()
+        self._blobs.seek(offset)
+        return zlib.decompress(self._blobs.read(length)).decode("utf-8")
+
+    def span(self, doc_id: str, start: int, end: int, pad: int = 0):
+        text = self.get(doc_id)
+        if text is None or start < 0:
+            return None
+        return text[max(0, start - pad) : min(len(text), end + pad)]
+
+    def stats(self) -> dict:
+        self._blobs.flush()
+        live = sum(e[1] for e in self.documents.values())
+        return {
+            "documents": len(self.documents),
+            "chars": sum(e[2] for e in self.documents.values()),
+            "compressed_bytes": live,
+            "dead_bytes": self.blob_path.stat().st_size - live,
+        }
+
+    def compact(self) -> int:
+        """Rewrite blobs.bin with only the live blobs; returns bytes reclaimed."""
+        before = self.blob_path.stat().st_size
+        tmp = self.blob_path.with_suffix(".tmp")
+        documents = {}
+        with open(tmp, "wb") as out:
+            for doc_id, (offset, length, chars, title) in self.documents.items():
+                self._blobs.seek(offset)
+                documents[doc_id] = [out.tell(), length, chars, title]
+                out.write(self._blobs.read(length))
+        self._blobs.close()
+        tmp.replace(self.blob_path)
+        self._blobs = open(self.blob_path, "a+b")
+        self.documents, self._dirty = documents, True
+        self.save()
+        return before - self.blob_path.stat().st_size
+
+
+def merge_spans(hits: list, gap: int = 0) -> list:
+    """
+    Merge (doc_id, start, end) hits that overlap or sit within `gap` characters
+    of each other into [(doc_id, start, end), ...], in order of each merged
+    span's best (first-listed) hit.  Hits without offsets (start < 0) are kept as-is.
+    """
+    by_doc, order = {}, []
+    for rank, (doc_id, start, end) in enumerate(hits):
+        if start < 0:
+            order.append((rank, (doc_id, start, end)))
+            continue
+        by_doc.setdefault(doc_id, []).append((start, end, rank))
+    for doc_id, spans in by_doc.items():
+        spans.sort()
+        cur_start, cur_end, cur_rank = spans[0]
+        for start, end, rank in spans[1:]:
+            if start <= cur_end + gap:
+                cur_end, cur_rank = max(cur_end, end), min(cur_rank, rank)
+            else:
+                order.append((cur_rank, (doc_id, cur_start, cur_end)))
+                cur_start, cur_end, cur_rank = start, end, rank
+        order.append((cur_rank, (doc_id, cur_start, cur_end)))
+    return [span for _, span in sorted(order, key=lambda x: x[0])]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the parent-document store.")
+    parser.add_argument("--path", type=Path, default=DEFAULT_PARENT_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="document count, raw vs compressed size")
+    g = sub.add_parser("get", help="print a document, or a span of it")
+    g.add_argument("doc_id")
+    g.add_argument("--start", type=int, default=0)
+    g.add_argument("--end", type=int)
+    g.add_argument("--pad", type=int, default=0)
+    sub.add_parser("compact", help="drop superseded blobs")
+    args = parser.parse_args(argv)
+
+    store = ParentStore(args.path)
+    try:
+        if args.command == "stats":
+            s = store.stats()
+            ratio = s["chars"] / s["compressed_bytes"] if s["compressed_bytes"] else 0
+            print(f"{s['documents']} documents, {s['chars']} chars → {s['compressed_bytes'] / 1024:.1f} KB "
+                  f"compressed ({ratio:.1f}x); {s['dead_bytes'] / 1024:.1f} KB reclaimable by compact")
+        elif args.command == "get":
+            text = store.get(args.doc_id)
+            if text is None:
+                raise SystemExit(f"No document {args.doc_id!r} in {args.path}")
+            print(store.span(args.doc_id, args.start, len(text) if args.end is None else args.end, args.pad))
+        else:
+            print(f"Reclaimed {store.compact() / 1024:.1f} KB")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Metadata-only bulk patch for chunks in a Chroma collection.  Never re-embeds.
+
+Selects chunks by id prefix and/or a Chroma `where` filter, applies field
+updates through paginated `update(ids, metadatas)` calls, and skips rows that
+already carry the target values, so re-running a patch is a no-op.  Values go
+through the typed schema (metadata_schema.typed_metadata).  Date fields take
+"YYYY", "YYYY-MM" or "YYYY-MM-DD", or DATE_MIN / DATE_MAX ("since forever" /
+"never").  Setting deprecated_on moves valid_to with it, so
+`deprecated_on=DATE_MAX` reopens a deprecated chunk; versions already closed
+by a newer version are only ever shortened.  The lexical sidecar's filter
+columns are kept in step.
+
+Run:
+  # Deprecate a document, and undo it
+  python3 scripts/patch_metadata.py --id-prefix seed-privacy-law-overview- --set deprecated_on=2025-01-01
+  python3 scripts/patch_metadata.py --id-prefix seed-privacy-law-overview- --set deprecated_on=DATE_MAX
+  # Retier everything from one source
+  python3 scripts/patch_metadata.py --where '{"source": "federal_register"}' --set authority_tier=1
+  # Backfill tiers on legacy chunks that legalSearch would otherwise derive at runtime
+  python3 scripts/patch_metadata.py --backfill-tier
+"""
+
+import argparse, json, re, sys, time
+
+from lexical_index import DEFAULT_LEXICAL_PATH, LexicalIndex
+from metadata_schema import DATE_FIELDS, DATE_MAX, DATE_MIN, derive_authority_tier, parse_epoch_day, typed_metadata
+from seed_legal_concepts import COLLECTION_NAME, get_chroma
+
+PATCH_PAGE_SIZE = 500
+_DATE = re.compile(r"^\d{4}(-\d{2}(-\d{2})?)?$")
+
+
+def parse_assignment(text: str):
+    """
+    'key=value' → (key, value).  Date fields become epoch days; other values
+    are parsed as JSON when possible, else kept as a string.
+    """
+    key, sep, raw = text.partition("=")
+    key = key.strip()
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected key=value, got {text!r}")
+    if key in DATE_FIELDS:
+        raw = raw.strip()
+        value = {"DATE_MIN": DATE_MIN, "DATE_MAX": DATE_MAX}.get(raw)
+        if value is None and _DATE.match(raw):
+            value = parse_epoch_day(raw, None)
+        if value is None:
+            raise argparse.ArgumentTypeError(f"{key}: expected YYYY[-MM[-DD]], DATE_MIN or DATE_MAX, got {raw!r}")
+        return key, value
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        value = raw
+    return key, value
+
+
+def _valid_to(old: dict, patched: dict, fields: dict) -> int:
+    """
+    valid_to after a patch.  An explicit valid_to wins.  A new deprecated_on
+    replaces the end of an interval that deprecation closed (so DATE_MAX
+    reopens it), and only shortens one that a newer version closed.
+    """
+    if "valid_to" in fields:
+        return fields["valid_to"]
+    if "deprecated_on" in fields and old["valid_to"] >= old.get("deprecated_on", DATE_MAX):
+        return patched["deprecated_on"]
+    return patched["valid_to"]
+
+
+def select_ids(col, id_prefix=None, where=None, page_size=PATCH_PAGE_SIZE) -> list:
+    """
+    Collect matching ids up front (ids only, no metadata).  Paging the filter
+    while patching would skip rows whenever the patch moves them out of `where`.
+    """
+    ids = []
+    offset = 0
+    while True:
+        page = col.get(where=where, limit=page_size, offset=offset, include=[])
+        if not page["ids"]:
+            break
+        ids.extend(i for i in page["ids"] if not id_prefix or i.startswith(id_prefix))
+        offset += len(page["ids"])
+    return ids
+
+
+def patch_metadata(col, ids, fields=None, backfill_tier=False, page_size=PATCH_PAGE_SIZE,
+                   dry_run=False, lexical=None):
+    fields = fields or {}
+    scanned = changed = 0
+    start = time.perf_counter()
+    for i in range(0, len(ids), page_size):
+        page = col.get(ids=ids[i : i + page_size], include=["metadatas"])
+        upd_ids, upd_metas = [], []
+        for id_, meta in zip(page["ids"], page["metadatas"]):
+            meta = meta or {}
+            patched = {**meta, **fields}
+            if backfill_tier and not patched.get("authority_tier"):
+                patched["authority_tier"] = derive_authority_tier(patched)
+            patched = typed_metadata(patched)
+            patched["valid_to"] = _valid_to(typed_metadata(meta), patched, fields)
+            if patched != meta:
+                upd_ids.append(id_)
+                upd_metas.append(patched)
+        if upd_ids and not dry_run:
+            col.update(ids=upd_ids, metadatas=upd_metas)
+            if lexical is not None:
+                lexical.update_metadata(upd_ids, upd_metas)
+        scanned += len(page["ids"])
+        changed += len(upd_ids)
+        rate = scanned / max(time.perf_counter() - start, 1e-9)
+        print(f"  {scanned}/{len(ids)} scanned, {changed} patched ({rate:.0f} rows/s)")
+    return {"scanned": scanned, "changed": changed, "seconds": time.perf_counter() - start}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-patch chunk metadata without re-embedding.")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--id-prefix", help="only chunks whose id starts with this")
+    parser.add_argument("--where", type=json.loads, help="Chroma where filter as JSON")
+    parser.add_argument("--set", dest="fields", type=parse_assignment, action="append", default=[],
+                        metavar="KEY=VALUE", help="field to set (repeatable)")
+    parser.add_argument("--backfill-tier", action="store_true",
+                        help="derive authority_tier for chunks that have none")
+    parser.add_argument("--page-size", type=int, default=PATCH_PAGE_SIZE)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not args.fields and not args.backfill_tier:
+        parser.error("nothing to do: pass --set KEY=VALUE and/or --backfill-tier")
+
+    col = get_chroma().get_collection(name=args.collection)
+    lexical = None
+    if args.collection == COLLECTION_NAME and DEFAULT_LEXICAL_PATH.exists():
+        lexical = LexicalIndex()
+
+    print(f"\n=== Patching '{args.collection}'{' (dry run)' if args.dry_run else ''} ===\n")
+    ids = select_ids(col, args.id_prefix, args.where, args.page_size)
+    print(f"  {len(ids)} chunks selected")
+    result = patch_metadata(col, ids, dict(args.fields), args.backfill_tier, args.page_size,
+                            args.dry_run, lexical)
+    if lexical is not None:
+        lexical.close()
+    print(f"\n=== Done: {result['changed']}/{result['scanned']} chunks patched "
+          f"in {result['seconds']:.2f}s ===\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Pre-embedded query table for high-traffic phrasings.
+
+Built at seed time from every document title, every Markdown heading in the
+corpus and a list of common questions (common_queries.json).  The runtime
+checks it before calling OpenAI (lib/rag/query-cache.ts, used by embedQuery),
+so the most frequent first searches skip the embedding round trip.
+
+Layout (.rag/query-cache/):
+  index.json    {model, dimensions, keys: [normalized query, ...], built_at}
+  vectors.f32   float32 little-endian, row i = keys[i]
+
+Keys are normalized with normalize_query; lib/rag/query-cache.ts applies the
+same rules.
+
+Run:
+  python3 scripts/query_cache.py build
+  python3 scripts/query_cache.py build --common-queries my_questions.json
+  python3 scripts/query_cache.py lookup "What is a SAFE note?"
+"""
+
+import argparse, json, os, re, sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from seed_legal_concepts import _HEADING, ARTIFACT_DIR, EMBEDDING_DIMENSIONS, EMBEDDING_MODEL, LEGAL_CONCEPTS
+
+DEFAULT_QUERY_CACHE_DIR = ARTIFACT_DIR / "query-cache"
+DEFAULT_COMMON_QUERIES_PATH = Path(__file__).parent / "common_queries.json"
+
+_WS = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[?.!]+$")
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, collapse whitespace, drop trailing ?.! — mirrors normalizeQuery in lib/rag/query-cache.ts."""
+    return _TRAILING_PUNCT.sub("", _WS.sub(" ", text.lower()).strip()).strip()
+
+
+def load_common_queries(path: Path = DEFAULT_COMMON_QUERIES_PATH) -> list:
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else []
+
+
+def document_phrasings(docs: list) -> list:
+    """Each document's title and the text of its Markdown headings."""
+    out = []
+    for doc in docs:
+        out.append(doc["title"])
+        for line in doc["content"].splitlines():
+            m = _HEADING.match(line.strip())
+            if m:
+                out.append(m.group(2))
+    return out
+
+
+def build_query_cache(docs=LEGAL_CONCEPTS, questions=(), path: Path = DEFAULT_QUERY_CACHE_DIR,
+                      model=EMBEDDING_MODEL, dimensions=EMBEDDING_DIMENSIONS) -> dict:
+    from embedding_cache import EmbeddingCache, truncate_dimensions
+
+    phrasings = {}
+    for text in [*questions, *document_phrasings(docs)]:
+        key = normalize_query(text)
+        if key:
+            phrasings.setdefault(key, text)
+
+    # Through the on-disk embedding cache, so reseeding re-embeds only new phrasings
+    cache = EmbeddingCache()
+    keys = list(phrasings)
+    vectors = truncate_dimensions(cache.embed(list(phrasings.values()), model=model), dimensions)
+    hits, misses = cache.hits, cache.misses
+    cache.close()
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    # Each file replaced atomically, index.json last: the runtime reloads when either changes
+    np.ascontiguousarray(vectors, dtype="<f4").tofile(path / "vectors.f32.tmp")
+    os.replace(path / "vectors.f32.tmp", path / "vectors.f32")
+    (path / "index.json.tmp").write_text(json.dumps({
+        "model": model,
+        "dimensions": int(vectors.shape[1]) if len(keys) else 0,
+        "keys": keys,
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }))
+    os.replace(path / "index.json.tmp", path / "index.json")
+    return {"entries": len(keys), "embedded": misses, "cached": hits, "bytes": vectors.nbytes, "path": path}
+
+
+class QueryCache:
+    def __init__(self, keys: list, vectors: np.ndarray, model=EMBEDDING_MODEL):
+        self.model = model
+        self.vectors = vectors
+        self.rows = {k: i for i, k in enumerate(keys)}
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_QUERY_CACHE_DIR):
+        path = Path(path)
+        index = json.loads((path / "index.json").read_text())
+        vectors = np.fromfile(path / "vectors.f32", dtype="<f4")
+        vectors = vectors.reshape(len(index["keys"]), index["dimensions"]) if index["keys"] else vectors
+        return cls(index["keys"], vectors, index["model"])
+
+    def get(self, text: str, model=EMBEDDING_MODEL):
+        if model != self.model:
+            return None
+        row = self.rows.get(normalize_query(text))
+        return None if row is None else self.vectors[row]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the pre-embedded query table.")
+    parser.add_argument("--path", type=Path, default=DEFAULT_QUERY_CACHE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="embed titles, headings and common questions")
+    b.add_argument("--common-queries", type=Path, default=DEFAULT_COMMON_QUERIES_PATH)
+    lk = sub.add_parser("lookup", help="check whether a query is pre-embedded")
+    lk.add_argument("query")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        result = build_query_cache(LEGAL_CONCEPTS, load_common_queries(args.common_queries), args.path)
+        print(f"Query cache: {result['entries']} phrasings ({result['embedded']} newly embedded), "
+              f"{result['bytes'] / 1024:.0f} KB → {result['path']}")
+    else:
+        vec = QueryCache.load(args.path).get(args.query)
+        print(f"{normalize_query(args.query)!r}: " + ("hit" if vec is not None else "miss"))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Re-embed an existing collection with a new embedding model into a shadow collection.
+
+Switching models used to mean re-fetching every source and re-seeding.  The
+collection already holds each chunk's text and metadata, so this pages
+through it (ids, documents and metadatas only, never the old vectors; memory
+is bounded by --page-size), re-embeds the text in batches under a
+requests/second and tokens/minute limit, and upserts into a shadow
+collection, "<collection>-<model>[-<dimensions>]" by default.  The live
+collection keeps serving until `promote`.
+
+Progress (the offset of the last page written) is saved after every page to
+.rag/reembed/<shadow>.json, so an interrupted run resumes where it stopped;
+`--restart` drops the shadow and starts over.  The shadow collection's
+metadata records embedding_model, embedding_dimensions and reembedded_from
+alongside the source's own keys (token stats, metadata_mode, ...), and the
+shadow is created with the source's HNSW settings.
+
+`promote` renames the source to "<collection>-<old model>", the shadow to
+"<collection>", and rebuilds the document centroids and query cache with the
+new model.  Set EMBEDDING_MODEL / EMBEDDING_DIMENSIONS for the app and the
+seeding tools afterwards so queries and new chunks use the same model.
+
+Run:
+  python3 scripts/reembed.py run --model text-embedding-3-large --dimensions 1024 --rps 5 --tpm 1000000
+  python3 scripts/reembed.py status --model text-embedding-3-large --dimensions 1024
+  python3 scripts/reembed.py promote --model text-embedding-3-large --dimensions 1024
+"""
+
+import argparse, json, re, sys, time
+from collections import deque
+from datetime import datetime, timezone
+
+from seed_legal_concepts import (
+    ARTIFACT_DIR, COLLECTION_NAME, embed_texts, get_chroma, get_embedding_function, set_collection_metadata,
+)
+
+PROGRESS_DIR = ARTIFACT_DIR / "reembed"
+PAGE_SIZE = 500
+REQUEST_BATCH = 100
+RETRIES = 5
+# Collections seeded before embedding_model was recorded in their metadata
+LEGACY_MODEL = "text-embedding-3-small"
+# Token estimate for chunks written before token_count was stored
+CHARS_PER_TOKEN = 4
+# Collection configuration → the creation-time metadata keys that set it
+HNSW_KEYS = {"space": "hnsw:space", "max_neighbors": "hnsw:M", "ef_construction": "hnsw:construction_ef",
+             "ef_search": "hnsw:search_ef"}
+
+
+def shadow_name(collection: str, model: str, dimensions=None) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", model.lower()).strip("-")
+    return f"{collection}-{slug}" + (f"-{dimensions}" if dimensions else "")
+
+
+def index_settings(col) -> dict:
+    """The source's HNSW settings as hnsw:* metadata, so the shadow is built with the same index profile."""
+    hnsw = (col.configuration_json or {}).get("hnsw") or {}
+    return {key: hnsw[name] for name, key in HNSW_KEYS.items() if hnsw.get(name) is not None}
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting and progress
+# ---------------------------------------------------------------------------
+
+
+class Throttle:
+    """Blocking limiter: at most `rps` requests per second and `tpm` tokens per rolling minute."""
+
+    def __init__(self, rps=None, tpm=None):
+        self.interval = 1.0 / rps if rps else 0.0
+        self.tpm = tpm
+        self.next_at = 0.0
+        self.window = deque()  # (monotonic time, tokens) of requests in the last minute
+        self.used = 0
+        self.waited = 0.0
+
+    def _sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+            self.waited += seconds
+
+    def wait(self, tokens: int):
+        if self.interval:
+            now = time.monotonic()
+            self._sleep(self.next_at - now)
+            self.next_at = max(now, self.next_at) + self.interval
+        if self.tpm:
+            while True:
+                now = time.monotonic()
+                while self.window and self.window[0][0] <= now - 60:
+                    self.used -= self.window.popleft()[1]
+                # A single request over the budget still goes through once the window is empty
+                if not self.window or self.used + tokens <= self.tpm:
+                    break
+                self._sleep(self.window[0][0] + 60 - now)
+            self.window.append((time.monotonic(), tokens))
+            self.used += tokens
+
+
+class Progress:
+    """Resume state for one shadow collection, rewritten atomically after every page."""
+
+    def __init__(self, target: str):
+        self.path = PROGRESS_DIR / f"{target}.json"
+        self.state = json.loads(self.path.read_text()) if self.path.exists() else None
+
+    def start(self, **fields):
+        self.state = {"offset": 0, "rows": 0, "embedded": 0, "skipped": 0, "tokens": 0, "done": False,
+                      "started_at": now_iso(), **fields}
+        self.save()
+
+    def save(self):
+        self.state["updated_at"] = now_iso()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2))
+        tmp.replace(self.path)
+
+    def reset(self):
+        self.path.unlink(missing_ok=True)
+        self.state = None
+
+
+# ---------------------------------------------------------------------------
+# Re-embedding
+# ---------------------------------------------------------------------------
+
+
+def chunk_tokens(text: str, meta: dict) -> int:
+    return (meta or {}).get("token_count") or len(text) // CHARS_PER_TOKEN + 1
+
+
+def embed_with_retry(texts: list, model: str, dimensions, retries: int = RETRIES):
+    for attempt in range(retries + 1):
+        try:
+            return embed_texts(texts, model=model, dimensions=dimensions)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = 2 ** attempt
+            print(f"  embedding request failed ({e.__class__.__name__}: {e}); retrying in {delay}s")
+            time.sleep(delay)
+
+
+def open_shadow(source, target: str, model: str, dimensions):
+    chroma = get_chroma()
+    metadata = {
+        **index_settings(source),
+        **(source.metadata or {}),
+        "embedding_model": model,
+        "reembedded_from": source.name,
+        **({"embedding_dimensions": dimensions} if dimensions else {}),
+    }
+    shadow = chroma.get_or_create_collection(
+        name=target, metadata=metadata, embedding_function=get_embedding_function(model, dimensions),
+    )
+    existing = (shadow.metadata or {}).get("embedding_model")
+    if existing != model:
+        raise SystemExit(f"'{target}' holds {existing or 'unknown'} embeddings, not {model}; use --restart or --target")
+    return shadow
+
+
+def reembed(source, target: str, model: str, dimensions=None, page_size: int = PAGE_SIZE,
+            batch: int = REQUEST_BATCH, throttle: Throttle = None, restart: bool = False) -> dict:
+    progress = Progress(target)
+    if restart:
+        progress.reset()
+        try:
+            get_chroma().delete_collection(name=target)
+        except Exception:
+            pass
+    state = progress.state
+    if state and (state["model"], state["dimensions"]) != (model, dimensions):
+        raise SystemExit(f"{progress.path} is a {state['model']} run; use --restart to start over")
+    if state is None:
+        progress.start(source=source.name, target=target, model=model, dimensions=dimensions)
+        state = progress.state
+    elif state["done"]:
+        return state
+    else:
+        print(f"Resuming at offset {state['offset']} ({state['embedded']} chunks already embedded)")
+
+    shadow = open_shadow(source, target, model, dimensions)
+    throttle = throttle or Throttle()
+    total = source.count()
+    start = time.perf_counter()
+    embedded_at_start = state["embedded"]
+    while state["offset"] < total:
+        page = source.get(limit=page_size, offset=state["offset"], include=["documents", "metadatas"])
+        if not page["ids"]:
+            break
+        rows = [(i, d, m) for i, d, m in zip(page["ids"], page["documents"], page["metadatas"]) if d]
+        for i in range(0, len(rows), batch):
+            ids, texts, metas = zip(*rows[i : i + batch])
+            tokens = sum(chunk_tokens(t, m) for t, m in zip(texts, metas))
+            throttle.wait(tokens)
+            vectors = embed_with_retry(list(texts), model, dimensions)
+            shadow.upsert(ids=list(ids), embeddings=vectors, documents=list(texts),
+                          metadatas=[m or None for m in metas])
+            state["embedded"] += len(ids)
+            state["tokens"] += tokens
+            state["dimensions_stored"] = int(vectors.shape[1])
+        state["rows"] += len(page["ids"])
+        state["skipped"] += len(page["ids"]) - len(rows)
+        state["offset"] += len(page["ids"])
+        progress.save()
+        rate = (state["embedded"] - embedded_at_start) / max(time.perf_counter() - start, 1e-9)
+        print(f"  {state['offset']}/{total} rows, {state['embedded']} embedded ({rate:.0f}/s, "
+              f"{throttle.waited:.1f}s throttled)")
+
+    if shadow.count() != total - state["skipped"]:
+        print(f"Warning: '{target}' has {shadow.count()} chunks but '{source.name}' has {total} "
+              f"({state['skipped']} without text); the source changed during the run")
+    set_collection_metadata(shadow, embedding_model=model, reembedded_from=source.name,
+                            embedding_dimensions=state.get("dimensions_stored", dimensions or 0),
+                            reembedded_at=now_iso())
+    state["done"] = True
+    progress.save()
+    return state
+
+
+# ---------------------------------------------------------------------------
+# Promotion
+# ---------------------------------------------------------------------------
+
+
+def promote(collection: str, target: str, force: bool = False) -> dict:
+    from doc_centroids import build_centroids, centroid_collection_name
+
+    chroma = get_chroma()
+    source = chroma.get_collection(name=collection)
+    shadow = chroma.get_collection(name=target)
+    state = Progress(target).state or {}
+    if not force and not state.get("done"):
+        raise SystemExit(f"Re-embedding into '{target}' has not finished; run it first (or pass --force)")
+    if not force and shadow.count() != source.count():
+        raise SystemExit(f"'{target}' has {shadow.count()} chunks, '{collection}' has {source.count()} "
+                         f"(pass --force to promote anyway)")
+
+    meta = shadow.metadata or {}
+    model, dimensions = meta["embedding_model"], meta.get("embedding_dimensions") or None
+    retired = shadow_name(collection, (source.metadata or {}).get("embedding_model", LEGACY_MODEL))
+    if retired in {c.name for c in chroma.list_collections()}:
+        raise SystemExit(f"'{retired}' already exists; delete it before promoting")
+    source.modify(name=retired)
+    shadow.modify(name=collection)
+    print(f"Renamed '{collection}' → '{retired}' and '{target}' → '{collection}'")
+
+    result = {"model": model, "dimensions": dimensions, "retired": retired}
+    promoted = chroma.get_collection(name=collection)
+    from http_cache import DEFAULT_HTTP_CACHE_PATH, HttpCache
+    if DEFAULT_HTTP_CACHE_PATH.exists():
+        # Same documents under a new collection id: keep the source fingerprints
+        cache = HttpCache()
+        cache.bind(collection, str(promoted.id), keep=True)
+        cache.close()
+    docs_name = centroid_collection_name(collection)
+    if docs_name in {c.name for c in chroma.list_collections()}:
+        r = build_centroids(promoted)
+        set_collection_metadata(chroma.get_collection(name=docs_name), embedding_model=model,
+                                embedding_dimensions=dimensions or 0)
+        result["centroids"] = r["documents"]
+        print(f"Rebuilt {r['documents']} document centroids in '{docs_name}'")
+
+    from query_cache import DEFAULT_COMMON_QUERIES_PATH, DEFAULT_QUERY_CACHE_DIR, build_query_cache, load_common_queries
+    if DEFAULT_QUERY_CACHE_DIR.exists():
+        from seed_legal_concepts import LEGAL_CONCEPTS
+
+        r = build_query_cache(LEGAL_CONCEPTS, load_common_queries(DEFAULT_COMMON_QUERIES_PATH),
+                              model=model, dimensions=dimensions)
+        result["query_cache"] = r["entries"]
+        print(f"Rebuilt the query cache with {model} ({r['entries']} entries)")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-embed a collection with a new model into a shadow collection.")
+    parser.add_argument("command", choices=("run", "status", "promote"))
+    parser.add_argument("--collection", default=COLLECTION_NAME, help="source collection")
+    parser.add_argument("--model", required=True, help="new embedding model, e.g. text-embedding-3-large")
+    parser.add_argument("--dimensions", type=int, help="shorten text-embedding-3 vectors to this size")
+    parser.add_argument("--target", help="shadow collection (default: <collection>-<model>[-<dimensions>])")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="rows read from the source per page")
+    parser.add_argument("--batch", type=int, default=REQUEST_BATCH, help="texts per embedding request")
+    parser.add_argument("--rps", type=float, help="max embedding requests per second")
+    parser.add_argument("--tpm", type=int, help="max tokens per minute")
+    parser.add_argument("--restart", action="store_true", help="drop the shadow collection and progress first")
+    parser.add_argument("--force", action="store_true", help="promote even if counts differ or the run is unfinished")
+    args = parser.parse_args(argv)
+    target = args.target or shadow_name(args.collection, args.model, args.dimensions)
+
+    if args.command == "status":
+        state = Progress(target).state
+        if state is None:
+            print(f"No re-embedding run for '{target}'")
+            return
+        print(json.dumps(state, indent=2))
+        return
+    if args.command == "promote":
+        r = promote(args.collection, target, args.force)
+        dims = f" EMBEDDING_DIMENSIONS={r['dimensions']}" if r["dimensions"] else ""
+        print(f"\nDone. Set EMBEDDING_MODEL={r['model']}{dims} for the app and the seeding tools.")
+        return
+
+    source = get_chroma().get_collection(name=args.collection)
+    print(f"=== Re-embedding '{args.collection}' ({source.count()} chunks) with {args.model}"
+          f"{f' ({args.dimensions} dims)' if args.dimensions else ''} → '{target}' ===")
+    start = time.perf_counter()
+    state = reembed(source, target, args.model, args.dimensions, args.page_size, args.batch,
+                    Throttle(args.rps, args.tpm), args.restart)
+    print(f"\n'{target}': {state['embedded']} chunks, {state['tokens']:,} tokens "
+          f"({state['skipped']} without text skipped) in {time.perf_counter() - start:.1f}s")
+    print(f"Promote with: python3 scripts/reembed.py promote --model {args.model}"
+          f"{f' --dimensions {args.dimensions}' if args.dimensions else ''}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
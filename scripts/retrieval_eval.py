@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Retrieval evaluation and chunk-parameter sweep for the seeded legal corpus.
+
+For every (mode, chunk_size, overlap, dimensions) configuration the LEGAL_CONCEPTS
+corpus is re-chunked, embedded through the on-disk embedding cache (so unchanged
+chunks and queries are never re-embedded), and searched exactly with
+LocalIndex.  Each golden query lists the LEGAL_CONCEPTS ids that should answer it.
+
+Reports per configuration: recall@k, MRR, chunk count, embedding token cost and
+query latency.
+
+Run:
+  python3 scripts/retrieval_eval.py
+  python3 scripts/retrieval_eval.py --chunk-sizes 1000,2000,3000 --overlaps 0,200,400 \\
+      --dimensions 512,1536 --modes recursive,markdown --json .rag/sweep.json
+"""
+
+import argparse, json, sys, time
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache, truncate_dimensions
+from local_search import LocalIndex
+from seed_legal_concepts import (
+    CHUNK_MODES, CHUNK_OVERLAP, CHUNK_OVERLAP_TOKENS, CHUNK_SIZE, CHUNK_SIZE_TOKENS, CHUNK_UNITS,
+    EMBEDDING_MODEL, LEGAL_CONCEPTS, chunk_text, token_measure,
+)
+
+DEFAULT_GOLDEN_PATH = Path(__file__).parent / "golden_queries.json"
+DEFAULT_KS = (1, 3, 5, 8)
+# USD per 1M input tokens
+PRICE_PER_1M_TOKENS = {
+    "text-embedding-3-small": 0.02,
+    "text-embedding-3-large": 0.13,
+    "text-embedding-ada-002": 0.10,
+}
+
+
+def load_golden(path: Path) -> list:
+    golden = json.loads(Path(path).read_text())
+    known = {doc["id"] for doc in LEGAL_CONCEPTS}
+    for item in golden:
+        unknown = set(item["relevant"]) - known
+        if unknown:
+            raise ValueError(f"Golden query {item['query']!r} references unknown ids: {sorted(unknown)}")
+    return golden
+
+
+def build_chunks(chunk_size: int, overlap: int, mode: str = "recursive", unit: str = "chars") -> list:
+    chunks = []
+    for doc in LEGAL_CONCEPTS:
+        meta = {"doc_id": doc["id"]}
+        for c in chunk_text(doc["content"].strip(), meta, chunk_size=chunk_size, overlap=overlap, mode=mode,
+                            unit=unit):
+            c["id"] = f"seed-{doc['id']}-chunk-{c['metadata']['chunk_index']}"
+            chunks.append(c)
+    return chunks
+
+
+def score_ranking(ranked_doc_ids: list, relevant: set, ks) -> dict:
+    """recall@k over the documents of the top-k chunks, and reciprocal rank of the first relevant chunk."""
+    scores = {}
+    for k in ks:
+        found = relevant.intersection(ranked_doc_ids[:k])
+        scores[f"recall@{k}"] = len(found) / len(relevant)
+    rr = 0.0
+    for rank, doc_id in enumerate(ranked_doc_ids, start=1):
+        if doc_id in relevant:
+            rr = 1.0 / rank
+            break
+    scores["mrr"] = rr
+    return scores
+
+
+def evaluate(chunk_size, overlap, dimensions, golden, cache, ks=DEFAULT_KS, model=EMBEDDING_MODEL,
+             mode="recursive", unit="chars"):
+    chunks = build_chunks(chunk_size, overlap, mode, unit)
+    texts = [c["text"] for c in chunks]
+    tokens = sum(token_measure(model).count(t) for t in texts)
+
+    vectors = truncate_dimensions(cache.embed(texts, model=model), dimensions)
+    index = LocalIndex([c["id"] for c in chunks], vectors, texts, [c["metadata"] for c in chunks])
+    query_vectors = truncate_dimensions(cache.embed([g["query"] for g in golden], model=model), dimensions)
+
+    totals = {f"recall@{k}": 0.0 for k in ks}
+    totals["mrr"] = 0.0
+    latencies = []
+    for item, qv in zip(golden, query_vectors):
+        start = time.perf_counter()
+        hits = index.search(qv, k=max(ks), tiers=None, include_deprecated=True)[0]
+        latencies.append((time.perf_counter() - start) * 1000)
+        ranked = [h["metadata"]["doc_id"] for h in hits]
+        for name, value in score_ranking(ranked, set(item["relevant"]), ks).items():
+            totals[name] += value
+
+    n = len(golden)
+    return {
+        "mode": mode,
+        "unit": unit,
+        "chunk_size": chunk_size,
+        "overlap": overlap,
+        "dimensions": vectors.shape[1],
+        **{name: value / n for name, value in totals.items()},
+        "chunks": len(chunks),
+        "chars": sum(len(t) for t in texts),
+        "tokens": tokens,
+        "embed_cost_usd": tokens / 1_000_000 * PRICE_PER_1M_TOKENS.get(model, 0.0),
+        "index_bytes": vectors.nbytes,
+        "latency_ms_mean": float(np.mean(latencies)),
+        "latency_ms_p95": float(np.percentile(latencies, 95)),
+    }
+
+
+def _int_list(value: str) -> list:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def print_table(rows: list, ks):
+    cols = ["mode", "unit", "chunk_size", "overlap", "dimensions", *[f"recall@{k}" for k in ks], "mrr",
+            "chunks", "tokens", "embed_cost_usd", "latency_ms_mean", "latency_ms_p95"]
+    print("  ".join(f"{c:>14}" for c in cols))
+    for row in rows:
+        cells = []
+        for c in cols:
+            v = row[c]
+            cells.append(f"{v:>14.4f}" if isinstance(v, float) else f"{v:>14}")
+        print("  ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep chunking/embedding parameters against a golden query set.")
+    parser.add_argument("--golden", type=Path, default=DEFAULT_GOLDEN_PATH)
+    parser.add_argument("--unit", choices=CHUNK_UNITS, default="chars", help="unit for sizes and overlaps")
+    parser.add_argument("--chunk-sizes", type=_int_list, help="default: 2000 chars / 500 tokens")
+    parser.add_argument("--overlaps", type=_int_list, help="default: 400 chars / 100 tokens")
+    parser.add_argument("--dimensions", type=_int_list, default=[0], help="0 = model default")
+    parser.add_argument("--modes", type=lambda v: v.split(","), default=["recursive"],
+                        help=f"comma-separated chunking modes ({', '.join(CHUNK_MODES)})")
+    parser.add_argument("--ks", type=_int_list, default=list(DEFAULT_KS))
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    golden = load_golden(args.golden)
+    cache = EmbeddingCache()
+    tokens = args.unit == "tokens"
+    chunk_sizes = args.chunk_sizes or [CHUNK_SIZE_TOKENS if tokens else CHUNK_SIZE]
+    overlaps = args.overlaps or [CHUNK_OVERLAP_TOKENS if tokens else CHUNK_OVERLAP]
+
+    print(f"\n=== Retrieval sweep: {len(golden)} golden queries, model {args.model} ===\n")
+    rows = []
+    for mode, chunk_size, overlap, dims in product(args.modes, chunk_sizes, overlaps, args.dimensions):
+        if overlap >= chunk_size:
+            print(f"  skip chunk_size={chunk_size} overlap={overlap} (overlap >= size)")
+            continue
+        rows.append(evaluate(chunk_size, overlap, dims, golden, cache, args.ks, args.model, mode, args.unit))
+
+    print()
+    print_table(rows, args.ks)
+    print(f"\nEmbedding cache: {cache.hits} hits, {cache.misses} misses")
+    cache.close()
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(rows, indent=2))
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
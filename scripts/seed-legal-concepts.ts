@@ -2,6 +2,8 @@ import 'dotenv/config';
 import { getOrCreateCollection, LEGAL_COLLECTION } from '../lib/rag/chroma';
 import { embedTexts } from '../lib/rag/embeddings';
 import { chunkText } from '../lib/rag/chunker';
+import { toTypedMetadata } from '../lib/rag/metadata-schema';
+import { updateDocumentCentroids } from '../lib/rag/doc-centroids';
 
 // ---------------------------------------------------------------------------
 // Curated foundational legal concepts — answers the questions users actually ask
@@ -834,6 +836,7 @@ export async function seedLegalConcepts(): Promise<number> {
   console.log('\n=== Seeding Foundational Legal Concepts ===\n');
   const collection = await getOrCreateCollection(LEGAL_COLLECTION);
   let totalChunks = 0;
+  const touched = new Set<string>();
 
   for (const doc of LEGAL_CONCEPTS) {
     console.log(`  Processing: ${doc.title}`);
@@ -850,13 +853,15 @@ export async function seedLegalConcepts(): Promise<number> {
       authority_tier: '2',
       market_standard_from: doc.date,
       deprecated_on: '',
+      // Chunk ids are "<doc_id>-chunk-<n>", as in scripts/seed_legal_concepts.py
+      doc_id: `seed-${doc.id}`,
     };
 
     const chunks = chunkText(doc.content.trim(), baseMetadata);
 
     const ids: string[] = chunks.map((_, i) => `seed-${doc.id}-chunk-${i}`);
     const texts = chunks.map((c) => c.text);
-    const metas = chunks.map((c) => c.metadata);
+    const metas = chunks.map((c) => toTypedMetadata(c.metadata));
 
     for (let i = 0; i < ids.length; i += BATCH_SIZE) {
       const batchIds = ids.slice(i, i + BATCH_SIZE);
@@ -873,9 +878,13 @@ export async function seedLegalConcepts(): Promise<number> {
     }
 
     totalChunks += chunks.length;
+    touched.add(`seed-${doc.id}`);
     console.log(`    → ${chunks.length} chunks indexed`);
   }
 
+  const centroids = await updateDocumentCentroids(collection, touched);
+  if (centroids > 0) console.log(`  Document centroids updated: ${centroids}`);
+
   console.log(`\n=== Seed Complete: ${totalChunks} chunks ===`);
   return totalChunks;
 }
@@ -2,14 +2,24 @@
 """
 Seed foundational legal concepts into ChromaDB using the native Python client.
 Generates embeddings via OpenAI text-embedding-3-small (same model as the TS code).
-Run: python3 scripts/seed_legal_concepts.py
+Run: python3 scripts/seed_legal_concepts.py [--chunking markdown] [--chunk-unit tokens | --token-counts]
+     python3 scripts/seed_legal_concepts.py --sharded [--industry saas]
+     python3 scripts/seed_legal_concepts.py --writers 4      # parallel Chroma upserts
+     python3 scripts/seed_legal_concepts.py --keep-history   # update in place, keep superseded versions
 
 This script:
   1. Deletes and recreates the legal-documents collection (to ensure clean EF config)
   2. Seeds 25+ foundational legal topic documents
+  3. Stores each document's full text once, compressed (parent_store.py)
+  4. Writes one centroid vector per document to legal-documents-docs (two-stage retrieval)
+  5. Pre-embeds titles, headings and common questions for the runtime query cache
+
+With --keep-history an existing collection is updated in place instead
+(seed_watch.py): changed chunks keep their old version under a closed
+valid_from/valid_to interval, and unchanged text is neither re-embedded nor duplicated.
 """
 
-import os, sys
+import base64, os, re, sys
 from pathlib import Path
 
 # Load .env from project root
@@ -22,67 +32,387 @@ if env_path.exists():
             os.environ.setdefault(k.strip(), v.strip().strip('"').strip("'"))
 
 import chromadb
+import numpy as np
 from openai import OpenAI
 from chromadb.utils.embedding_functions.openai_embedding_function import OpenAIEmbeddingFunction
 
 COLLECTION_NAME = "legal-documents"
-EMBEDDING_MODEL = "text-embedding-3-small"
+# `source` of seeded chunks; connectors and the ingest daemon write others
+SEED_SOURCE = "elle-legal-seed"
+# Overridable so a collection re-embedded with scripts/reembed.py can be kept
+# up to date with the same model (and, for text-embedding-3, dimensions)
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_DIMENSIONS = int(os.environ.get("EMBEDDING_DIMENSIONS") or 0) or None
 CHUNK_SIZE = 2000
 CHUNK_OVERLAP = 400
 BATCH_SIZE = 50
 
-openai_client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-chroma = chromadb.HttpClient(
-    host=os.environ.get("CHROMA_HOST", "localhost"),
-    port=int(os.environ.get("CHROMA_PORT", "8000")),
-)
+# Named HNSW presets applied when the seeder creates a collection
+# (benchmark them against exact search with scripts/hnsw_bench.py).
+# "balanced" matches Chroma's defaults.
+INDEX_PROFILES = {
+    "small": {"hnsw:M": 8, "hnsw:construction_ef": 64, "hnsw:search_ef": 32},
+    "balanced": {"hnsw:M": 16, "hnsw:construction_ef": 100, "hnsw:search_ef": 100},
+    "high-recall": {"hnsw:M": 32, "hnsw:construction_ef": 400, "hnsw:search_ef": 256},
+    "low-latency": {"hnsw:M": 12, "hnsw:construction_ef": 200, "hnsw:search_ef": 40},
+}
+
+ROOT_DIR = Path(__file__).parent.parent
+# Local side artifacts (snapshots, indexes, manifests) written by the seeding tools
+ARTIFACT_DIR = Path(os.environ.get("RAG_ARTIFACT_DIR", ROOT_DIR / ".rag"))
+
+# Clients are created lazily so companion scripts can import the chunker and
+# corpus without a running Chroma server or an OpenAI key.
+_openai_client = None
+_chroma = None
+
+
+def get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+    return _openai_client
+
+
+def new_chroma_client():
+    return chromadb.HttpClient(
+        host=os.environ.get("CHROMA_HOST", "localhost"),
+        port=int(os.environ.get("CHROMA_PORT", "8000")),
+    )
+
+
+def get_chroma():
+    global _chroma
+    if _chroma is None:
+        _chroma = new_chroma_client()
+    return _chroma
+
+
+def set_collection_metadata(col, **fields):
+    """Merge `fields` into a collection's metadata (hnsw:* keys are immutable once created)."""
+    merged = {k: v for k, v in (col.metadata or {}).items() if not k.startswith("hnsw:")}
+    merged.update(fields)
+    col.modify(metadata=merged)
+
 
-# Configure OpenAI embedding function so collection metadata is properly stored
-# (suppresses "No embedding function configuration found" warning)
-openai_ef = OpenAIEmbeddingFunction(
-    api_key=os.environ["OPENAI_API_KEY"],
-    model_name=EMBEDDING_MODEL,
-)
+def get_embedding_function(model=EMBEDDING_MODEL, dimensions=EMBEDDING_DIMENSIONS):
+    # Configure OpenAI embedding function so collection metadata is properly stored
+    # (suppresses "No embedding function configuration found" warning)
+    return OpenAIEmbeddingFunction(
+        api_key=os.environ["OPENAI_API_KEY"],
+        model_name=model,
+        dimensions=dimensions,
+    )
 
 # ---------------------------------------------------------------------------
 # Chunker
 # ---------------------------------------------------------------------------
 
-def chunk_text(text: str, metadata: dict, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
-    separators = ["\n\n", "\n", ". ", " "]
-
-    def split_recursive(t, seps):
-        if len(t) <= chunk_size:
-            return [t.strip()] if t.strip() else []
-        sep = seps[0]
-        rest = seps[1:]
-        parts = t.split(sep)
-        chunks, current = [], ""
-        for part in parts:
-            candidate = current + sep + part if current else part
-            if len(candidate) > chunk_size and current:
-                chunks.append(current.strip())
-                overlap_text = current[-overlap:] if len(current) > overlap else current
-                current = (overlap_text + sep + part) if overlap_text else part
-            else:
-                current = candidate
-        if current.strip():
+SEPARATORS = ["\n\n", "\n", ". ", " "]
+CHUNK_MODES = ("recursive", "markdown")
+CHUNK_UNITS = ("chars", "tokens")
+# Token-measured defaults (CHUNK_SIZE / CHUNK_OVERLAP are the character equivalents)
+CHUNK_SIZE_TOKENS = 500
+CHUNK_OVERLAP_TOKENS = 100
+# Prefix budgets whose character offsets are stored on every chunk, so the
+# runtime can cut excerpts to a token budget with text.slice(0, prefix_chars_N)
+TOKEN_PREFIXES = (64, 128, 256)
+# Metadata keys that describe a chunk rather than its document (a chunk's
+# validity interval differs from its document's once versions are kept)
+CHUNK_FIELDS = ("chunk_index", "heading_path", "token_count", *(f"prefix_chars_{n}" for n in TOKEN_PREFIXES),
+                "start", "end", "prev_chunk_id", "next_chunk_id", "valid_from", "valid_to",
+                # No longer written; concept_links.py backfill strips it from older chunks
+                "concept_spans")
+# Document fields the runtime filters on; the only document-level fields a
+# chunk keeps in compact metadata mode (the rest live once in <collection>-docs)
+FILTER_FIELDS = ("industry", "document_type", "jurisdiction", "authority_tier", "market_standard_from",
+                 "deprecated_on", "published_on")
+
+
+class CharMeasure:
+    """Chunk sizes in characters (the original behavior)."""
+
+    def count(self, text: str) -> int:
+        return len(text)
+
+    def tail(self, text: str, n: int) -> str:
+        return text[-n:]
+
+
+class TokenMeasure:
+    """
+    Chunk sizes in tokens of the embedding model's local tiktoken encoding
+    (cl100k_base, which every OpenAI embedding model uses, for a model name
+    tiktoken doesn't know).
+    """
+
+    def __init__(self, model=EMBEDDING_MODEL):
+        import tiktoken
+
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def tail(self, text: str, n: int) -> str:
+        tokens = self.encoding.encode(text, disallowed_special=())
+        # errors="ignore" drops a multi-byte character cut in half at the boundary
+        return self.encoding.decode(tokens[-n:], errors="ignore")
+
+    def annotate(self, text: str) -> dict:
+        """token_count plus, per TOKEN_PREFIXES budget, how many characters its first n tokens cover."""
+        tokens = self.encoding.encode(text, disallowed_special=())
+        out = {"token_count": len(tokens)}
+        for n in TOKEN_PREFIXES:
+            out[f"prefix_chars_{n}"] = (
+                len(text) if n >= len(tokens) else len(self.encoding.decode(tokens[:n], errors="ignore"))
+            )
+        return out
+
+
+CHARS = CharMeasure()
+_token_measures = {}
+
+
+def token_measure(model=EMBEDDING_MODEL) -> TokenMeasure:
+    if model not in _token_measures:
+        _token_measures[model] = TokenMeasure(model)
+    return _token_measures[model]
+
+
+def count_tokens(text: str, model=EMBEDDING_MODEL) -> int:
+    return token_measure(model).count(text)
+
+
+def split_recursive(t, seps, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP, measure=CHARS):
+    if measure.count(t) <= chunk_size:
+        return [t.strip()] if t.strip() else []
+    sep = seps[0]
+    rest = seps[1:]
+    parts = t.split(sep)
+    sep_len = measure.count(sep)
+    chunks, current, current_len = [], "", 0
+    for part in parts:
+        # Sizes are accumulated per part rather than re-measuring the whole
+        # candidate; for tokens the sum is a slight overestimate, never an under
+        part_len = measure.count(part)
+        candidate_len = current_len + sep_len + part_len if current else part_len
+        if candidate_len > chunk_size and current:
             chunks.append(current.strip())
-        if rest:
-            refined = []
-            for c in chunks:
-                if len(c) > chunk_size:
-                    refined.extend(split_recursive(c, rest))
-                else:
-                    refined.append(c)
-            return refined
-        return chunks
-
-    raw = split_recursive(text, separators)
+            overlap_text = measure.tail(current, overlap) if overlap > 0 else ""
+            if overlap_text:
+                current = overlap_text + sep + part
+                current_len = measure.count(overlap_text) + sep_len + part_len
+            else:
+                current, current_len = part, part_len
+        else:
+            current = current + sep + part if current else part
+            current_len = candidate_len
+    if current.strip():
+        chunks.append(current.strip())
+    if rest:
+        refined = []
+        for c in chunks:
+            if measure.count(c) > chunk_size:
+                refined.extend(split_recursive(c, rest, chunk_size, overlap, measure))
+            else:
+                refined.append(c)
+        return refined
+    return chunks
+
+
+def chunk_text(text: str, metadata: dict, chunk_size=None, overlap=None, mode="recursive", unit="chars",
+               token_counts=False):
+    """
+    Split `text` into chunks of at most `chunk_size` characters or, with
+    unit="tokens", embedding-model tokens (defaults CHUNK_SIZE_TOKENS /
+    CHUNK_OVERLAP_TOKENS).  Each chunk records its `start`/`end` character
+    offsets in `text` (-1 if not found verbatim) and its document's resolved
+    `source_url` (concept_links.py).  With unit="tokens" or
+    `token_counts`, it also records its exact `token_count` and
+    `prefix_chars_<n>` offsets (see TokenMeasure.annotate); character-mode
+    chunking otherwise never loads the tokenizer.
+    """
+    from concept_links import resolve_source_url
+
+    if unit not in CHUNK_UNITS:
+        raise ValueError(f"Unknown chunk unit {unit!r} (expected one of {CHUNK_UNITS})")
+    tokens = unit == "tokens"
+    measure = token_measure() if tokens else CHARS
+    if chunk_size is None:
+        chunk_size = CHUNK_SIZE_TOKENS if tokens else CHUNK_SIZE
+    if overlap is None:
+        overlap = CHUNK_OVERLAP_TOKENS if tokens else CHUNK_OVERLAP
+
+    if mode == "markdown":
+        result = chunk_markdown(text, metadata, chunk_size, overlap, measure)
+    elif mode == "recursive":
+        raw = split_recursive(text, SEPARATORS, chunk_size, overlap, measure)
+        result = []
+        for i, t in enumerate(raw):
+            if len(t) > 50:
+                result.append({"text": t, "metadata": {**metadata, "chunk_index": i}})
+    else:
+        raise ValueError(f"Unknown chunking mode {mode!r} (expected one of {CHUNK_MODES})")
+
+    counter = token_measure() if tokens or token_counts else None
+    source_url = resolve_source_url(metadata.get("url"))
+    cursor = 0
+    for c in result:
+        if counter is not None:
+            c["metadata"].update(counter.annotate(c["text"]))
+        c["metadata"]["source_url"] = source_url
+        # Chunks are in document order and overlapping ones start later, so search forward
+        start = text.find(c["text"], cursor)
+        if start < 0:
+            start = text.find(c["text"])
+        c["metadata"]["start"] = start
+        c["metadata"]["end"] = start + len(c["text"]) if start >= 0 else -1
+        cursor = start + 1 if start >= 0 else cursor
+    return result
+
+
+def compact_metadata(meta: dict) -> dict:
+    """Chunk metadata for compact mode: filter fields, doc_id and chunk-level fields only."""
+    return {k: v for k, v in meta.items() if k in FILTER_FIELDS or k in CHUNK_FIELDS or k == "doc_id"}
+
+
+def link_chunks(ids: list, chunks: list):
+    """Record prev/next chunk ids ("" at either end) on one document's chunks, in order."""
+    for i, c in enumerate(chunks):
+        c["metadata"]["prev_chunk_id"] = ids[i - 1] if i else ""
+        c["metadata"]["next_chunk_id"] = ids[i + 1] if i + 1 < len(ids) else ""
+
+
+def token_summary(counts: list) -> dict:
+    """Collection-level token statistics (stored in collection metadata by record_token_stats)."""
+    counts = np.asarray(counts or [0])
+    return {
+        "token_encoding": token_measure().encoding.name,
+        "tokens_total": int(counts.sum()),
+        "tokens_mean": round(float(counts.mean()), 1),
+        "tokens_p50": int(np.percentile(counts, 50)),
+        "tokens_p95": int(np.percentile(counts, 95)),
+        "tokens_max": int(counts.max()),
+    }
+
+
+def record_token_stats(col, page_size=1000) -> dict:
+    """
+    Summarize the token_count of every chunk in `col` into its collection
+    metadata; {} (and no tokenizer load) when no chunk stores one.
+    """
+    counts = []
+    for offset in range(0, col.count(), page_size):
+        page = col.get(limit=page_size, offset=offset, include=["metadatas"])
+        counts.extend(int(m["token_count"]) for m in page["metadatas"] if m and "token_count" in m)
+    if not counts:
+        return {}
+    stats = token_summary(counts)
+    set_collection_metadata(col, **stats)
+    return stats
+
+
+# ---------------------------------------------------------------------------
+# Markdown structure-aware chunker
+# ---------------------------------------------------------------------------
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+HEADING_PATH_SEP = " > "
+
+
+def _markdown_tree(text: str) -> dict:
+    """Parse Markdown into a heading tree of {level, path, lines, children} nodes."""
+    root = {"level": 0, "path": [], "lines": [], "children": []}
+    stack = [root]
+    for line in text.split("\n"):
+        m = _HEADING.match(line)
+        if not m:
+            stack[-1]["lines"].append(line)
+            continue
+        level = len(m.group(1))
+        while stack[-1]["level"] >= level:
+            stack.pop()
+        parent = stack[-1]
+        node = {
+            "level": level,
+            "path": parent["path"] + [m.group(2).strip()],
+            "lines": [line],
+            "children": [],
+        }
+        parent["children"].append(node)
+        stack.append(node)
+    return root
+
+
+def _node_text(node: dict) -> str:
+    parts = ["\n".join(node["lines"]).strip()]
+    parts.extend(_node_text(c) for c in node["children"])
+    return "\n\n".join(p for p in parts if p)
+
+
+def _common_path(paths: list) -> list:
+    common = paths[0]
+    for p in paths[1:]:
+        n = 0
+        while n < min(len(common), len(p)) and common[n] == p[n]:
+            n += 1
+        common = common[:n]
+    return common
+
+
+def _pack(pieces: list, chunk_size: int, measure=CHARS) -> list:
+    """Greedily merge consecutive (path, text) pieces while they fit in one chunk."""
+    joiner_len = measure.count("\n\n")
+    packed, group, group_len = [], [], 0
+    for path, text in pieces:
+        text_len = measure.count(text)
+        if group and group_len + joiner_len + text_len > chunk_size:
+            packed.append((_common_path([p for p, _ in group]), "\n\n".join(t for _, t in group)))
+            group, group_len = [], 0
+        group_len = group_len + joiner_len + text_len if group else text_len
+        group.append((path, text))
+    if group:
+        packed.append((_common_path([p for p, _ in group]), "\n\n".join(t for _, t in group)))
+    return packed
+
+
+def _section_pieces(node: dict, chunk_size: int, overlap: int, measure=CHARS) -> list:
+    whole = _node_text(node)
+    if measure.count(whole) <= chunk_size:
+        return [(node["path"], whole)] if whole else []
+    pieces = []
+    own = "\n".join(node["lines"]).strip()
+    if own:
+        # Only text that cannot fit inside one section is split with overlap
+        pieces.extend((node["path"], t) for t in split_recursive(own, SEPARATORS, chunk_size, overlap, measure))
+    for child in node["children"]:
+        pieces.extend(_section_pieces(child, chunk_size, overlap, measure))
+    return _pack(pieces, chunk_size, measure)
+
+
+def chunk_markdown(text: str, metadata: dict, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP, measure=CHARS):
+    """
+    Structure-aware chunking for Markdown: a section that fits is kept whole,
+    small sibling sections are packed together, and only oversized sections are
+    split (with overlap).  Each chunk records its `heading_path`, e.g.
+    "Business Entity Types > C-Corporation (C-Corp)".
+    """
+    pieces = _section_pieces(_markdown_tree(text), chunk_size, overlap, measure)
     result = []
-    for i, t in enumerate(raw):
+    for path, t in pieces:
         if len(t) > 50:
-            result.append({"text": t, "metadata": {**metadata, "chunk_index": str(i)}})
+            result.append({
+                "text": t,
+                "metadata": {
+                    **metadata,
+                    "chunk_index": len(result),
+                    "heading_path": HEADING_PATH_SEP.join(path),
+                },
+            })
     return result
 
 
@@ -90,13 +420,48 @@ def chunk_text(text: str, metadata: dict, chunk_size=CHUNK_SIZE, overlap=CHUNK_O
 # Embeddings
 # ---------------------------------------------------------------------------
 
-def embed_texts(texts: list) -> list:
-    all_embeddings = []
+# Running totals for the end-of-run memory report
+EMBED_STATS = {"vectors": 0, "dimensions": 0}
+
+
+def validate_embeddings(vectors: np.ndarray):
+    """Reject rows with NaN/inf or zero norm (vectorized over the whole batch)."""
+    finite = np.isfinite(vectors).all(axis=1)
+    norms = np.linalg.norm(np.where(finite[:, None], vectors, 0), axis=1)
+    bad = np.flatnonzero(~finite | (norms == 0))
+    if len(bad):
+        raise ValueError(f"{len(bad)} invalid embedding(s) (NaN/inf or zero norm) at rows {bad[:10].tolist()}")
+
+
+def embed_texts(texts: list, model=EMBEDDING_MODEL, dimensions=EMBEDDING_DIMENSIONS) -> np.ndarray:
+    """
+    Embed `texts` into one contiguous (n, dim) float32 matrix.  Embeddings are
+    requested base64-encoded and decoded with np.frombuffer, so no per-float
+    Python objects are created; Chroma accepts the array as-is.  `dimensions`
+    shortens text-embedding-3 vectors server-side.
+    """
+    out = None
+    extra = {"dimensions": dimensions} if dimensions else {}
     for i in range(0, len(texts), 2048):
         batch = texts[i:i + 2048]
-        resp = openai_client.embeddings.create(model=EMBEDDING_MODEL, input=batch)
-        all_embeddings.extend([item.embedding for item in resp.data])
-    return all_embeddings
+        resp = get_openai_client().embeddings.create(model=model, input=batch, encoding_format="base64", **extra)
+        for item in resp.data:
+            vec = np.frombuffer(base64.b64decode(item.embedding), dtype="<f4")
+            if out is None:
+                out = np.empty((len(texts), len(vec)), dtype=np.float32)
+            out[i + item.index] = vec
+    if out is None:
+        return np.empty((0, 0), dtype=np.float32)
+    validate_embeddings(out)
+    EMBED_STATS["vectors"] += len(out)
+    EMBED_STATS["dimensions"] = out.shape[1]
+    return out
+
+
+def embedding_memory_report(dimensions: int, n: int = 100_000) -> dict:
+    """Bytes to hold `n` vectors as float32 rows vs as lists of Python floats (measured on this interpreter)."""
+    as_lists = sys.getsizeof([0.0] * dimensions) + dimensions * sys.getsizeof(0.5)
+    return {"float32": n * dimensions * 4, "python_lists": n * as_lists}
 
 
 # ---------------------------------------------------------------------------
@@ -1815,58 +2180,252 @@ Joint employer doctrine: If a franchisor exercises control over employment decis
 ]
 
 
-def main():
-    print("\n=== Seeding Foundational Legal Concepts (Python) ===\n")
+def add_chunking_args(parser):
+    """Chunking flags shared by every script that feeds chunk_text."""
+    parser.add_argument("--chunking", choices=CHUNK_MODES, default="recursive",
+                        help="recursive character splitting, or Markdown-section-aware packing")
+    parser.add_argument("--chunk-unit", choices=CHUNK_UNITS, default="chars",
+                        help="measure chunk size/overlap in characters or embedding-model tokens")
+    parser.add_argument("--chunk-size", type=int, help="default: 2000 chars / 500 tokens")
+    parser.add_argument("--chunk-overlap", type=int, help="default: 400 chars / 100 tokens")
+    parser.add_argument("--token-counts", action="store_true",
+                        help="store token_count / prefix_chars_<n> with --chunk-unit chars too (always with tokens)")
+    return parser
+
+
+def parse_args(argv=None):
+    import argparse
+
+    parser = add_chunking_args(argparse.ArgumentParser(description="Seed foundational legal concepts into ChromaDB."))
+    parser.add_argument("--sharded", action="store_true",
+                        help="write one collection per industry plus a routing manifest (see shards.py)")
+    parser.add_argument("--industry", help="with --sharded: reseed only this industry's shard")
+    parser.add_argument("--index-profile", choices=sorted(INDEX_PROFILES),
+                        help="HNSW preset for the created collection(s) (default: Chroma defaults)")
+    parser.add_argument("--common-queries", type=Path,
+                        help="questions to pre-embed alongside titles/headings (default: scripts/common_queries.json)")
+    parser.add_argument("--no-query-cache", action="store_true", help="skip building the pre-embedded query table")
+    parser.add_argument("--compact-metadata", action="store_true",
+                        help="store only filter fields + doc_id on chunks; document fields live in <collection>-docs")
+    parser.add_argument("--writers", type=int, default=1,
+                        help="parallel Chroma upsert connections (see chroma_writer.py; default: 1, inline)")
+    from seed_watch import add_history_args
+    add_history_args(parser)
+    args = parser.parse_args(argv)
+    if args.compact_metadata and (args.sharded or args.industry):
+        parser.error("--compact-metadata is not supported with sharded seeding (shards carry full metadata)")
+    if args.keep_history and (args.sharded or args.industry):
+        parser.error("--keep-history updates the single collection in place; sharded seeding recreates shards")
+    return args
+
+
+def recreate_collection(name=COLLECTION_NAME, metadata=None, profile=None):
+    from metadata_schema import METADATA_SCHEMA_VERSION
 
     # Delete and recreate collection to ensure proper embedding function configuration
     # This fixes the "No embedding function configuration found" warning
+    chroma = get_chroma()
     try:
-        chroma.delete_collection(name=COLLECTION_NAME)
-        print(f"Deleted existing collection '{COLLECTION_NAME}' (will recreate with EF config)\n")
+        chroma.delete_collection(name=name)
+        print(f"Deleted existing collection '{name}' (will recreate with EF config)\n")
     except Exception:
         pass
+    # Source fingerprints (connectors.py) describe chunks that are now gone
+    from http_cache import DEFAULT_HTTP_CACHE_PATH, HttpCache
+    if DEFAULT_HTTP_CACHE_PATH.exists():
+        cache = HttpCache()
+        cache.forget(name)
+        cache.close()
 
     col = chroma.create_collection(
-        name=COLLECTION_NAME,
-        metadata={"hnsw:space": "cosine"},
-        embedding_function=openai_ef,
+        name=name,
+        metadata={
+            "hnsw:space": "cosine",
+            **INDEX_PROFILES.get(profile, {}),
+            "metadata_schema": METADATA_SCHEMA_VERSION,
+            "embedding_model": EMBEDDING_MODEL,
+            **({"embedding_dimensions": EMBEDDING_DIMENSIONS} if EMBEDDING_DIMENSIONS else {}),
+            **({"index_profile": profile} if profile else {}),
+            **(metadata or {}),
+        },
+        embedding_function=get_embedding_function(),
     )
-    print(f"Created collection '{COLLECTION_NAME}' with OpenAI embedding function.\n")
+    print(f"Created collection '{name}' with OpenAI embedding function"
+          f"{f' (index profile: {profile})' if profile else ''}.\n")
+    return col
+
+
+def document_metadata(doc: dict) -> dict:
+    from concept_links import resolve_source_url
+    from metadata_schema import DATE_MAX, DATE_MIN, parse_epoch_day
+
+    return {
+        "source": SEED_SOURCE,
+        "title": doc["title"],
+        "industry": doc["industry"],
+        "document_type": doc["document_type"],
+        "jurisdiction": doc["jurisdiction"],
+        # Typed schema (see metadata_schema.py): numeric tiers/scores, epoch-day dates
+        "relevance_score": 0.95,
+        "authority_tier": 2,
+        "market_standard_from": parse_epoch_day(doc.get("date", ""), DATE_MIN) or DATE_MIN,
+        "deprecated_on": DATE_MAX,
+        # Validity interval of this version of the text; seed_watch.py --keep-history
+        # closes it (valid_to) instead of deleting the chunk when the text changes
+        "valid_from": parse_epoch_day(doc.get("date", ""), DATE_MIN) or DATE_MIN,
+        "valid_to": DATE_MAX,
+        "published_on": parse_epoch_day(doc.get("date", ""), DATE_MAX) or DATE_MAX,
+        "source_url": resolve_source_url(doc.get("url")),
+    }
+
+
+def seed_doc_id(doc: dict) -> str:
+    """Document key stored as `doc_id` on its chunks; chunk ids are "<doc_id>-chunk-<n>"."""
+    return f"seed-{doc['id']}"
+
+
+def seed_document_metadata(docs: list) -> dict:
+    """doc_id → full document metadata, for the document collection in compact mode."""
+    return {seed_doc_id(doc): {**document_metadata(doc), "doc_id": seed_doc_id(doc)} for doc in docs}
+
+
+def chunk_document(doc: dict, args) -> list:
+    chunks = chunk_text(
+        doc["content"].strip(),
+        {**document_metadata(doc), "doc_id": seed_doc_id(doc)},
+        chunk_size=args.chunk_size,
+        overlap=args.chunk_overlap,
+        mode=args.chunking,
+        unit=args.chunk_unit,
+        token_counts=args.token_counts,
+    )
+    link_chunks([f"{seed_doc_id(doc)}-chunk-{i}" for i in range(len(chunks))], chunks)
+    return chunks
+
 
+def seed_documents(col, docs: list, args, lexical=None, writer=None, parents=None) -> int:
+    """
+    Chunk, embed and upsert `docs`; with a ChromaWriter, upserts overlap the
+    next batch's embedding.  With a ParentStore, each document's full text is
+    stored once under its doc_id (chunks hold start/end offsets into it).
+    """
     total = 0
-    for doc in LEGAL_CONCEPTS:
+    for doc in docs:
         print(f"  Processing: {doc['title']}")
-        base_meta = {
-            "source": "elle-legal-seed",
-            "title": doc["title"],
-            "industry": doc["industry"],
-            "document_type": doc["document_type"],
-            "jurisdiction": doc["jurisdiction"],
-            "relevance_score": "0.95",
-            "authority_tier": "2",
-            "market_standard_from": doc.get("date", ""),
-            "deprecated_on": "",
-        }
-        chunks = chunk_text(doc["content"].strip(), base_meta)
+        if parents is not None:
+            parents.put(seed_doc_id(doc), doc["content"].strip(), doc["title"])
+        chunks = chunk_document(doc, args)
         if not chunks:
             print("    → 0 chunks (skipped)")
             continue
 
         for i in range(0, len(chunks), BATCH_SIZE):
             batch = chunks[i : i + BATCH_SIZE]
-            ids = [f"seed-{doc['id']}-chunk-{i + j}" for j, _ in enumerate(batch)]
+            ids = [f"{seed_doc_id(doc)}-chunk-{i + j}" for j, _ in enumerate(batch)]
             texts = [c["text"] for c in batch]
             metas = [c["metadata"] for c in batch]
             embeddings = embed_texts(texts)
+            stored = [compact_metadata(m) for m in metas] if args.compact_metadata else metas
             # Pass embeddings directly — the stored OpenAI EF is metadata only;
             # we always embed ourselves for consistency with the TypeScript runtime.
-            col.upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=metas)
+            (writer or col).upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=stored)
+            if lexical is not None:
+                lexical.upsert(ids, texts, metas)
 
         total += len(chunks)
         print(f"    → {len(chunks)} chunks indexed")
+    return total
+
+
+def open_writer(name: str, args):
+    if args.writers <= 1:
+        return None
+    from chroma_writer import ChromaWriter
+    return ChromaWriter(name, args.writers)
+
+
+def close_writer(writer):
+    if writer is None:
+        return
+    from chroma_writer import format_stats
+    print(f"\n{format_stats(writer.close())}")
+
+
+def print_embedding_memory():
+    if not EMBED_STATS["vectors"]:
+        return
+    dims = EMBED_STATS["dimensions"]
+    report = embedding_memory_report(dims)
+    print(f"Embeddings: {EMBED_STATS['vectors']} vectors × {dims} dims; per 100k vectors "
+          f"{report['float32'] / 1e6:.0f} MB as float32 arrays (was {report['python_lists'] / 1e6:.0f} MB "
+          f"as Python float lists)\n")
+
+
+def write_query_cache(args):
+    from query_cache import DEFAULT_COMMON_QUERIES_PATH, build_query_cache, load_common_queries
+
+    questions = load_common_queries(args.common_queries or DEFAULT_COMMON_QUERIES_PATH)
+    result = build_query_cache(LEGAL_CONCEPTS, questions)
+    print(f"Query cache: {result['entries']} phrasings pre-embedded ({result['embedded']} new) → {result['path']}\n")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.sharded or args.industry:
+        from shards import seed_sharded
+        seed_sharded(args)
+        if not args.no_query_cache:
+            write_query_cache(args)
+        print_embedding_memory()
+        return
+
+    if args.keep_history:
+        # Update in place: superseded chunk versions keep a closed validity interval
+        from seed_watch import update_collection
+        if update_collection(COLLECTION_NAME, LEGAL_CONCEPTS, args):
+            if not args.no_query_cache:
+                write_query_cache(args)
+            return
+        print(f"No collection '{COLLECTION_NAME}' yet; seeding from scratch")
+
+    print("\n=== Seeding Foundational Legal Concepts (Python) ===\n")
+    col = recreate_collection(COLLECTION_NAME, {"metadata_mode": "compact" if args.compact_metadata else "full"},
+                              profile=args.index_profile)
+
+    # Lexical sidecar (FTS5) over the same chunk ids, kept in step with the upserts
+    from lexical_index import LexicalIndex
+    lexical = LexicalIndex()
+    lexical.reset()
+
+    # Full document text, stored once; chunks point into it with start/end offsets
+    from parent_store import ParentStore
+    parents = ParentStore()
+    parents.reset()
+
+    writer = open_writer(COLLECTION_NAME, args)
+    total = seed_documents(col, LEGAL_CONCEPTS, args, lexical, writer, parents)
+    close_writer(writer)
 
     final_count = col.count()
-    print(f"\n=== Seed Complete: {total} chunks indexed, collection has {final_count} docs ===\n")
+    tokens = record_token_stats(col)
+    print(f"\n=== Seed Complete: {total} chunks indexed, collection has {final_count} docs ===")
+    if tokens:
+        print(f"Tokens: {tokens['tokens_total']} total, mean {tokens['tokens_mean']}, p95 {tokens['tokens_p95']}, "
+              f"max {tokens['tokens_max']} per chunk ({tokens['token_encoding']})")
+    print(f"Lexical index: {lexical.count()} chunks → {lexical.path}")
+    lexical.close()
+    stored = parents.stats()
+    parents.close()
+    print(f"Parent store: {stored['documents']} documents, {stored['chars']} chars in "
+          f"{stored['compressed_bytes'] / 1024:.0f} KB → {parents.path}")
+
+    from doc_centroids import build_centroids
+    centroids = build_centroids(col, doc_metadata=seed_document_metadata(LEGAL_CONCEPTS))
+    print(f"Document centroids: {centroids['documents']} documents → '{centroids['collection']}'\n")
+
+    if not args.no_query_cache:
+        write_query_cache(args)
+    print_embedding_memory()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the seed corpus: incremental, live re-seeding while editing.
+
+Polls the file that defines LEGAL_CONCEPTS (scripts/seed_legal_concepts.py by
+default) and waits until edits have been quiet for the debounce window.  It
+then re-reads the list without importing the module and compares each
+document's content hash (document fields plus the chunking config) with the
+one recorded at the last sync (.rag/seed-watch/<collection>.json).  Only
+changed, new and removed documents are re-chunked and diffed against what
+the collection holds for them:
+
+  new / changed chunk text   embedded and upserted (a vector is reused when an
+                             existing chunk had the exact same text, e.g. when
+                             chunk indexes shift)
+  metadata-only changes      update(metadatas=...), no embedding
+  chunks that disappeared    deleted
+
+The lexical sidecar, parent store and the centroids of the touched documents
+are kept in step, and compact-metadata collections stay compact.  Hashes are
+tied to the collection's id, so a recreated collection gets one full diff.  Nothing is recreated, so edits are
+searchable seconds after saving.
+
+With --keep-history a chunk whose text disappears from its document is not
+deleted: it is re-keyed to "<chunk id>@<valid_from>-<valid_to>-<text hash>"
+with its stored vector and its validity interval closed at the effective day
+(--effective, default today).  Text that is unchanged, even if it moved, keeps one row and its
+valid_from; only new text gets a fresh interval.  `legalSearch` filters on
+valid_from/valid_to, so superseded law drops out of current answers but stays
+queryable as of an earlier date.  The lexical index and parent store hold the
+current version only.  `seed_legal_concepts.py --keep-history` applies a
+reseed the same way.
+
+Run:
+  python3 scripts/seed_watch.py
+  python3 scripts/seed_watch.py --once                     # one sync, then exit
+  python3 scripts/seed_watch.py --debounce 2 --chunking markdown
+  python3 scripts/seed_watch.py --once --keep-history --effective 2026-01-01
+"""
+
+import argparse, ast, hashlib, json, os, sys, time
+from pathlib import Path
+
+import numpy as np
+
+from embedding_cache import text_key
+from lexical_index import DEFAULT_LEXICAL_PATH, LexicalIndex
+from doc_centroids import centroid_collection_name, chunk_doc_id, update_centroids
+from metadata_schema import DATE_MAX, DATE_MIN, parse_epoch_day, today_epoch_day
+from parent_store import DEFAULT_PARENT_DIR, ParentStore
+from seed_legal_concepts import (
+    ARTIFACT_DIR, BATCH_SIZE, COLLECTION_NAME, EMBEDDING_MODEL, add_chunking_args, chunk_document, compact_metadata,
+    embed_texts, get_chroma, seed_doc_id, seed_document_metadata,
+)
+
+SEED_SOURCE = Path(__file__).parent / "seed_legal_concepts.py"
+CHUNK_ID_PREFIX = "seed-"
+POLL_INTERVAL = 0.5
+DEBOUNCE_SECONDS = 1.0
+MIRROR_PAGE_SIZE = 1000
+HASH_DIR = ARTIFACT_DIR / "seed-watch"
+# Superseded versions are stored as "<chunk id>@<valid_from>-<valid_to>-<text hash>"
+VERSION_SEP = "@"
+
+
+def version_id(chunk_id: str, valid_from: int, valid_to: int, text: str) -> str:
+    """
+    Key of a superseded version.  Moved text keeps its valid_from, so two
+    superseded texts can share a chunk index and valid_from; the interval end
+    and text hash keep their keys apart.
+    """
+    return f"{chunk_id}{VERSION_SEP}{valid_from}-{valid_to}-{text_key(text)[:16]}"
+
+
+def add_history_args(parser):
+    """--keep-history / --effective, shared with seed_legal_concepts.py."""
+    def day(value):
+        parsed = parse_epoch_day(value, None)
+        if parsed is None:
+            raise argparse.ArgumentTypeError(f"not a date: {value!r}")
+        return parsed
+
+    parser.add_argument("--keep-history", action="store_true",
+                        help="close the validity interval of superseded chunks instead of deleting them")
+    parser.add_argument("--effective", type=day,
+                        help="with --keep-history: day (YYYY-MM-DD) the new text takes effect (default: today)")
+    return parser
+
+
+def load_documents(path: Path) -> list:
+    """Evaluate the LEGAL_CONCEPTS literal in `path` (no import, so no side effects)."""
+    tree = ast.parse(Path(path).read_text())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "LEGAL_CONCEPTS" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"no LEGAL_CONCEPTS list in {path}")
+
+
+def document_hashes(docs: list, args) -> dict:
+    """doc_id → hash of everything its chunks depend on: the document, chunking config and model."""
+    config = [args.chunking, args.chunk_unit, args.chunk_size, args.chunk_overlap, args.token_counts, EMBEDDING_MODEL]
+    return {seed_doc_id(doc): hashlib.sha256(json.dumps([doc, config], sort_keys=True).encode("utf-8")).hexdigest()
+            for doc in docs}
+
+
+def desired_chunks(docs: list, args) -> dict:
+    """chunk id → (text, metadata), with the ids seed_documents writes."""
+    out = {}
+    for doc in docs:
+        for i, chunk in enumerate(chunk_document(doc, args)):
+            out[f"{CHUNK_ID_PREFIX}{doc['id']}-chunk-{i}"] = (chunk["text"], chunk["metadata"])
+    return out
+
+
+class CollectionMirror:
+    """
+    In-memory copy of the seed chunks' text and metadata, kept equal to the
+    collection by sync().  For a compact-metadata collection the stored (and
+    compared) metadata is the compacted form; the lexical index still gets
+    the full metadata.  Superseded versions (--keep-history) are counted but
+    not mirrored.
+    """
+
+    def __init__(self, col, lexical=None, keep_history=False, effective=None):
+        self.col = col
+        self.lexical = lexical
+        self.keep_history = keep_history
+        self.effective = effective
+        self.compact = (col.metadata or {}).get("metadata_mode") == "compact"
+        self.state = {}
+        self.versions = 0
+        self.hash_path = HASH_DIR / f"{col.name}.json"
+        self.doc_hashes = {}
+        if self.hash_path.exists():
+            saved = json.loads(self.hash_path.read_text())
+            if saved.get("collection_id") == str(col.id):
+                self.doc_hashes = saved["documents"]
+        total = col.count()
+        for offset in range(0, total, MIRROR_PAGE_SIZE):
+            page = col.get(limit=MIRROR_PAGE_SIZE, offset=offset, include=["documents", "metadatas"])
+            for id_, text, meta in zip(page["ids"], page["documents"], page["metadatas"]):
+                if VERSION_SEP in id_:
+                    self.versions += 1
+                elif id_.startswith(CHUNK_ID_PREFIX):
+                    self.state[id_] = (text, meta or {})
+
+    def changed_documents(self, hashes: dict) -> set:
+        """Seed doc ids whose hash differs from the last sync, that have no chunks yet, or that disappeared."""
+        present = {chunk_doc_id(id_, meta) for id_, (_, meta) in self.state.items()}
+        return ({d for d, h in hashes.items() if self.doc_hashes.get(d) != h or d not in present}
+                | (present - hashes.keys()))
+
+    def save_hashes(self, hashes: dict):
+        self.doc_hashes = dict(hashes)
+        self.hash_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.hash_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"collection_id": str(self.col.id), "documents": self.doc_hashes}))
+        os.replace(tmp, self.hash_path)
+
+    def _scope(self, doc_ids) -> dict:
+        if doc_ids is None:
+            return self.state
+        return {id_: v for id_, v in self.state.items() if chunk_doc_id(id_, v[1]) in doc_ids}
+
+    def _reusable_vectors(self, texts: dict) -> dict:
+        """text key → stored embedding, for wanted texts some existing chunk already has."""
+        donors = {}
+        for id_, (text, _) in self.state.items():
+            key = text_key(text)
+            if key in texts:
+                donors.setdefault(key, id_)
+        found = {}
+        ids = list(donors.values())
+        for i in range(0, len(ids), MIRROR_PAGE_SIZE):
+            page = self.col.get(ids=ids[i : i + MIRROR_PAGE_SIZE], include=["documents", "embeddings"])
+            for text, emb in zip(page["documents"], page["embeddings"]):
+                found[text_key(text)] = np.asarray(emb, dtype=np.float32)
+        return found
+
+    def stored(self, meta: dict) -> dict:
+        return compact_metadata(meta) if self.compact else meta
+
+    def _carry_validity(self, desired: dict, effective: int, current: dict) -> dict:
+        """
+        Give unchanged text (wherever it moved within its document) its stored
+        valid_from; new text in an already-stored document starts at `effective`.
+        """
+        since, known_docs = {}, set()
+        for id_, (text, meta) in current.items():
+            doc_id = chunk_doc_id(id_, meta)
+            known_docs.add(doc_id)
+            if "valid_from" in meta:
+                since.setdefault((doc_id, text_key(text)), meta["valid_from"])
+        out = {}
+        for id_, (text, meta) in desired.items():
+            key = (meta["doc_id"], text_key(text))
+            if key in since:
+                meta = {**meta, "valid_from": since[key]}
+            elif meta["doc_id"] in known_docs:
+                meta = {**meta, "valid_from": effective}
+            out[id_] = (text, meta)
+        return out
+
+    def _archive(self, desired: dict, effective: int, current: dict) -> int:
+        """
+        Copy stored chunks whose text no longer appears in their document to
+        version ids, closed at `effective`, reusing their vectors.  A version
+        superseded on the day it took effect is simply replaced.
+        """
+        wanted = {(meta["doc_id"], text_key(text)) for text, meta in desired.values()}
+        stale = [id_ for id_, (text, meta) in current.items()
+                 if (chunk_doc_id(id_, meta), text_key(text)) not in wanted
+                 and meta.get("valid_from", DATE_MIN) < effective]
+        for i in range(0, len(stale), BATCH_SIZE):
+            page = self.col.get(ids=stale[i : i + BATCH_SIZE], include=["documents", "embeddings", "metadatas"])
+            metas = [{**m, "valid_from": m.get("valid_from", DATE_MIN),
+                      "valid_to": min(m.get("valid_to", DATE_MAX), effective),
+                      # Offsets and neighbours point into the current text only
+                      "start": -1, "end": -1, "prev_chunk_id": "", "next_chunk_id": ""}
+                     for m in page["metadatas"]]
+            ids = [version_id(id_, m["valid_from"], m["valid_to"], text)
+                   for id_, m, text in zip(page["ids"], metas, page["documents"])]
+            self.col.upsert(ids=ids, embeddings=page["embeddings"], documents=page["documents"], metadatas=metas)
+        self.versions += len(stale)
+        return len(stale)
+
+    def sync(self, desired: dict, doc_ids=None) -> dict:
+        """
+        Make the collection hold `desired`.  With `doc_ids`, `desired` covers
+        only those documents and chunks of other documents are left alone.
+        """
+        start = time.perf_counter()
+        current = self._scope(doc_ids)
+        archived = 0
+        if self.keep_history:
+            effective = self.effective or today_epoch_day()
+            desired = self._carry_validity(desired, effective, current)
+            archived = self._archive(desired, effective, current)
+        removed = [id_ for id_ in current if id_ not in desired]
+        text_changed, meta_changed = [], []
+        for id_, (text, meta) in desired.items():
+            current = self.state.get(id_)
+            if current is None or current[0] != text:
+                text_changed.append(id_)
+            elif current[1] != self.stored(meta):
+                meta_changed.append(id_)
+
+        # Vectors for unchanged text that merely moved are copied, not re-embedded;
+        # read them before any deletes
+        wanted = {text_key(desired[id_][0]) for id_ in text_changed}
+        reused = self._reusable_vectors(wanted) if wanted else {}
+        embedded = 0
+        for i in range(0, len(text_changed), BATCH_SIZE):
+            ids = text_changed[i : i + BATCH_SIZE]
+            texts = [desired[id_][0] for id_ in ids]
+            metas = [desired[id_][1] for id_ in ids]
+            keys = [text_key(t) for t in texts]
+            missing = [t for t, k in zip(texts, keys) if k not in reused]
+            if missing:
+                reused.update(zip((text_key(t) for t in missing), embed_texts(missing)))
+                embedded += len(missing)
+            self.col.upsert(ids=ids, embeddings=np.stack([reused[k] for k in keys]), documents=texts,
+                            metadatas=[self.stored(m) for m in metas])
+            if self.lexical is not None:
+                self.lexical.upsert(ids, texts, metas)
+
+        for i in range(0, len(meta_changed), BATCH_SIZE):
+            ids = meta_changed[i : i + BATCH_SIZE]
+            metas = [desired[id_][1] for id_ in ids]
+            self.col.update(ids=ids, metadatas=[self.stored(m) for m in metas])
+            if self.lexical is not None:
+                self.lexical.update_metadata(ids, metas)
+
+        for i in range(0, len(removed), BATCH_SIZE):
+            ids = removed[i : i + BATCH_SIZE]
+            self.col.delete(ids=ids)
+            if self.lexical is not None:
+                self.lexical.delete(ids)
+
+        for id_ in removed:
+            del self.state[id_]
+        for id_ in text_changed + meta_changed:
+            self.state[id_] = (desired[id_][0], self.stored(desired[id_][1]))
+        return {
+            "upserted": len(text_changed),
+            "embedded": embedded,
+            "reused": len(text_changed) - embedded,
+            "metadata_updated": len(meta_changed),
+            "deleted": len(removed),
+            "archived": archived,
+            "seconds": time.perf_counter() - start,
+        }
+
+
+def has_centroids(col) -> bool:
+    try:
+        get_chroma().get_collection(name=centroid_collection_name(col.name))
+        return True
+    except Exception:
+        return False
+
+
+def sync_parents(parents: ParentStore, docs: list, doc_ids=None):
+    """
+    Store the text of `docs` (or only of `doc_ids` among them; unchanged text
+    is skipped) and drop documents that disappeared.
+    """
+    wanted = {seed_doc_id(doc): doc for doc in docs}
+    for doc_id in [d for d in parents.documents if d.startswith(CHUNK_ID_PREFIX) and d not in wanted]:
+        parents.delete(doc_id)
+    for doc_id, doc in wanted.items():
+        if doc_ids is None or doc_id in doc_ids:
+            parents.put(doc_id, doc["content"].strip(), doc["title"])
+    parents.save()
+
+
+def apply_documents(mirror: CollectionMirror, docs: list, args, parents=None):
+    hashes = document_hashes(docs, args)
+    touched = mirror.changed_documents(hashes)
+    changed_docs = [doc for doc in docs if seed_doc_id(doc) in touched]
+    result = mirror.sync(desired_chunks(changed_docs, args), touched)
+    mirror.save_hashes(hashes)
+    if parents is not None:
+        sync_parents(parents, docs, touched)
+    changed = result["upserted"] or result["metadata_updated"] or result["deleted"] or result["archived"]
+    if changed and has_centroids(mirror.col):
+        update_centroids(mirror.col, touched, doc_metadata=seed_document_metadata(changed_docs))
+    print(f"  [{time.strftime('%H:%M:%S')}] {len(touched)}/{len(docs)} docs changed: {result['upserted']} "
+          f"chunks upserted ({result['embedded']} embedded, {result['reused']} reused), {result['metadata_updated']} "
+          f"metadata-only, {result['deleted']} deleted, {result['archived']} superseded versions kept "
+          f"in {result['seconds']:.2f}s")
+
+
+def sync_once(mirror: CollectionMirror, source: Path, args, parents=None):
+    try:
+        docs = load_documents(source)
+    except (SyntaxError, ValueError) as e:
+        # Mid-edit files often don't parse; wait for the next save
+        print(f"  ! {source.name} not loadable yet: {e}")
+        return
+    apply_documents(mirror, docs, args, parents)
+
+
+def open_sidecars(name: str):
+    """The lexical index and parent store, when they exist for the default collection."""
+    lexical = parents = None
+    if name == COLLECTION_NAME and DEFAULT_LEXICAL_PATH.exists():
+        lexical = LexicalIndex()
+    if name == COLLECTION_NAME and DEFAULT_PARENT_DIR.exists():
+        parents = ParentStore()
+    return lexical, parents
+
+
+def update_collection(name: str, docs: list, args) -> bool:
+    """
+    Apply `docs` to an existing collection in place (what seed_legal_concepts.py
+    --keep-history does instead of recreating it).  False if there is no collection.
+    """
+    try:
+        col = get_chroma().get_collection(name=name)
+    except Exception:
+        return False
+    lexical, parents = open_sidecars(name)
+    mirror = CollectionMirror(col, lexical, args.keep_history, args.effective)
+    print(f"\n=== Updating '{name}' in place ({len(mirror.state)} current chunks, "
+          f"{mirror.versions} superseded versions) ===\n")
+    try:
+        apply_documents(mirror, docs, args, parents)
+    finally:
+        if lexical is not None:
+            lexical.close()
+        if parents is not None:
+            parents.close()
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch the seed corpus and apply edits to the collection live.")
+    parser.add_argument("--source", type=Path, default=SEED_SOURCE, help="file defining LEGAL_CONCEPTS")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS, help="seconds of quiet before syncing")
+    parser.add_argument("--once", action="store_true", help="sync once and exit")
+    add_chunking_args(parser)
+    add_history_args(parser)
+    args = parser.parse_args(argv)
+
+    col = get_chroma().get_collection(name=args.collection)
+    lexical, parents = open_sidecars(args.collection)
+    mirror = CollectionMirror(col, lexical, args.keep_history, args.effective)
+    print(f"\n=== Watching {args.source} → '{args.collection}' ({len(mirror.state)} seed chunks) ===\n")
+
+    sync_once(mirror, args.source, args, parents)
+    if args.once:
+        if parents is not None:
+            parents.close()
+        return
+    last_mtime = args.source.stat().st_mtime
+    changed_at = None
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            try:
+                mtime = args.source.stat().st_mtime
+            except FileNotFoundError:
+                continue  # editors that save by rename briefly remove the file
+            if mtime != last_mtime:
+                last_mtime, changed_at = mtime, time.monotonic()
+            elif changed_at is not None and time.monotonic() - changed_at >= args.debounce:
+                changed_at = None
+                sync_once(mirror, args.source, args, parents)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        if lexical is not None:
+            lexical.close()
+        if parents is not None:
+            parents.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
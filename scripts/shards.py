@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Industry-sharded collections and query routing.
+
+Sharded seeding writes one collection per `industry` (legal-documents-saas,
+legal-documents-healthcare, ...), with "general" doubling as the shared shard
+every industry query also searches.  A manifest records each shard's collection
+name, document/chunk counts and the embedding + chunking config, so a single
+industry can be reseeded without touching the others.
+
+legalSearch (lib/ai/tools/legal-search.ts) only reads the unified collection,
+so every sharded seed also mirrors the reseeded shards' chunks, with their
+stored vectors, into "legal-documents" and rebuilds its document centroids.
+A single-industry reseed only replaces that industry's seeded chunks there;
+chunks from connectors or the ingest daemon are left alone.
+Shards speed up Python-side routed queries (ShardRouter) without leaving the
+app on an empty or stale collection.
+
+Run:
+  python3 scripts/seed_legal_concepts.py --sharded                  # all shards
+  python3 scripts/seed_legal_concepts.py --sharded --industry saas  # one shard
+  python3 scripts/shards.py show
+  python3 scripts/shards.py route healthcare
+"""
+
+import argparse, json, sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from seed_legal_concepts import (
+    ARTIFACT_DIR, BATCH_SIZE, COLLECTION_NAME, EMBEDDING_MODEL, LEGAL_CONCEPTS, SEED_SOURCE, close_writer,
+    get_chroma, open_writer, record_token_stats, recreate_collection, seed_doc_id, seed_document_metadata,
+    seed_documents,
+)
+
+SHARED_SHARD = "general"
+DEFAULT_MANIFEST_PATH = ARTIFACT_DIR / "shard-manifest.json"
+
+
+def shard_collection_name(industry: str, base: str = COLLECTION_NAME) -> str:
+    return f"{base}-{industry}"
+
+
+def load_manifest(path: Path = DEFAULT_MANIFEST_PATH) -> dict:
+    path = Path(path)
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"base_collection": COLLECTION_NAME, "shared_shard": SHARED_SHARD, "shards": {}}
+
+
+def save_manifest(manifest: dict, path: Path = DEFAULT_MANIFEST_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+def sync_unified(manifest: dict, industries=None, profile=None):
+    """
+    Mirror shard chunks into the unified collection, copying stored vectors
+    (no re-embedding).  `industries` replaces just those industries' seeded
+    chunks (other sources are kept); None, or a missing or compact-mode
+    unified collection (whose chunks carry no `source`), rebuilds it from
+    every shard.
+    """
+    chroma = get_chroma()
+    unified = None
+    if industries is not None:
+        try:
+            unified = chroma.get_collection(name=COLLECTION_NAME)
+        except Exception:
+            pass
+        if unified is not None and (unified.metadata or {}).get("metadata_mode") == "compact":
+            unified = None
+    if unified is None:
+        unified = recreate_collection(COLLECTION_NAME, {"metadata_mode": "full"}, profile=profile)
+        industries = sorted(manifest["shards"])
+    for industry in industries:
+        unified.delete(where={"$and": [{"industry": industry}, {"source": SEED_SOURCE}]})
+        shard = chroma.get_collection(name=manifest["shards"][industry]["collection"])
+        for offset in range(0, shard.count(), BATCH_SIZE):
+            page = shard.get(limit=BATCH_SIZE, offset=offset, include=["embeddings", "documents", "metadatas"])
+            unified.upsert(ids=page["ids"], embeddings=page["embeddings"], documents=page["documents"],
+                           metadatas=page["metadatas"])
+    return unified
+
+
+def seed_sharded(args, manifest_path: Path = DEFAULT_MANIFEST_PATH):
+    from lexical_index import LexicalIndex
+    from parent_store import ParentStore
+
+    by_industry = {}
+    for doc in LEGAL_CONCEPTS:
+        by_industry.setdefault(doc["industry"], []).append(doc)
+    if args.industry and args.industry not in by_industry:
+        raise SystemExit(f"Unknown industry {args.industry!r}; known: {', '.join(sorted(by_industry))}")
+    targets = [args.industry] if args.industry else sorted(by_industry)
+
+    print(f"\n=== Seeding {len(targets)} industry shard(s) (Python) ===\n")
+    manifest = load_manifest(manifest_path)
+    lexical = LexicalIndex()
+    parents = ParentStore()
+    if args.industry:
+        lexical.delete_industry(args.industry, id_prefix=seed_doc_id({"id": ""}))  # "seed-"
+    else:
+        # Full reseed: drop shards of industries that no longer exist
+        manifest["shards"] = {}
+        lexical.reset()
+        parents.reset()
+
+    dimensions = manifest.get("embedding", {}).get("dimensions")
+    for industry in targets:
+        name = shard_collection_name(industry)
+        col = recreate_collection(name, {"shard_of": COLLECTION_NAME, "shard_industry": industry},
+                                  profile=args.index_profile)
+        writer = open_writer(name, args)
+        seed_documents(col, by_industry[industry], args, lexical, writer, parents)
+        close_writer(writer)
+        tokens = record_token_stats(col)
+        sample = col.get(limit=1, include=["embeddings"])
+        if len(sample["ids"]):
+            dimensions = len(sample["embeddings"][0])
+        manifest["shards"][industry] = {
+            "collection": name,
+            "documents": len(by_industry[industry]),
+            "chunks": col.count(),
+            "tokens": tokens.get("tokens_total"),
+            "seeded_at": _now(),
+        }
+        print(f"  [{industry}] → '{name}': {manifest['shards'][industry]['chunks']} chunks\n")
+
+    manifest.update({
+        "base_collection": COLLECTION_NAME,
+        "shared_shard": SHARED_SHARD,
+        "embedding": {"model": EMBEDDING_MODEL, "dimensions": dimensions, "space": "cosine"},
+        "index_profile": args.index_profile,
+        "chunking": {
+            "mode": args.chunking,
+            "unit": args.chunk_unit,
+            "chunk_size": args.chunk_size,
+            "overlap": args.chunk_overlap,
+        },
+        "updated_at": _now(),
+    })
+    lexical.close()
+    parents.close()
+
+    from doc_centroids import build_centroids
+    unified = sync_unified(manifest, targets if args.industry else None, args.index_profile)
+    record_token_stats(unified)
+    centroids = build_centroids(unified, doc_metadata=seed_document_metadata(LEGAL_CONCEPTS))
+    manifest["unified_collection"] = unified.name
+    save_manifest(manifest, manifest_path)
+
+    total = sum(s["chunks"] for s in manifest["shards"].values())
+    print(f"=== Sharded Seed Complete: {len(manifest['shards'])} shards, {total} chunks; "
+          f"manifest → {manifest_path} ===")
+    print(f"Unified collection '{unified.name}': {unified.count()} chunks, "
+          f"{centroids['documents']} document centroids\n")
+
+
+# ---------------------------------------------------------------------------
+# Routing
+# ---------------------------------------------------------------------------
+
+class ShardRouter:
+    def __init__(self, manifest: dict = None, client=None):
+        self.manifest = manifest if manifest is not None else load_manifest()
+        self.client = client
+        self._collections = {}
+
+    def shards_for(self, industry=None) -> list:
+        """Collections to search: the industry's shard plus the shared shard, or every shard."""
+        shards = self.manifest["shards"]
+        shared = self.manifest.get("shared_shard", SHARED_SHARD)
+        if not industry:
+            return [s["collection"] for s in shards.values()]
+        names = []
+        if industry in shards:
+            names.append(shards[industry]["collection"])
+        if shared in shards and shared != industry:
+            names.append(shards[shared]["collection"])
+        return names
+
+    def _collection(self, name):
+        if name not in self._collections:
+            client = self.client or get_chroma()
+            self._collections[name] = client.get_collection(name=name)
+        return self._collections[name]
+
+    def query(self, query_embeddings, industry=None, n_results=8, where=None) -> list:
+        """Fan a query out over the routed shards and merge by distance (one hit list per query)."""
+        merged = [[] for _ in query_embeddings]
+        for name in self.shards_for(industry):
+            res = self._collection(name).query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                where=where,
+                include=["documents", "metadatas", "distances"],
+            )
+            for q, hits in enumerate(merged):
+                for id_, doc, meta, dist in zip(res["ids"][q], res["documents"][q], res["metadatas"][q],
+                                                res["distances"][q]):
+                    hits.append({"id": id_, "document": doc, "metadata": meta, "distance": dist, "shard": name})
+        return [sorted(hits, key=lambda h: h["distance"])[:n_results] for hits in merged]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the shard manifest and routing.")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("show", help="print the manifest")
+    r = sub.add_parser("route", help="print the collections an industry query would search")
+    r.add_argument("industry", nargs="?")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(args.manifest)
+    if args.command == "show":
+        print(json.dumps(manifest, indent=2, sort_keys=True))
+    elif args.command == "route":
+        router = ShardRouter(manifest)
+        shards = {s["collection"]: s["chunks"] for s in manifest["shards"].values()}
+        total = sum(shards.values()) or 1
+        names = router.shards_for(args.industry)
+        searched = sum(shards[n] for n in names)
+        for n in names:
+            print(f"  {n}: {shards[n]} chunks")
+        print(f"\n{searched}/{total} chunks searched ({searched / total:.0%} of the corpus)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+ECFRConnector / FederalRegisterConnector against the local fake API
+(fake_regulatory_api.py): pagination, max_pages, 429 / 5xx retries and
+queries that exhaust their retries.  No network access, Chroma or embeddings,
+except for ChunkSink's re-ingest of a changed document (local Chroma, fake
+embeddings).
+
+Run:
+  python3 -m pytest scripts/test_connectors.py
+"""
+
+import argparse, asyncio
+
+from connectors import (AGENCY_MAPPINGS, CFR_MAPPINGS, ChunkSink, ECFRConnector, FederalRegisterConnector, HttpClient,
+                        ingest)
+from fake_regulatory_api import ECFR_PATH, FR_PATH, FakeRegulatoryApi, serve
+from http_cache import HttpCache, document_fingerprint
+from seed_legal_concepts import add_chunking_args
+
+ECFR_JOB = [{**CFR_MAPPINGS[0], "search_terms": CFR_MAPPINGS[0]["search_terms"][:1]}]
+FR_JOB = AGENCY_MAPPINGS[:1]
+
+
+class CollectingSink:
+    """Stands in for ChunkSink: keeps the documents instead of chunking them."""
+
+    def __init__(self):
+        self.docs = []
+
+    async def add(self, doc: dict):
+        self.docs.append(doc)
+
+    async def flush(self, n=None):
+        pass
+
+
+def run_connectors(api: FakeRegulatoryApi, make_connectors, retries=2):
+    async def go():
+        runner, base = await serve(api)
+        try:
+            sink = CollectingSink()
+            async with HttpClient(rate=0, retries=retries) as http:
+                stats = await ingest(make_connectors(base), sink, http)
+            return stats, sink.docs, http
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(go())
+
+
+def ecfr(max_pages=5):
+    return lambda base: [ECFRConnector(base + ECFR_PATH, max_pages, mappings=ECFR_JOB)]
+
+
+def federal_register(max_pages=10):
+    return lambda base: [FederalRegisterConnector(base + FR_PATH, max_pages, agencies=FR_JOB)]
+
+
+def test_ecfr_paginates_every_page():
+    stats, docs, http = run_connectors(FakeRegulatoryApi(ecfr_total=45), ecfr())
+    assert stats == {"pages": 3, "errors": 0}
+    assert len(docs) == 45 and len({d["id"] for d in docs}) == 45
+    assert http.requests == 3 and http.retried == 0
+    meta = docs[0]["metadata"]
+    assert meta["source"] == "ecfr" and meta["cfr_title"] == ECFR_JOB[0]["title"] and meta["authority_tier"] == 1
+
+
+def test_ecfr_stops_at_max_pages():
+    stats, docs, _ = run_connectors(FakeRegulatoryApi(ecfr_total=45), ecfr(max_pages=2))
+    assert stats["pages"] == 2 and len(docs) == 40
+
+
+def test_federal_register_follows_next_page():
+    stats, docs, _ = run_connectors(FakeRegulatoryApi(fr_total=250), federal_register())
+    assert stats == {"pages": 3, "errors": 0}
+    assert len({d["id"] for d in docs}) == 250
+    assert {d["metadata"]["authority_tier"] for d in docs} == {1, 2}
+    assert all(d["metadata"]["agency"] == FR_JOB[0]["name"] for d in docs)
+
+
+def test_retries_429_and_5xx_then_succeeds():
+    api = FakeRegulatoryApi(ecfr_total=45, fr_total=250, fail_429=1, fail_5xx=1)
+    stats, docs, http = run_connectors(api, lambda base: ecfr()(base) + federal_register()(base))
+    assert stats == {"pages": 6, "errors": 0}
+    assert len(docs) == 45 + 250
+    assert api.statuses[429] == 6 and api.statuses[503] == 6 and api.statuses[200] == 6
+    assert http.retried == 12 and http.requests == 18
+
+
+def test_exhausted_retries_fail_only_that_query():
+    api = FakeRegulatoryApi(ecfr_total=45, fr_total=250, broken=FR_JOB[0]["slug"])
+    stats, docs, http = run_connectors(api, lambda base: ecfr()(base) + federal_register()(base), retries=2)
+    assert stats == {"pages": 3, "errors": 1}
+    assert len(docs) == 45
+    assert api.statuses[500] == 3
+
+
+def sink_args():
+    parser = add_chunking_args(argparse.ArgumentParser())
+    parser.add_argument("--collection", default="connector-test")
+    return parser.parse_args(["--chunk-size", "200", "--chunk-overlap", "0"])
+
+
+def test_ecfr_fingerprint_ignores_the_search_excerpt():
+    result = {"starts_on": "2020-01-01", "ends_on": None, "hierarchy": {"part": "312", "section": "312.5"},
+              "headings": {"title": "Title 16", "part": "Part 312", "section": "§ 312.5 Parental consent"}}
+    connector = ECFRConnector(mappings=ECFR_JOB)
+    docs = [next(connector.documents((ECFR_JOB[0], term), {"results": [
+        {**result, "full_text_excerpt": f"<p>Operators must obtain <b>{term}</b> consent.</p> " + "x" * 200}]}))
+        for term in ("verifiable", "parental")]
+    assert docs[0]["id"] == docs[1]["id"] and docs[0]["text"] != docs[1]["text"]
+    assert document_fingerprint(docs[0]) == document_fingerprint(docs[1])
+    amended = next(connector.documents((ECFR_JOB[0], "verifiable"), {"results": [
+        {**result, "starts_on": "2025-06-23", "full_text_excerpt": "<p>" + "y" * 200 + "</p>"}]}))
+    assert document_fingerprint(amended) != document_fingerprint(docs[0])
+
+
+def test_changed_document_drops_its_stale_tail_chunks(chroma, fake_embeddings, artifact_dir):
+    col = chroma.create_collection("connector-test")
+    cache = HttpCache(artifact_dir / "http_cache.sqlite")
+    paragraph = "Covered entities must retain {} records for six years and produce them to the agency on request."
+
+    def ingest_doc(*words):
+        sink = ChunkSink(col, sink_args(), cache=cache)
+        text = "\n\n".join(paragraph.format(w) for w in words)
+        async def go():
+            await sink.add({"id": "fr-1", "text": text, "metadata": {"source": "federal_register"}})
+            await sink.flush()
+        asyncio.run(go())
+        return sink
+
+    ingest_doc("billing", "payroll", "audit")
+    assert sorted(col.get(include=[])["ids"]) == ["fr-1-chunk-0", "fr-1-chunk-1", "fr-1-chunk-2"]
+    assert cache.chunk_span("connector-test", "fr-1") == 3
+
+    sink = ingest_doc("billing", "payroll", "audit")
+    assert sink.skipped == 1 and sink.deleted == 0
+
+    sink = ingest_doc("billing")
+    assert sink.deleted == 2
+    assert col.get(include=[])["ids"] == ["fr-1-chunk-0"]
+    assert cache.chunk_span("connector-test", "fr-1") == 1
+    cache.close()
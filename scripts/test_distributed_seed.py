@@ -0,0 +1,60 @@
+"""
+Distributed seeding work queue (distributed_seed.WorkQueue): units are leased
+to one worker at a time, expired leases are taken over, and failures are
+retried until MAX_ATTEMPTS.
+
+Run:
+  python3 -m pytest scripts/test_distributed_seed.py
+"""
+
+from distributed_seed import MAX_ATTEMPTS, WorkQueue
+
+DOCS = [{"id": f"doc-{i}", "content": "text"} for i in range(6)]
+
+
+def planned(tmp_path, unit_size=4) -> WorkQueue:
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.plan(DOCS, {"collection": "seed-test"}, unit_size=unit_size)
+    return queue
+
+
+def test_claim_leases_each_unit_once(tmp_path):
+    queue = planned(tmp_path)
+    first, second = queue.claim("a"), queue.claim("b")
+    assert [len(first[1]), len(second[1])] == [4, 2] and first[0] != second[0]
+    assert queue.claim("c") is None
+    assert queue.owners() == {"a": 1, "b": 1}
+    assert not queue.complete(first[0], "b", 10)
+    assert queue.complete(first[0], "a", 10)
+    assert queue.depth() == {"pending": 0, "leased": 1, "done": 1, "failed": 0, "chunks": 10}
+    queue.close()
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    queue = planned(tmp_path, unit_size=6)
+    unit_id, _ = queue.claim("a", lease=-1)
+    assert queue.claim("b")[0] == unit_id
+    assert not queue.heartbeat(unit_id, "a") and queue.heartbeat(unit_id, "b")
+    assert not queue.complete(unit_id, "a", 5)
+    assert queue.complete(unit_id, "b", 5)
+    queue.close()
+
+
+def test_fail_retries_then_parks(tmp_path):
+    queue = planned(tmp_path, unit_size=6)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        unit_id, _ = queue.claim("a")
+        queue.fail(unit_id, "a", f"boom {attempt}")
+    assert queue.claim("a") is None
+    assert queue.failures() == [(unit_id, MAX_ATTEMPTS, f"boom {MAX_ATTEMPTS}")]
+    assert queue.requeue_failed() == 1 and queue.claim("a")[0] == unit_id
+    queue.close()
+
+
+def test_expired_lease_out_of_attempts_is_parked(tmp_path):
+    queue = planned(tmp_path, unit_size=6)
+    for _ in range(MAX_ATTEMPTS):
+        unit_id, _ = queue.claim("a", lease=-1)
+    assert queue.claim("b") is None
+    assert queue.depth()["failed"] == 1 and queue.failures()[0][2] == "lease expired"
+    queue.close()
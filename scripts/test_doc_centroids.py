@@ -0,0 +1,56 @@
+"""
+Document centroids (doc_centroids.py): one L2-normalized mean row per
+document, incremental updates of just the touched documents, and the
+`centroid_chunks` coverage legalSearch checks before scoping to stage 1.
+
+Run:
+  python3 -m pytest scripts/test_doc_centroids.py
+"""
+
+import numpy as np
+
+from doc_centroids import COVERAGE_KEY, build_centroids, centroid_collection_name, update_centroids
+
+
+def add_chunks(col, doc_id, texts, embed, start=0):
+    ids = [f"{doc_id}-chunk-{i}" for i in range(start, start + len(texts))]
+    metas = [{"doc_id": doc_id, "chunk_index": i, "industry": "saas"} for i in range(start, start + len(texts))]
+    col.upsert(ids=ids, documents=texts, embeddings=embed(texts), metadatas=metas)
+
+
+def centroids_of(chroma, col):
+    target = chroma.get_collection(centroid_collection_name(col.name))
+    got = target.get(include=["embeddings", "metadatas"])
+    return target, {id_: (np.asarray(e), m) for id_, e, m in zip(got["ids"], got["embeddings"], got["metadatas"])}
+
+
+def test_build_averages_each_document(chroma, fake_embeddings):
+    col = chroma.create_collection("centroid-test")
+    add_chunks(col, "nda", ["mutual nondisclosure terms", "confidential information defined"], fake_embeddings)
+    add_chunks(col, "safe", ["valuation cap and discount"], fake_embeddings)
+
+    result = build_centroids(col)
+    assert result["documents"] == 2 and result["chunks"] == 3
+    target, rows = centroids_of(chroma, col)
+    vec, meta = rows["nda"]
+    expected = fake_embeddings(["mutual nondisclosure terms", "confidential information defined"]).mean(axis=0)
+    assert np.allclose(vec, expected / np.linalg.norm(expected), atol=1e-6)
+    assert meta["chunks"] == 2 and meta["industry"] == "saas" and "chunk_index" not in meta
+    assert target.metadata[COVERAGE_KEY] == col.count()
+
+
+def test_update_tracks_coverage(chroma, fake_embeddings):
+    col = chroma.create_collection("centroid-test")
+    add_chunks(col, "nda", ["mutual nondisclosure terms", "confidential information defined"], fake_embeddings)
+    add_chunks(col, "safe", ["valuation cap and discount"], fake_embeddings)
+    build_centroids(col)
+
+    add_chunks(col, "safe", ["pro rata rights side letter"], fake_embeddings, start=1)
+    add_chunks(col, "dpa", ["processor obligations under gdpr"], fake_embeddings)
+    col.delete(where={"doc_id": "nda"})
+    result = update_centroids(col, ["safe", "dpa", "nda"])
+
+    assert result["documents"] == 2 and result["removed"] == 1
+    target, rows = centroids_of(chroma, col)
+    assert sorted(rows) == ["dpa", "safe"] and rows["safe"][1]["chunks"] == 2
+    assert target.metadata[COVERAGE_KEY] == col.count() == 3
@@ -0,0 +1,66 @@
+"""
+Embedding gateway (embedding_gateway.py): an input the API rejects fails on
+its own instead of taking its batch down, and `dimensions` is refused for
+models that can't be shortened.  The upstream call is faked.
+
+Run:
+  python3 -m pytest scripts/test_embedding_gateway.py
+"""
+
+import asyncio
+
+import numpy as np
+from aiohttp.test_utils import TestClient, TestServer
+
+import embedding_gateway
+from conftest import fake_embed_texts
+from embedding_gateway import EmbeddingGateway, make_app
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+def picky_embed_texts(calls):
+    def embed(texts, model=None, dimensions=None):
+        calls.append(list(texts))
+        if "bad" in texts:
+            raise BadRequest("input is invalid")
+        return fake_embed_texts(texts)
+    return embed
+
+
+def test_rejected_input_fails_alone(monkeypatch):
+    calls = []
+    monkeypatch.setattr(embedding_gateway, "embed_texts", picky_embed_texts(calls))
+
+    async def go():
+        gateway = EmbeddingGateway(window_ms=1)
+        texts = ["privacy notice", "bad", "data retention", "breach notification"]
+        results = await asyncio.gather(*(gateway.embed([t]) for t in texts), return_exceptions=True)
+        return gateway, texts, results
+
+    gateway, texts, results = asyncio.run(go())
+    assert isinstance(results[1], BadRequest)
+    for text, result in zip(texts, results):
+        if text != "bad":
+            assert np.array_equal(result[0], fake_embed_texts([text])[0])
+    assert calls[0] == texts and ["bad"] in calls
+    assert gateway.upstream_inputs == 3
+
+
+def test_http_status_and_dimensions(monkeypatch):
+    monkeypatch.setattr(embedding_gateway, "embed_texts", picky_embed_texts([]))
+    monkeypatch.setattr(embedding_gateway, "count_tokens", lambda text, model=None: len(text.split()))
+
+    async def go():
+        async with TestClient(TestServer(make_app(EmbeddingGateway(window_ms=1)))) as client:
+            ada = await client.post("/v1/embeddings", json={"input": "x", "model": "text-embedding-ada-002",
+                                                            "dimensions": 256})
+            bad = await client.post("/v1/embeddings", json={"input": "bad"})
+            short = await client.post("/v1/embeddings", json={"input": "privacy notice", "dimensions": 16})
+            return ada.status, bad.status, short.status, await short.json()
+
+    ada, bad, short, body = asyncio.run(go())
+    assert (ada, bad, short) == (400, 400, 200)
+    assert len(body["data"][0]["embedding"]) == 16 and body["usage"]["prompt_tokens"] == 2
@@ -0,0 +1,78 @@
+"""
+Ingestion daemon (ingest_daemon.py): the durable queue's claim / fail /
+recover bookkeeping, and a resubmitted document that chunks shorter losing
+its stale tail chunks.
+
+Run:
+  python3 -m pytest scripts/test_ingest_daemon.py
+"""
+
+import argparse, asyncio
+
+from ingest_daemon import CHUNK_ID_PREFIX, MAX_ATTEMPTS, IngestQueue, MicroBatcher
+from seed_legal_concepts import add_chunking_args
+
+PARAGRAPH = ("Section {}: the processor must delete or return all personal data within thirty days of the end of "
+             "the contract, and certify the deletion in writing.")
+
+
+def document(*words) -> dict:
+    return {"id": "dpa", "content": "\n\n".join(PARAGRAPH.format(w) for w in words)}
+
+
+def batcher_args():
+    parser = add_chunking_args(argparse.ArgumentParser())
+    parser.add_argument("--batch-size", type=int, default=2)
+    parser.add_argument("--window", type=float, default=0.0)
+    return parser.parse_args(["--chunk-size", "200", "--chunk-overlap", "0"])
+
+
+def test_claim_and_fail(tmp_path):
+    queue = IngestQueue(tmp_path / "queue.sqlite")
+    first, second = queue.submit([document("a"), {"id": "nda", "content": "x"}])
+    assert [job for job, _ in queue.claim(limit=1)] == [first]
+    assert queue.depth() == {"pending": 1, "processing": 1, "done": 0, "failed": 0}
+    assert queue.claim() == [(second, {"id": "nda", "content": "x"})]
+    assert queue.claim() == []
+
+    for _ in range(1, MAX_ATTEMPTS):
+        assert queue.fail(first, "boom") == "pending"
+        assert [job for job, _ in queue.claim()] == [first]
+    assert queue.fail(first, "boom") == "failed"
+    assert queue.status("dpa")["attempts"] == MAX_ATTEMPTS
+    queue.close()
+
+
+def test_recover_counts_an_attempt(tmp_path):
+    queue = IngestQueue(tmp_path / "queue.sqlite")
+    job, = queue.submit([document("a")])
+    for restart in range(1, MAX_ATTEMPTS + 1):
+        assert [j for j, _ in queue.claim()] == [job]
+        queue.close()
+        queue = IngestQueue(tmp_path / "queue.sqlite")  # the daemon died mid-job
+        assert queue.recover() == 1
+        assert queue.status("dpa")["attempts"] == restart
+    assert queue.status("dpa")["status"] == "failed" and queue.claim() == []
+    queue.close()
+
+
+def test_resubmitted_document_drops_stale_tail(tmp_path, chroma, fake_embeddings):
+    col = chroma.create_collection("ingest-test")
+    queue = IngestQueue(tmp_path / "queue.sqlite")
+    batcher = MicroBatcher(col, queue, batcher_args())
+
+    async def ingest(doc):
+        queue.submit([doc])
+        for job_id, payload in queue.claim():
+            await batcher._take(job_id, payload)
+        while batcher.buffer:
+            await batcher._flush(batcher.batch_size)
+
+    asyncio.run(ingest(document("one", "two", "three")))
+    ids = sorted(col.get(include=[])["ids"])
+    assert ids == [f"{CHUNK_ID_PREFIX}dpa-chunk-{i}" for i in range(3)]
+
+    asyncio.run(ingest(document("one")))
+    assert col.get(include=[])["ids"] == [f"{CHUNK_ID_PREFIX}dpa-chunk-0"]
+    assert queue.previous_chunks("dpa") == 1 and queue.status("dpa")["status"] == "done"
+    queue.close()
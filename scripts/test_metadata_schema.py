@@ -0,0 +1,27 @@
+"""
+Typed metadata (metadata_schema.py): a missing or unreadable authority_tier is
+derived from the chunk's source instead of becoming 0, and migrate repairs
+chunks already stored with 0.
+
+Run:
+  python3 -m pytest scripts/test_metadata_schema.py
+"""
+
+from metadata_schema import migrate_collection, typed_metadata
+
+
+def test_unknown_tier_is_derived():
+    assert typed_metadata({"authority_tier": "2"})["authority_tier"] == 2
+    assert typed_metadata({"authority_tier": None, "source": "ecfr"})["authority_tier"] == 1
+    assert typed_metadata({"authority_tier": "n/a", "document_type": "advisory"})["authority_tier"] == 2
+    assert typed_metadata({"authority_tier": 0, "url": "https://example.com/blog"})["authority_tier"] == 3
+    assert "authority_tier" not in typed_metadata({"source": "ecfr"})
+
+
+def test_migrate_repairs_zero_tiers(chroma):
+    col = chroma.create_collection("schema-test")
+    col.add(ids=["a", "b"], embeddings=[[1.0, 0.0], [0.0, 1.0]],
+            metadatas=[{"authority_tier": 0, "source": "federal_register"}, {"authority_tier": 2}])
+    assert migrate_collection(col)["changed"] == 2
+    assert col.get(where={"authority_tier": {"$in": [1, 2]}}, include=[])["ids"] == ["a", "b"]
+    assert migrate_collection(col)["changed"] == 0
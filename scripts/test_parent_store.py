@@ -0,0 +1,52 @@
+"""
+Parent-document store (parent_store.py): unchanged texts aren't rewritten,
+compaction reclaims superseded blobs without moving any text, and
+merge_spans joins overlapping hits in rank order.
+
+Run:
+  python3 -m pytest scripts/test_parent_store.py
+"""
+
+from parent_store import ParentStore, merge_spans
+
+NDA = "Mutual NDA. " + "Each party keeps the other's confidential information secret. " * 20
+SAFE = "SAFE note. " + "The investor receives shares at the next priced round. " * 20
+
+
+def test_put_skips_unchanged_text(tmp_path):
+    store = ParentStore(tmp_path)
+    store.put("nda", NDA, "NDA")
+    size = store.stats()["compressed_bytes"]
+    store.put("nda", NDA, "Mutual NDA")
+    store.close()
+
+    store = ParentStore(tmp_path)
+    assert store.stats() == {"documents": 1, "chars": len(NDA), "compressed_bytes": size, "dead_bytes": 0}
+    assert store.documents["nda"][3] == "Mutual NDA"
+    assert store.span("nda", 0, 10, pad=2) == NDA[:12]
+    store.close()
+
+
+def test_compact_reclaims_superseded_blobs(tmp_path):
+    store = ParentStore(tmp_path)
+    store.put("nda", NDA)
+    store.put("safe", SAFE)
+    store.put("nda", NDA + "Amended.")
+    store.delete("safe")
+    store.put("safe", SAFE.upper())
+    dead = store.stats()["dead_bytes"]
+    assert dead > 0
+
+    assert store.compact() == dead
+    assert store.stats()["dead_bytes"] == 0
+    store.close()
+    store = ParentStore(tmp_path)
+    assert store.get("nda") == NDA + "Amended." and store.get("safe") == SAFE.upper()
+    store.close()
+
+
+def test_merge_spans():
+    hits = [("nda", 1600, 3600), ("safe", 0, 2000), ("nda", 0, 2000), ("nda", 5000, 7000), ("faq", -1, -1)]
+    assert merge_spans(hits) == [("nda", 0, 3600), ("safe", 0, 2000), ("nda", 5000, 7000), ("faq", -1, -1)]
+    assert merge_spans(hits, gap=1400)[0] == ("nda", 0, 7000)
+    assert merge_spans([]) == []
@@ -0,0 +1,73 @@
+"""
+Incremental seed sync (seed_watch.py): only changed documents are touched, and
+with --keep-history superseded text stays queryable as of earlier dates.
+
+Run:
+  python3 -m pytest scripts/test_seed_watch.py
+"""
+
+import argparse
+
+from metadata_schema import DATE_MIN, parse_epoch_day
+from seed_legal_concepts import COLLECTION_NAME, add_chunking_args
+from seed_watch import VERSION_SEP, add_history_args, update_collection
+
+DOC_ID = "seed-retention"
+
+
+def paragraph(word: str) -> str:
+    """~150 characters, so each paragraph is its own 200-character chunk."""
+    return f"Section {word}: " + " ".join([f"{word} records must be retained by the covered entity."] * 3)
+
+
+def document(*words, doc_id="retention") -> dict:
+    return {"id": doc_id, "title": "Record retention", "industry": "general", "document_type": "regulation",
+            "jurisdiction": "US-Federal", "content": "\n\n".join(paragraph(w) for w in words)}
+
+
+def sync(docs, effective=None):
+    argv = ["--chunk-size", "200", "--chunk-overlap", "0"]
+    if effective:
+        argv += ["--keep-history", "--effective", effective]
+    args = add_history_args(add_chunking_args(argparse.ArgumentParser())).parse_args(argv)
+    assert update_collection(COLLECTION_NAME, docs, args)
+
+
+def texts_as_of(col, day: str) -> list:
+    """Chunk texts of DOC_ID in force on `day`, in chunk order (legalSearch's validity filter)."""
+    as_of = parse_epoch_day(day, None)
+    got = col.get(where={"$and": [{"doc_id": DOC_ID}, {"valid_from": {"$lte": as_of}}, {"valid_to": {"$gt": as_of}}]},
+                  include=["documents", "metadatas"])
+    rows = sorted(zip(got["metadatas"], got["documents"]), key=lambda r: r[0]["chunk_index"])
+    return [text.split(":")[0] for _, text in rows]
+
+
+def test_only_changed_documents_are_rewritten(chroma, fake_embeddings):
+    col = chroma.create_collection(COLLECTION_NAME, metadata={"metadata_mode": "full"})
+    sync([document("alpha", "beta"), document("gamma", doc_id="other")])
+    assert col.count() == 3
+    other = col.get(where={"doc_id": "seed-other"}, include=["metadatas"])
+
+    sync([document("alpha", "delta"), document("gamma", doc_id="other")])
+    assert texts_as_of(col, "2030-01-01") == ["Section alpha", "Section delta"]
+    assert col.get(where={"doc_id": "seed-other"}, include=["metadatas"]) == other
+    assert col.count() == 3
+
+
+def test_history_keeps_every_superseded_version(chroma, fake_embeddings):
+    col = chroma.create_collection(COLLECTION_NAME, metadata={"metadata_mode": "full"})
+    sync([document("alpha", "beta")], effective="2024-01-01")
+    # Dropping alpha moves beta to chunk 0, keeping its original valid_from
+    sync([document("beta")], effective="2025-01-01")
+    # Replacing beta supersedes a second text at chunk 0 with that same valid_from
+    sync([document("gamma")], effective="2026-01-01")
+
+    versions = [id_ for id_ in col.get(include=[])["ids"] if VERSION_SEP in id_]
+    assert len(versions) == 2
+    assert all(v.startswith(f"{DOC_ID}-chunk-0{VERSION_SEP}{DATE_MIN}-") for v in versions)
+    assert texts_as_of(col, "2024-06-01") == ["Section alpha", "Section beta"]
+    assert texts_as_of(col, "2025-06-01") == ["Section beta"]
+    assert texts_as_of(col, "2026-06-01") == ["Section gamma"]
+    current = col.get(ids=[f"{DOC_ID}-chunk-0"], include=["metadatas"])["metadatas"][0]
+    assert current["valid_from"] == parse_epoch_day("2026-01-01", None)
+    assert min(m["valid_from"] for m in col.get(include=["metadatas"])["metadatas"]) == DATE_MIN
@@ -0,0 +1,49 @@
+"""
+Sharded seeding (shards.py): the unified collection mirrors every shard, and
+a single-industry reseed replaces only that industry's seeded chunks.
+
+Run:
+  python3 -m pytest scripts/test_shards.py
+"""
+
+from lexical_index import LexicalIndex
+from seed_legal_concepts import COLLECTION_NAME, LEGAL_CONCEPTS, main as seed_main
+from shards import load_manifest
+
+INDUSTRY = LEGAL_CONCEPTS[0]["industry"]
+FOREIGN_ID = "ecfr-t16-312-chunk-0"
+
+
+def unified_ids(chroma, where=None) -> set:
+    return set(chroma.get_collection(name=COLLECTION_NAME).get(where=where, include=[])["ids"])
+
+
+def test_sharded_seed_mirrors_every_shard(chroma, fake_embeddings):
+    seed_main(["--sharded", "--no-query-cache"])
+    manifest = load_manifest()
+    shard_ids = set()
+    for shard in manifest["shards"].values():
+        shard_ids |= set(chroma.get_collection(name=shard["collection"]).get(include=[])["ids"])
+    assert unified_ids(chroma) == shard_ids
+    assert manifest["unified_collection"] == COLLECTION_NAME
+
+
+def test_industry_reseed_keeps_other_sources(chroma, fake_embeddings):
+    seed_main(["--sharded", "--no-query-cache"])
+    unified = chroma.get_collection(name=COLLECTION_NAME)
+    text = "Children's Online Privacy Protection Rule: operators must obtain verifiable parental consent."
+    meta = {"source": "ecfr", "title": "16 CFR 312", "industry": INDUSTRY, "doc_id": "ecfr-t16-312",
+            "authority_tier": 1}
+    unified.upsert(ids=[FOREIGN_ID], documents=[text], metadatas=[meta], embeddings=fake_embeddings([text]))
+    lexical = LexicalIndex()
+    lexical.upsert([FOREIGN_ID], [text], [meta])
+    lexical.close()
+    before = unified_ids(chroma)
+
+    seed_main(["--sharded", "--industry", INDUSTRY, "--no-query-cache"])
+
+    assert unified_ids(chroma) == before
+    assert FOREIGN_ID in unified_ids(chroma, where={"industry": INDUSTRY})
+    lexical = LexicalIndex()
+    assert [hit["id"] for hit in lexical.search("verifiable parental consent")] == [FOREIGN_ID]
+    lexical.close()